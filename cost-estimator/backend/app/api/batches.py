@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.models.analysis_batch import AnalysisBatch
+from app.models.analysis_job import AnalysisJob
+from app.models.part import Part
+from app.schemas.batch import BatchFileError, BatchItem, BatchRead
+
+router = APIRouter(prefix="/batches", tags=["batches"])
+
+
+def _batch_status(accepted: int, rejected: int, pending: int, failed: int) -> str:
+    if accepted == 0:
+        return "failed"
+    if pending:
+        return "processing"
+    if failed or rejected:
+        return "completed_with_errors"
+    return "completed"
+
+
+@router.get("/{batch_id}", response_model=BatchRead)
+async def get_batch(batch_id: str, db: AsyncSession = Depends(get_async_db)) -> BatchRead:
+    batch = await db.get(AnalysisBatch, batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    # Scalar columns only (served by ix_analysis_jobs_batch_id); part JSON blobs are not loaded.
+    rows = (
+        await db.execute(
+            select(
+                AnalysisJob.id,
+                AnalysisJob.status,
+                AnalysisJob.error_message,
+                Part.id.label("part_id"),
+                Part.filename,
+                Part.total_cost,
+                Part.cycle_time_min,
+            )
+            .join(Part, Part.id == AnalysisJob.part_id)
+            .where(AnalysisJob.batch_id == batch_id)
+            .order_by(Part.filename.asc())
+        )
+    ).all()
+
+    counts = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+    total_cost = 0.0
+    total_cycle_time_min = 0.0
+    for row in rows:
+        counts[row.status] = counts.get(row.status, 0) + 1
+        if row.status == "completed":
+            total_cost += row.total_cost or 0.0
+            total_cycle_time_min += row.cycle_time_min or 0.0
+
+    errors = [BatchFileError(**error) for error in batch.errors_json or []]
+    return BatchRead(
+        id=batch.id,
+        status=_batch_status(batch.accepted_files, len(errors), counts["queued"] + counts["running"], counts["failed"]),
+        material_id=batch.material_id,
+        machine_profile=batch.machine_profile,
+        total_files=batch.total_files,
+        accepted_files=batch.accepted_files,
+        rejected_files=len(errors),
+        queued=counts["queued"],
+        running=counts["running"],
+        completed=counts["completed"],
+        failed=counts["failed"],
+        total_cost=round(total_cost, 4),
+        total_cycle_time_min=round(total_cycle_time_min, 4),
+        errors=errors,
+        items=[
+            BatchItem(
+                part_id=row.part_id,
+                job_id=row.id,
+                filename=row.filename,
+                status=row.status,
+                total_cost=row.total_cost,
+                cycle_time_min=row.cycle_time_min,
+                error_message=row.error_message,
+            )
+            for row in rows
+        ],
+        created_at=batch.created_at,
+        updated_at=batch.updated_at,
+    )
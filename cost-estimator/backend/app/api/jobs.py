@@ -1,47 +1,124 @@
-from datetime import datetime, timedelta, timezone
+import asyncio
+import json
+from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.models.analysis_job import AnalysisJob
 from app.schemas.job import JobRead
-from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.job_events import TERMINAL_STATUSES, get_job_event_hub
+from app.services.profiling import PROFILE_CONTENT_TYPE
+from app.services.storage_service import StorageService, aiter_storage_stream, get_storage, run_storage_call
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
-SYNC_FALLBACK_AFTER = timedelta(seconds=20)
+SSE_KEEPALIVE_S = 15.0
+SSE_RETRY_MS = 3000
 
 
-def _to_utc(dt: datetime | None) -> datetime | None:
-    if dt is None:
-        return None
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(job_id: str, db: AsyncSession = Depends(get_async_db)) -> AnalysisJob:
+    # Read-only: stuck jobs are re-queued by the lease reaper, never executed in the API.
+    job = await db.get(AnalysisJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
-def _should_run_sync(job: AnalysisJob) -> bool:
-    if job.status not in {"queued", "running"}:
-        return False
-    now = datetime.now(timezone.utc)
-    ref = _to_utc(job.started_at) or _to_utc(job.created_at)
-    if ref is None:
-        return True
-    return now - ref >= SYNC_FALLBACK_AFTER
+@router.get("/{job_id}/profile")
+async def get_job_profile(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageService = Depends(get_storage),
+) -> StreamingResponse:
+    """Folded stacks of a profiled run; feed to flamegraph.pl, speedscope or inferno."""
+    job = await db.get(AnalysisJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job.profile_key:
+        detail = "Profile not captured yet" if job.profile_requested else "Job was not profiled"
+        raise HTTPException(status_code=404, detail=detail)
 
+    profile_key = job.profile_key
+    try:
+        info = await run_storage_call(storage.stat_model, profile_key)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Profile file not found") from exc
+    return StreamingResponse(
+        aiter_storage_stream(storage.iter_model(profile_key)),
+        media_type=PROFILE_CONTENT_TYPE,
+        headers={
+            "Content-Length": str(info.size),
+            "Content-Disposition": f'attachment; filename="{job_id}.folded"',
+        },
+    )
 
-@router.get("/{job_id}", response_model=JobRead)
-def get_job(job_id: str, db: Session = Depends(get_db)) -> AnalysisJob:
-    job = db.get(AnalysisJob, job_id)
-    if job is None:
+
+async def _load_job_event(job_id: str) -> dict | None:
+    async with AsyncSessionLocal() as db:
+        job = await db.get(AnalysisJob, job_id)
+        if job is None:
+            return None
+        return {
+            "job_id": job.id,
+            "part_id": job.part_id,
+            "status": job.status,
+            "stage": None,
+            "error_message": job.error_message,
+            "ts": job.updated_at.isoformat() if job.updated_at else None,
+        }
+
+
+def _sse(event: dict) -> str:
+    return f"event: job\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request) -> StreamingResponse:
+    hub = get_job_event_hub()
+    # The Redis snapshot answers most requests; the DB is only read for jobs without recent events.
+    try:
+        initial = await hub.snapshot(job_id)
+    except RedisError as exc:
+        # Clients fall back to polling GET /jobs/{id}.
+        raise HTTPException(status_code=503, detail="Job event stream unavailable") from exc
+    if initial is None:
+        initial = await _load_job_event(job_id)
+    if initial is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    if _should_run_sync(job):
-        try:
-            pipeline = AnalysisPipeline(db)
-            pipeline.run(part_id=job.part_id, job_id=job.id, machine_profile="auto")
-            db.refresh(job)
-        except Exception:
-            db.refresh(job)
+    async def events() -> AsyncIterator[str]:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        if initial["status"] in TERMINAL_STATUSES:
+            yield _sse(initial)
+            return
+        async with hub.subscribe(job_id) as queue:
+            # Re-read once the subscription is live so a change between the first read and it is not lost.
+            latest = await hub.snapshot(job_id) or initial
+            yield _sse(latest)
+            if latest["status"] in TERMINAL_STATUSES:
+                return
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    # Events are best effort; the job row is not, so a missed terminal event still ends the stream.
+                    current = await _load_job_event(job_id)
+                    if current is None or current["status"] in TERMINAL_STATUSES:
+                        if current is not None:
+                            yield _sse(current)
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+                if event["status"] in TERMINAL_STATUSES:
+                    return
 
-    return job
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
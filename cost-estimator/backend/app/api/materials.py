@@ -1,22 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.material import Material
 from app.schemas.material import MaterialCreate, MaterialRead
+from app.services.reference_data import MaterialSnapshot, ReferenceData, get_reference_data
+from app.services.stock_catalog import default_stock_items
 
 router = APIRouter(prefix="/materials", tags=["materials"])
 
 
 @router.get("", response_model=list[MaterialRead])
-def list_materials(db: Session = Depends(get_db)) -> list[Material]:
-    return list(db.scalars(select(Material).order_by(Material.code.asc())).all())
+async def list_materials(reference: ReferenceData = Depends(get_reference_data)) -> list[MaterialSnapshot]:
+    return list(reference.materials)
 
 
 @router.post("", response_model=MaterialRead, status_code=status.HTTP_201_CREATED)
-def create_material(payload: MaterialCreate, db: Session = Depends(get_db)) -> Material:
-    exists = db.scalar(select(Material.id).where(Material.code == payload.code.upper()))
+async def create_material(payload: MaterialCreate, db: AsyncSession = Depends(get_async_db)) -> Material:
+    exists = await db.scalar(select(Material.id).where(Material.code == payload.code.upper()))
     if exists:
         raise HTTPException(status_code=409, detail="Material code already exists")
     material = Material(
@@ -27,6 +29,9 @@ def create_material(payload: MaterialCreate, db: Session = Depends(get_db)) -> M
         allowance_mm=payload.allowance_mm,
     )
     db.add(material)
-    db.commit()
-    db.refresh(material)
+    await db.flush()
+    # Start from the standard bar/plate sizes; entries can be added through /stock-items.
+    db.add_all(default_stock_items(material.id, material.code, material.density_g_cm3, material.price_per_kg))
+    await db.commit()
+    await db.refresh(material)
     return material
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.services.metrics import get_api_registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    # Sync handler: the queue-depth collector does a blocking Redis round trip per scrape.
+    return Response(generate_latest(get_api_registry()), media_type=CONTENT_TYPE_LATEST)
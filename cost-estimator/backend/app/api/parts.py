@@ -1,59 +1,249 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import logging
+from datetime import datetime
 from pathlib import Path
+from typing import AsyncIterator, Callable, Literal
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import Response
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from celery import Signature, group
+from celery.result import AsyncResult, GroupResult
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.config import get_settings
+from app.db.session import get_async_db
+from app.models.analysis_batch import AnalysisBatch
 from app.models.analysis_job import AnalysisJob
-from app.models.material import Material
+from app.models.geometry_cache import GeometryCacheEntry
 from app.models.part import Part
-from app.schemas.part import PartRead, PartSummary, PartUploadResponse
-from app.services.machine_profiles import list_machine_profile_ids
-from app.services.storage_service import StorageService
-from app.tasks.analysis_tasks import run_part_analysis_task
+from app.schemas.batch import BatchFileAccepted, BatchFileError, BatchUploadResponse
+from app.schemas.part import (
+    PartEstimateRequest,
+    PartNestingRequest,
+    PartNestingResponse,
+    PartReanalyzeRequest,
+    PartRead,
+    PartSummary,
+    PartUploadResponse,
+    QuoteMatrixResponse,
+)
+from app.services.analysis_pipeline import CostingStage
+from app.services.batch_upload import BatchSource, BatchUploadService, is_step_filename
+from app.services.costing_service import CostingService
+from app.services.geometry_cache import model_lod_key
+from app.services.job_leases import queued_redelivery_deadline
+from app.services.job_routing import choose_analysis_queue
+from app.services.machine_profiles import MACHINE_PROFILES, get_machine_profile, list_machine_profile_ids
+from app.services.nesting_service import InvalidBlankError, NestingService
+from app.services.reference_data import ReferenceData, get_reference_data
+from app.services.storage_service import (
+    HEAD_SAMPLE_BYTES,
+    ObjectInfo,
+    StorageService,
+    UploadTooLargeError,
+    aiter_storage_stream,
+    get_storage,
+    run_storage_call,
+)
+from app.tasks.analysis_tasks import analysis_signature
 
 router = APIRouter(prefix="/parts", tags=["parts"])
+logger = logging.getLogger(__name__)
 
+# /model URLs carrying the part's current model_version never change content; unversioned (or
+# stale/fallback) responses and raw files are revalidated via ETag.
+MODEL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MODEL_REVALIDATE_CACHE_CONTROL = "no-cache"
+RAW_CACHE_CONTROL = "private, no-cache"
 
-def _validate_step_file(filename: str) -> str:
-    ext = Path(filename).suffix.lower()
-    if ext not in {".step", ".stp"}:
+PART_LIST_DEFAULT_LIMIT = 50
+PART_LIST_MAX_LIMIT = 200
+# Only the PartSummary columns; the JSON result blobs are never loaded for listings.
+PART_SUMMARY_COLUMNS = (
+    Part.id,
+    Part.filename,
+    Part.status,
+    Part.material_id,
+    Part.model_format,
+    Part.created_at,
+    Part.updated_at,
+    Part.total_cost,
+    Part.cycle_time_min,
+    Part.material_cost,
+    Part.machine_profile,
+)
+PART_SORT_COLUMNS = {
+    "created_at": Part.created_at,
+    "total_cost": Part.total_cost,
+    "cycle_time_min": Part.cycle_time_min,
+    "material_cost": Part.material_cost,
+}
+PartSort = Literal["created_at", "total_cost", "cycle_time_min", "material_cost"]
+
+
+def _validate_step_file(filename: str) -> None:
+    if not is_step_filename(filename):
         raise HTTPException(status_code=400, detail="Only .step and .stp files are accepted")
-    return ext
+
+
+def _encode_cursor(sort: str, value: datetime | float, part_id: str) -> str:
+    encoded = value.isoformat() if isinstance(value, datetime) else repr(float(value))
+    raw = f"{sort}|{encoded}|{part_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> tuple[datetime | float, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        cursor_sort, value, part_id = raw.split("|", 2)
+        if cursor_sort != sort:
+            raise ValueError("cursor was issued for a different sort")
+        return (datetime.fromisoformat(value) if sort == "created_at" else float(value)), part_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+async def _cached_geometry_hashes(db: AsyncSession, content_hashes: set[str]) -> set[str]:
+    if not content_hashes:
+        return set()
+    rows = await db.scalars(
+        select(GeometryCacheEntry.content_sha256).where(
+            GeometryCacheEntry.content_sha256.in_(content_hashes), GeometryCacheEntry.status == "ready"
+        )
+    )
+    return set(rows.all())
+
+
+async def _publish(task: Signature) -> AsyncResult | GroupResult | None:
+    """Send analysis task(s); on a broker error the committed job stays queued for the lease reaper.
+
+    Publishing is a blocking Redis call, so it runs in the threadpool.
+    """
+    try:
+        return await run_in_threadpool(task.apply_async)
+    except Exception:  # noqa: BLE001 - the job row carries a redelivery deadline
+        logger.warning("Could not publish analysis task; the reaper will re-send it", exc_info=True)
+        return None
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag in candidates
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        # Unknown units and multi-range requests are answered with the full body.
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError
+            start, end = max(size - suffix, 0), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start > end and last:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
+def _object_response(
+    request: Request,
+    info: ObjectInfo,
+    open_stream: Callable[[int, int | None], AsyncIterator[bytes]],
+    cache_control: str,
+) -> Response:
+    etag = f'"{info.etag}"'
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": cache_control}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        byte_range = _parse_range(range_header, info.size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(info.size)
+        return StreamingResponse(open_stream(0, None), media_type=info.content_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        open_stream(start, end - start + 1),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=info.content_type,
+        headers=headers,
+    )
 
 
 @router.post("/upload", response_model=PartUploadResponse, status_code=status.HTTP_202_ACCEPTED)
-def upload_part(
+async def upload_part(
     file: UploadFile = File(...),
     material_id: int = Form(...),
     machine_profile: str = Form("auto"),
-    db: Session = Depends(get_db),
+    profile: bool = Form(False),
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageService = Depends(get_storage),
+    reference: ReferenceData = Depends(get_reference_data),
 ) -> PartUploadResponse:
-    if db.get(Material, material_id) is None:
+    if reference.material(material_id) is None:
         raise HTTPException(status_code=404, detail="Material not found")
     if machine_profile not in list_machine_profile_ids():
         raise HTTPException(status_code=400, detail="Unknown machine profile")
 
     filename = Path(file.filename or "part.step").name
     _validate_step_file(filename)
-    file_bytes = file.file.read()
-    if len(file_bytes) == 0:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
     part_id = str(uuid4())
     raw_key = f"{part_id}/{filename}"
-    storage = StorageService()
-    storage.upload_raw_file(raw_key, file_bytes, file.content_type or "application/step")
+    try:
+        upload = await run_storage_call(
+            storage.upload_raw_stream,
+            raw_key,
+            file.file,
+            content_type=file.content_type or "application/step",
+            max_bytes=get_settings().max_upload_bytes,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    if upload.size_bytes == 0:
+        await run_storage_call(storage.remove_raw, raw_key)
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
+    # Profiled runs always analyze the file, so they are routed as geometry work.
+    cached = set() if profile else await _cached_geometry_hashes(db, {upload.content_sha256})
+    queue = choose_analysis_queue(upload.size_bytes, upload.head, geometry_cached=upload.content_sha256 in cached)
     part = Part(
         id=part_id,
         filename=filename,
         storage_key=raw_key,
+        content_sha256=upload.content_sha256,
+        size_bytes=upload.size_bytes,
         model_key=None,
         model_format=None,
         status="queued",
@@ -63,58 +253,366 @@ def upload_part(
         id=str(uuid4()),
         part_id=part_id,
         status="queued",
+        machine_profile=machine_profile,
+        queue=queue,
+        profile_requested=profile,
+        lease_expires_at=queued_redelivery_deadline(),
     )
     db.add(part)
     db.add(job)
-    db.commit()
+    await db.commit()
 
-    async_task = run_part_analysis_task.delay(part_id=part.id, job_id=job.id, machine_profile=machine_profile)
-    job.celery_task_id = async_task.id
-    db.commit()
+    async_task = await _publish(analysis_signature(part.id, job.id, machine_profile, queue))
+    if async_task is not None:
+        job.celery_task_id = async_task.id
+        await db.commit()
 
     return PartUploadResponse(part_id=part.id, job_id=job.id, status=job.status)
 
 
+@router.post("/batch-upload", response_model=BatchUploadResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_batch(
+    files: list[UploadFile] = File(...),
+    material_id: int = Form(...),
+    machine_profile: str = Form("auto"),
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageService = Depends(get_storage),
+    reference: ReferenceData = Depends(get_reference_data),
+) -> BatchUploadResponse:
+    """Accept several STEP files and/or ZIP archives of them as one batch.
+
+    Entries that cannot be stored are reported in ``errors``; the others are analyzed in parallel.
+    """
+    if reference.material(material_id) is None:
+        raise HTTPException(status_code=404, detail="Material not found")
+    if machine_profile not in list_machine_profile_ids():
+        raise HTTPException(status_code=400, detail="Unknown machine profile")
+
+    sources = [BatchSource(upload.filename or "part.step", upload.file, upload.content_type) for upload in files]
+    # Reading ZIP entries and uploading them are both blocking; one storage thread does the whole batch.
+    stored = await run_storage_call(BatchUploadService(storage).store, sources)
+
+    batch = AnalysisBatch(
+        id=str(uuid4()),
+        material_id=material_id,
+        machine_profile=machine_profile,
+        total_files=stored.total_files,
+        accepted_files=len(stored.stored),
+        errors_json=stored.errors,
+    )
+    db.add(batch)
+    cached = await _cached_geometry_hashes(db, {item.upload.content_sha256 for item in stored.stored})
+    jobs: list[AnalysisJob] = []
+    for item in stored.stored:
+        db.add(
+            Part(
+                id=item.part_id,
+                filename=item.filename,
+                storage_key=item.upload.key,
+                content_sha256=item.upload.content_sha256,
+                size_bytes=item.upload.size_bytes,
+                status="queued",
+                material_id=material_id,
+            )
+        )
+        job = AnalysisJob(
+            id=str(uuid4()),
+            part_id=item.part_id,
+            batch_id=batch.id,
+            status="queued",
+            machine_profile=machine_profile,
+            queue=choose_analysis_queue(
+                item.upload.size_bytes,
+                item.upload.head,
+                geometry_cached=item.upload.content_sha256 in cached,
+            ),
+            lease_expires_at=queued_redelivery_deadline(),
+        )
+        db.add(job)
+        jobs.append(job)
+    await db.commit()
+
+    if jobs:
+        # One broker round trip for the whole batch; each task still claims its own job lease.
+        fan_out = group(analysis_signature(job.part_id, job.id, machine_profile, job.queue) for job in jobs)
+        group_result = await _publish(fan_out)
+        if group_result is not None:
+            batch.celery_group_id = group_result.id
+            for job, task_result in zip(jobs, group_result.results):
+                job.celery_task_id = task_result.id
+            await db.commit()
+
+    return BatchUploadResponse(
+        batch_id=batch.id,
+        total_files=stored.total_files,
+        accepted=[
+            BatchFileAccepted(filename=item.filename, part_id=item.part_id, job_id=job.id)
+            for item, job in zip(stored.stored, jobs)
+        ],
+        errors=[BatchFileError(**error) for error in stored.errors],
+    )
+
+
 @router.get("", response_model=list[PartSummary])
-def list_parts(db: Session = Depends(get_db)) -> list[Part]:
-    rows = db.scalars(select(Part).order_by(Part.created_at.desc())).all()
-    return list(rows)
+async def list_parts(
+    response: Response,
+    limit: int = Query(default=PART_LIST_DEFAULT_LIMIT, ge=1, le=PART_LIST_MAX_LIMIT),
+    cursor: str | None = Query(default=None),
+    status_filter: Literal["queued", "processing", "completed", "failed"] | None = Query(default=None, alias="status"),
+    material_id: int | None = Query(default=None),
+    machine_profile: str | None = Query(default=None, max_length=40),
+    min_total_cost: float | None = Query(default=None),
+    max_total_cost: float | None = Query(default=None),
+    min_cycle_time_min: float | None = Query(default=None),
+    max_cycle_time_min: float | None = Query(default=None),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    sort: PartSort = Query(default="created_at"),
+    order: Literal["asc", "desc"] = Query(default="desc"),
+    db: AsyncSession = Depends(get_async_db),
+) -> list:
+    """Newest first by default. Pass the ``X-Next-Cursor`` response header back as ``cursor``
+    (with the same ``sort``/``order``) for the next page. Cost sorts skip parts not costed yet.
+    """
+    query = select(*PART_SUMMARY_COLUMNS)
+    if status_filter is not None:
+        query = query.where(Part.status == status_filter)
+    if material_id is not None:
+        query = query.where(Part.material_id == material_id)
+    if machine_profile is not None:
+        query = query.where(Part.machine_profile == machine_profile)
+    for column, lower, upper in (
+        (Part.total_cost, min_total_cost, max_total_cost),
+        (Part.cycle_time_min, min_cycle_time_min, max_cycle_time_min),
+        (Part.created_at, created_from, created_to),
+    ):
+        if lower is not None:
+            query = query.where(column >= lower)
+        if upper is not None:
+            query = query.where(column <= upper)
+
+    sort_column = PART_SORT_COLUMNS[sort]
+    if sort != "created_at":
+        query = query.where(sort_column.is_not(None))
+    if cursor is not None:
+        value, part_id = _decode_cursor(cursor, sort)
+        key, bound = tuple_(sort_column, Part.id), tuple_(value, part_id)
+        query = query.where(key < bound if order == "desc" else key > bound)
+    if order == "desc":
+        query = query.order_by(sort_column.desc(), Part.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Part.id.asc())
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(sort, getattr(last, sort), last.id)
+    return rows
 
 
 @router.get("/{part_id}", response_model=PartRead)
-def get_part(part_id: str, db: Session = Depends(get_db)) -> Part:
-    part = db.get(Part, part_id)
+async def get_part(part_id: str, db: AsyncSession = Depends(get_async_db)) -> Part:
+    part = await db.get(Part, part_id)
     if part is None:
         raise HTTPException(status_code=404, detail="Part not found")
     return part
 
 
+@router.post("/{part_id}/estimate", response_model=PartRead)
+async def reestimate_part(
+    part_id: str,
+    payload: PartEstimateRequest,
+    db: AsyncSession = Depends(get_async_db),
+    reference: ReferenceData = Depends(get_reference_data),
+) -> Part:
+    part = await db.get(Part, part_id)
+    if part is None:
+        raise HTTPException(status_code=404, detail="Part not found")
+    if part.status in {"queued", "processing"}:
+        raise HTTPException(status_code=409, detail="Part analysis in progress")
+    if not part.geometry_json:
+        raise HTTPException(status_code=409, detail="Part geometry not analyzed yet")
+
+    material = reference.material(payload.material_id or part.material_id)
+    if material is None:
+        raise HTTPException(status_code=404, detail="Material not found")
+    machine_profile = payload.machine_profile or (part.estimate_json or {}).get("machine_profile", {}).get("id", "auto")
+    if machine_profile not in list_machine_profile_ids():
+        raise HTTPException(status_code=400, detail="Unknown machine profile")
+
+    machine = get_machine_profile(machine_profile)
+    CostingStage().apply(
+        part, material, machine, reference.profiles_for(material.id, machine.id), reference.stock_catalog
+    )
+    part.status = "completed"
+    await db.commit()
+    await db.refresh(part)
+    return part
+
+
+@router.post("/{part_id}/reanalyze", response_model=PartUploadResponse, status_code=status.HTTP_202_ACCEPTED)
+async def reanalyze_part(
+    part_id: str,
+    payload: PartReanalyzeRequest,
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageService = Depends(get_storage),
+    reference: ReferenceData = Depends(get_reference_data),
+) -> PartUploadResponse:
+    """Queue a new analysis job for an uploaded part, optionally under the sampling profiler."""
+    part = await db.get(Part, part_id)
+    if part is None:
+        raise HTTPException(status_code=404, detail="Part not found")
+    if part.status in {"queued", "processing"}:
+        raise HTTPException(status_code=409, detail="Part analysis in progress")
+
+    material_id = payload.material_id or part.material_id
+    if reference.material(material_id) is None:
+        raise HTTPException(status_code=404, detail="Material not found")
+    machine_profile = payload.machine_profile or (part.estimate_json or {}).get("machine_profile", {}).get("id", "auto")
+    if machine_profile not in list_machine_profile_ids():
+        raise HTTPException(status_code=400, detail="Unknown machine profile")
+
+    cached = (
+        set()
+        if payload.profile or part.content_sha256 is None
+        else await _cached_geometry_hashes(db, {part.content_sha256})
+    )
+    if part.content_sha256 in cached:
+        queue = choose_analysis_queue(part.size_bytes or 0, b"", geometry_cached=True)
+    else:
+        storage_key = part.storage_key
+        try:
+            info = await run_storage_call(storage.stat_raw, storage_key)
+            head = await run_storage_call(lambda: b"".join(storage.iter_raw(storage_key, 0, HEAD_SAMPLE_BYTES)))
+        except FileNotFoundError as exc:
+            raise HTTPException(status_code=404, detail="Raw file not found") from exc
+        queue = choose_analysis_queue(info.size, head)
+
+    part.material_id = material_id
+    part.status = "queued"
+    job = AnalysisJob(
+        id=str(uuid4()),
+        part_id=part.id,
+        status="queued",
+        machine_profile=machine_profile,
+        queue=queue,
+        profile_requested=payload.profile,
+        lease_expires_at=queued_redelivery_deadline(),
+    )
+    db.add(job)
+    await db.commit()
+
+    async_task = await _publish(analysis_signature(part.id, job.id, machine_profile, queue))
+    if async_task is not None:
+        job.celery_task_id = async_task.id
+        await db.commit()
+
+    return PartUploadResponse(part_id=part.id, job_id=job.id, status=job.status)
+
+
+@router.get("/{part_id}/quote-matrix", response_model=QuoteMatrixResponse)
+async def get_part_quote_matrix(
+    part_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    reference: ReferenceData = Depends(get_reference_data),
+) -> QuoteMatrixResponse:
+    row = (await db.execute(select(Part.id, Part.geometry_json).where(Part.id == part_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Part not found")
+    if not row.geometry_json:
+        raise HTTPException(status_code=409, detail="Part geometry not analyzed yet")
+
+    matrix = CostingService().quote_matrix(
+        geometry=row.geometry_json,
+        materials=reference.materials,
+        parameter_profiles=reference.profiles,
+        machines=MACHINE_PROFILES.values(),
+        stock_catalog=reference.stock_catalog,
+    )
+    return QuoteMatrixResponse(part_id=row.id, **matrix)
+
+
+@router.post("/{part_id}/nesting", response_model=PartNestingResponse)
+async def nest_part(
+    part_id: str,
+    payload: PartNestingRequest,
+    db: AsyncSession = Depends(get_async_db),
+    reference: ReferenceData = Depends(get_reference_data),
+) -> PartNestingResponse:
+    """Bars or plates to buy for ``quantity`` copies of the part, and the material cost per part."""
+    row = (await db.execute(select(Part.id, Part.material_id, Part.stock_json).where(Part.id == part_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Part not found")
+    if not row.stock_json:
+        raise HTTPException(status_code=409, detail="Part not estimated yet")
+
+    nesting = NestingService(kerf_mm=payload.kerf_mm, parting_allowance_mm=payload.parting_allowance_mm)
+    try:
+        plan = nesting.plan(row.stock_json, row.material_id, payload.quantity, reference.stock_catalog)
+    except InvalidBlankError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return PartNestingResponse.model_validate({"part_id": row.id, "material_id": row.material_id, **vars(plan)})
+
+
 @router.get("/{part_id}/model")
-def get_part_model(part_id: str, db: Session = Depends(get_db)) -> Response:
-    part = db.get(Part, part_id)
+async def get_part_model(
+    part_id: str,
+    request: Request,
+    lod: Literal["low", "full"] = Query(default="full"),
+    v: str | None = Query(default=None, description="model_version from the part; makes the response immutable"),
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageService = Depends(get_storage),
+) -> Response:
+    part = await db.get(Part, part_id)
     if part is None:
         raise HTTPException(status_code=404, detail="Part not found")
     if not part.model_key:
         raise HTTPException(status_code=404, detail="Model not generated yet")
 
-    storage = StorageService()
-    content, content_type = storage.get_model_bytes(part.model_key)
-    return Response(
-        content=content,
-        media_type=content_type,
-        headers={
-            "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
-            "Pragma": "no-cache",
-            "Expires": "0",
-        },
+    model_key = model_lod_key(part.model_key, lod)
+    try:
+        info = await run_storage_call(storage.stat_model, model_key)
+    except FileNotFoundError as exc:
+        if model_key == part.model_key:
+            raise HTTPException(status_code=404, detail="Model file not found") from exc
+        # Fallback-estimator previews, and those generated before LODs existed, only have the full model.
+        model_key = part.model_key
+        try:
+            info = await run_storage_call(storage.stat_model, model_key)
+        except FileNotFoundError as exc:
+            raise HTTPException(status_code=404, detail="Model file not found") from exc
+    # Keys are write-once per export, so whatever the current version resolves to never changes.
+    immutable = v is not None and v == part.model_version
+    return _object_response(
+        request,
+        info,
+        lambda offset, length: aiter_storage_stream(storage.iter_model(model_key, offset, length)),
+        MODEL_CACHE_CONTROL if immutable else MODEL_REVALIDATE_CACHE_CONTROL,
     )
 
 
 @router.get("/{part_id}/raw")
-def get_part_raw_file(part_id: str, db: Session = Depends(get_db)) -> Response:
-    part = db.get(Part, part_id)
+async def get_part_raw_file(
+    part_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    storage: StorageService = Depends(get_storage),
+) -> Response:
+    part = await db.get(Part, part_id)
     if part is None:
         raise HTTPException(status_code=404, detail="Part not found")
-    storage = StorageService()
-    content, content_type = storage.get_raw_bytes(part.storage_key)
-    return Response(content=content, media_type=content_type)
+
+    storage_key = part.storage_key
+    try:
+        info = await run_storage_call(storage.stat_raw, storage_key)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Raw file not found") from exc
+    return _object_response(
+        request,
+        info,
+        lambda offset, length: aiter_storage_stream(storage.iter_raw(storage_key, offset, length)),
+        RAW_CACHE_CONTROL,
+    )
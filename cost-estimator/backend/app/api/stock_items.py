@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.models.stock_item import StockItem
+from app.schemas.stock_item import StockForm, StockItemCreate, StockItemRead
+from app.services.reference_data import ReferenceData, get_reference_data
+from app.services.stock_catalog import StockSku, piece_price, stock_volume_mm3
+
+router = APIRouter(prefix="/stock-items", tags=["stock-items"])
+
+# Dimensions each form needs; the others are stored as NULL.
+FORM_DIMENSIONS = {
+    "round_bar": ("diameter_mm",),
+    "flat_bar": ("width_mm", "thickness_mm"),
+    "plate": ("width_mm", "thickness_mm"),
+}
+
+
+@router.get("", response_model=list[StockItemRead])
+async def list_stock_items(
+    material_id: int | None = Query(default=None),
+    form: StockForm | None = Query(default=None),
+    reference: ReferenceData = Depends(get_reference_data),
+) -> list[StockSku]:
+    return reference.stock_catalog.skus(material_id, form)
+
+
+@router.post("", response_model=StockItemRead, status_code=status.HTTP_201_CREATED)
+async def create_stock_item(
+    payload: StockItemCreate,
+    db: AsyncSession = Depends(get_async_db),
+    reference: ReferenceData = Depends(get_reference_data),
+) -> StockItem:
+    material = reference.material(payload.material_id)
+    if material is None:
+        raise HTTPException(status_code=404, detail="Material not found")
+    missing = [name for name in FORM_DIMENSIONS[payload.form] if getattr(payload, name) is None]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"{payload.form} requires {', '.join(missing)}")
+    exists = await db.scalar(select(StockItem.id).where(StockItem.sku == payload.sku))
+    if exists:
+        raise HTTPException(status_code=409, detail="Stock SKU already exists")
+
+    dimensions = {name: getattr(payload, name) for name in FORM_DIMENSIONS[payload.form]}
+    unit_price = payload.unit_price
+    if unit_price is None:
+        volume_mm3 = stock_volume_mm3(payload.form, payload.length_mm, **dimensions)
+        unit_price = piece_price(volume_mm3, material.density_g_cm3, material.price_per_kg)
+    item = StockItem(
+        sku=payload.sku,
+        material_id=material.id,
+        form=payload.form,
+        length_mm=payload.length_mm,
+        unit_price=unit_price,
+        **dimensions,
+    )
+    db.add(item)
+    await db.commit()
+    await db.refresh(item)
+    return item
@@ -1,8 +1,12 @@
-from sqlalchemy import select
+from sqlalchemy import inspect, select, text, update
 
 from app.db.session import Base, SessionLocal, engine
 from app.models.cutting_parameter import CuttingParameter
 from app.models.material import Material
+from app.models.stock_item import StockItem
+from app.services.stock_catalog import default_stock_items
+
+COST_BACKFILL_BATCH_SIZE = 500
 
 
 def seed_reference_data() -> None:
@@ -79,10 +83,86 @@ def seed_reference_data() -> None:
             db.add_all(defaults)
             db.commit()
 
+        has_stock = db.scalar(select(StockItem.id).limit(1))
+        if not has_stock:
+            # Databases created before the stock catalog get the standard sizes that used to be
+            # hard-coded in StockService, so existing estimates do not change.
+            for material in db.scalars(select(Material).order_by(Material.id.asc())).all():
+                db.add_all(
+                    default_stock_items(material.id, material.code, material.density_g_cm3, material.price_per_kg)
+                )
+            db.commit()
+
+
+def add_missing_columns() -> None:
+    # create_all() only creates missing tables; nullable columns added to existing models
+    # (and their indexes) are brought in here so older databases keep working.
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"Cannot add non-nullable column {table.name}.{column.name} automatically")
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+
+
+def backfill_cost_columns() -> int:
+    # Parts costed before the denormalized cost columns existed; walks by id in batches and only
+    # reads id + estimate_json, so it is cheap to re-run on every start once nothing is left.
+    from app.models.part import Part
+    from app.services.costing_service import estimate_cost_columns
+
+    updated = 0
+    last_id = ""
+    with SessionLocal() as db:
+        while True:
+            rows = db.execute(
+                select(Part.id, Part.estimate_json)
+                .where(Part.id > last_id, Part.total_cost.is_(None), Part.estimate_json.is_not(None))
+                .order_by(Part.id.asc())
+                .limit(COST_BACKFILL_BATCH_SIZE)
+            ).all()
+            if not rows:
+                return updated
+            for part_id, estimate in rows:
+                columns = estimate_cost_columns(estimate)
+                if columns["total_cost"] is None:
+                    continue
+                db.execute(
+                    update(Part)
+                    .where(Part.id == part_id)
+                    .values(**columns)
+                    .execution_options(synchronize_session=False)
+                )
+                updated += 1
+            db.commit()
+            last_id = rows[-1].id
+
 
 def init_db() -> None:
     # Ensure model metadata is loaded
-    from app.models import analysis_job, cutting_parameter, material, part  # noqa: F401
+    from app.models import (  # noqa: F401
+        analysis_batch,
+        analysis_job,
+        cutting_parameter,
+        geometry_cache,
+        material,
+        part,
+        stock_item,
+    )
 
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    backfill_cost_columns()
     seed_reference_data()
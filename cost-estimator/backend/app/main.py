@@ -1,9 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.metrics import router as metrics_router
 from app.api.router import api_router
 from app.core.config import get_settings
-from app.db.init_db import init_db
+from app.db.session import async_engine
+from app.services.job_events import close_job_event_hub
+from app.services.reference_data import close_reference_cache, warm_reference_cache
 
 settings = get_settings()
 
@@ -15,12 +18,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Accept-Ranges", "Content-Range", "Content-Length", "X-Next-Cursor"],
 )
 
 
 @app.on_event("startup")
 def startup_event() -> None:
-    init_db()
+    # Schema, seed data and buckets are set up once by ``python -m scripts.init_db``, not per process.
+    warm_reference_cache()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await close_job_event_hub()
+    close_reference_cache()
+    await async_engine.dispose()
 
 
 app.include_router(api_router, prefix=settings.api_prefix)
+# Prometheus scrapes the conventional unprefixed path.
+app.include_router(metrics_router)
@@ -1,6 +1,9 @@
+from app.models.analysis_batch import AnalysisBatch
 from app.models.analysis_job import AnalysisJob
 from app.models.cutting_parameter import CuttingParameter
+from app.models.geometry_cache import GeometryCacheEntry
 from app.models.material import Material
 from app.models.part import Part
+from app.models.stock_item import StockItem
 
-__all__ = ["Part", "AnalysisJob", "Material", "CuttingParameter"]
+__all__ = ["Part", "AnalysisJob", "AnalysisBatch", "Material", "CuttingParameter", "GeometryCacheEntry", "StockItem"]
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.session import Base
+
+
+class AnalysisBatch(Base):
+    """One multi-file / ZIP upload; progress and totals are aggregated from its jobs on read."""
+
+    __tablename__ = "analysis_batches"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    material_id: Mapped[int] = mapped_column(ForeignKey("materials.id"), nullable=False)
+    machine_profile: Mapped[str] = mapped_column(String(50), nullable=False, default="auto")
+    celery_group_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    total_files: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    accepted_files: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # [{"filename": ..., "error": ...}] for entries rejected before analysis.
+    errors_json: Mapped[list | None] = mapped_column(JSON, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    jobs = relationship("AnalysisJob", back_populates="batch")
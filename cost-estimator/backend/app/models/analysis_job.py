@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
@@ -9,12 +9,28 @@ from app.db.session import Base
 
 class AnalysisJob(Base):
     __tablename__ = "analysis_jobs"
+    __table_args__ = (Index("ix_analysis_jobs_status_lease_expires_at", "status", "lease_expires_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     part_id: Mapped[str] = mapped_column(ForeignKey("parts.id"), nullable=False, index=True)
+    batch_id: Mapped[str | None] = mapped_column(ForeignKey("analysis_batches.id"), nullable=True, index=True)
     celery_task_id: Mapped[str | None] = mapped_column(String(100), nullable=True, index=True)
     status: Mapped[str] = mapped_column(String(30), nullable=False, default="queued")
+    machine_profile: Mapped[str | None] = mapped_column(String(50), nullable=True, default="auto")
+    queue: Mapped[str | None] = mapped_column(String(30), nullable=True)
+    lease_owner: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int | None] = mapped_column(Integer, nullable=True, default=0)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Per-run instrumentation: stage -> wall-clock ms, plus the size of what was analyzed.
+    stage_timings_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    input_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    faces_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    triangle_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Opt-in: run under the sampling profiler; the folded stacks are stored at ``profile_key``.
+    profile_requested: Mapped[bool | None] = mapped_column(Boolean, nullable=True, default=False)
+    profile_key: Mapped[str | None] = mapped_column(String(500), nullable=True)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -23,3 +39,4 @@ class AnalysisJob(Base):
     )
 
     part = relationship("Part", back_populates="jobs")
+    batch = relationship("AnalysisBatch", back_populates="jobs")
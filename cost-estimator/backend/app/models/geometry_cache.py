@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, JSON, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class GeometryCacheEntry(Base):
+    __tablename__ = "geometry_cache"
+
+    content_sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    status: Mapped[str] = mapped_column(String(30), nullable=False, default="pending")
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    geometry_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    model_key: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    model_format: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
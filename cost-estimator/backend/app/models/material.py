@@ -16,3 +16,4 @@ class Material(Base):
 
     cutting_parameters = relationship("CuttingParameter", back_populates="material", cascade="all,delete")
     parts = relationship("Part", back_populates="material")
+    stock_items = relationship("StockItem", back_populates="material", cascade="all,delete")
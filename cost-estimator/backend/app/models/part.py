@@ -1,18 +1,48 @@
+import hashlib
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, JSON, String, func
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Index, JSON, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
 
 
+PART_SUMMARY_INCLUDE = (
+    "filename",
+    "status",
+    "material_id",
+    "model_format",
+    "created_at",
+    "updated_at",
+    "total_cost",
+    "cycle_time_min",
+    "material_cost",
+    "machine_profile",
+)
+
+
 class Part(Base):
     __tablename__ = "parts"
+    # Keyset pagination walks (created_at, id) newest first; the filtered listings get their own
+    # composite so the equality predicate and the ordering are served by a single index range.
+    __table_args__ = (
+        Index("ix_parts_created_at_id", "created_at", "id"),
+        Index("ix_parts_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_parts_material_id_created_at_id", "material_id", "created_at", "id"),
+        # Cost sorts/range filters; on Postgres the listing columns are INCLUDEd so those pages
+        # are answered by index-only scans.
+        Index("ix_parts_total_cost_id", "total_cost", "id", postgresql_include=PART_SUMMARY_INCLUDE),
+        Index("ix_parts_cycle_time_min_id", "cycle_time_min", "id", postgresql_include=PART_SUMMARY_INCLUDE),
+        Index("ix_parts_material_cost_id", "material_cost", "id", postgresql_include=PART_SUMMARY_INCLUDE),
+        Index("ix_parts_machine_profile_total_cost_id", "machine_profile", "total_cost", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     storage_key: Mapped[str] = mapped_column(String(500), nullable=False)
+    content_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     model_key: Mapped[str | None] = mapped_column(String(500), nullable=True)
     model_format: Mapped[str | None] = mapped_column(String(20), nullable=True)
     status: Mapped[str] = mapped_column(String(30), nullable=False, default="queued")
@@ -24,6 +54,12 @@ class Part(Base):
     operations_json: Mapped[list | None] = mapped_column(JSON, nullable=True)
     estimate_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
+    # Denormalized from estimate_json by CostingStage so listings can sort and filter on them.
+    total_cost: Mapped[float | None] = mapped_column(Float, nullable=True)
+    cycle_time_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    material_cost: Mapped[float | None] = mapped_column(Float, nullable=True)
+    machine_profile: Mapped[str | None] = mapped_column(String(40), nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
@@ -31,3 +67,10 @@ class Part(Base):
 
     material = relationship("Material", back_populates="parts")
     jobs = relationship("AnalysisJob", back_populates="part", cascade="all,delete")
+
+    @property
+    def model_version(self) -> str | None:
+        """Identifies the stored preview; model objects are write-once, so it changes with ``model_key``."""
+        if not self.model_key:
+            return None
+        return hashlib.sha256(self.model_key.encode()).hexdigest()[:16]
@@ -0,0 +1,29 @@
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.session import Base
+
+STOCK_FORMS = ("round_bar", "flat_bar", "plate")
+
+
+class StockItem(Base):
+    """One purchasable stock SKU: a bar of a given section and length, or a plate sheet.
+
+    ``round_bar`` uses ``diameter_mm``; ``flat_bar`` a ``width_mm`` x ``thickness_mm`` section;
+    ``plate`` a ``thickness_mm`` sheet of ``width_mm`` x ``length_mm``. Bars are ``length_mm`` long.
+    """
+
+    __tablename__ = "stock_items"
+    __table_args__ = (Index("ix_stock_items_material_id_form", "material_id", "form"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    sku: Mapped[str] = mapped_column(String(80), unique=True, nullable=False, index=True)
+    material_id: Mapped[int] = mapped_column(ForeignKey("materials.id"), nullable=False)
+    form: Mapped[str] = mapped_column(String(20), nullable=False)
+    diameter_mm: Mapped[float | None] = mapped_column(Float, nullable=True)
+    width_mm: Mapped[float | None] = mapped_column(Float, nullable=True)
+    thickness_mm: Mapped[float | None] = mapped_column(Float, nullable=True)
+    length_mm: Mapped[float] = mapped_column(Float, nullable=False)
+    unit_price: Mapped[float] = mapped_column(Float, nullable=False)
+
+    material = relationship("Material", back_populates="stock_items")
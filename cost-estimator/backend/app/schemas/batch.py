@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class BatchFileAccepted(BaseModel):
+    filename: str
+    part_id: str
+    job_id: str
+
+
+class BatchFileError(BaseModel):
+    filename: str
+    error: str
+
+
+class BatchUploadResponse(BaseModel):
+    batch_id: str
+    total_files: int
+    accepted: list[BatchFileAccepted]
+    errors: list[BatchFileError]
+
+
+class BatchItem(BaseModel):
+    part_id: str
+    job_id: str
+    filename: str
+    status: str
+    total_cost: float | None
+    cycle_time_min: float | None
+    error_message: str | None
+
+
+class BatchRead(BaseModel):
+    id: str
+    status: str
+    material_id: int
+    machine_profile: str
+    total_files: int
+    accepted_files: int
+    rejected_files: int
+    queued: int
+    running: int
+    completed: int
+    failed: int
+    total_cost: float
+    total_cycle_time_min: float
+    errors: list[BatchFileError]
+    items: list[BatchItem]
+    created_at: datetime
+    updated_at: datetime
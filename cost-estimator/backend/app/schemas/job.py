@@ -8,7 +8,17 @@ class JobRead(ORMModel):
     part_id: str
     celery_task_id: str | None
     status: str
+    machine_profile: str | None
+    queue: str | None
+    attempts: int | None
+    heartbeat_at: datetime | None
     error_message: str | None
+    stage_timings_json: dict | None = None
+    input_bytes: int | None = None
+    faces_count: int | None = None
+    triangle_count: int | None = None
+    profile_requested: bool | None = None
+    profile_key: str | None = None
     started_at: datetime | None
     completed_at: datetime | None
     created_at: datetime
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.common import ORMModel
 
@@ -19,17 +19,34 @@ class PartSummary(ORMModel):
     model_format: str | None
     created_at: datetime
     updated_at: datetime
+    total_cost: float | None = None
+    cycle_time_min: float | None = None
+    material_cost: float | None = None
+    machine_profile: str | None = None
 
 
 class PartRead(PartSummary):
     storage_key: str
     model_key: str | None
+    model_version: str | None = None
     geometry_json: dict | None
     stock_json: dict | None
     operations_json: list | None
     estimate_json: dict | None
 
 
+class PartEstimateRequest(BaseModel):
+    material_id: int | None = None
+    machine_profile: str | None = None
+
+
+class PartReanalyzeRequest(BaseModel):
+    material_id: int | None = None
+    machine_profile: str | None = None
+    # Run under the sampling profiler; the job links to the stored folded stacks.
+    profile: bool = False
+
+
 class EstimateResult(BaseModel):
     material_cost: float
     machining_cost: float
@@ -37,3 +54,59 @@ class EstimateResult(BaseModel):
     total_cost: float
     total_cycle_time_min: float
     operation_breakdown: list[dict]
+
+
+class QuoteMatrixCell(BaseModel):
+    material_id: int
+    material_code: str
+    machine_profile: str
+    machine_label: str
+    fit_for_part_bbox: bool
+    stock_type: str
+    material_cost: float
+    machining_cost: float
+    labor_cost: float
+    total_cost: float
+    total_cycle_time_min: float
+    cheapest_fit: bool
+
+
+class QuoteMatrixResponse(BaseModel):
+    part_id: str
+    cells: list[QuoteMatrixCell]
+    cheapest: QuoteMatrixCell | None
+
+
+class PartNestingRequest(BaseModel):
+    quantity: int = Field(ge=1, le=100_000)
+    # Override the configured saw kerf / parting allowance for this quote.
+    kerf_mm: float | None = Field(default=None, ge=0)
+    parting_allowance_mm: float | None = Field(default=None, ge=0)
+
+
+class NestingLotRead(ORMModel):
+    sku: str
+    form: str
+    length_mm: float
+    width_mm: float | None
+    unit_price: float
+    parts_per_piece: int
+    count: int
+
+
+class PartNestingResponse(ORMModel):
+    part_id: str
+    material_id: int
+    quantity: int
+    form: str
+    section: dict
+    blank_mm: list[float]
+    kerf_mm: float
+    parting_allowance_mm: float
+    lots: list[NestingLotRead]
+    pieces_used: int
+    stock_volume_cm3: float
+    total_material_cost: float
+    material_cost_per_part: float
+    single_part_material_cost: float | None
+    utilization: float
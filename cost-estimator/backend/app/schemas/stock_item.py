@@ -0,0 +1,31 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.schemas.common import ORMModel
+
+StockForm = Literal["round_bar", "flat_bar", "plate"]
+
+
+class StockItemCreate(BaseModel):
+    sku: str = Field(min_length=1, max_length=80)
+    material_id: int
+    form: StockForm
+    diameter_mm: float | None = Field(default=None, gt=0)
+    width_mm: float | None = Field(default=None, gt=0)
+    thickness_mm: float | None = Field(default=None, gt=0)
+    length_mm: float = Field(gt=0)
+    # Price per bar/sheet; defaults to its weight at the material's price_per_kg.
+    unit_price: float | None = Field(default=None, gt=0)
+
+
+class StockItemRead(ORMModel):
+    id: int
+    sku: str
+    material_id: int
+    form: str
+    diameter_mm: float | None
+    width_mm: float | None
+    thickness_mm: float | None
+    length_mm: float
+    unit_price: float
@@ -1,144 +1,277 @@
 from __future__ import annotations
 
-import tempfile
+import logging
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
 
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.analysis_job import AnalysisJob
-from app.models.cutting_parameter import CuttingParameter
-from app.models.material import Material
 from app.models.part import Part
-from app.services.cycle_time_service import CycleTimeService, ParameterProfile
-from app.services.geometry_service import GeometryService
-from app.services.machine_profiles import get_machine_profile
-from app.services.operation_classifier import OperationClassifier
-from app.services.stock_service import MaterialInfo, StockService
-from app.services.storage_service import StorageService
+from app.services.costing_service import CostingService, MaterialLike, estimate_cost_columns
+from app.services.cycle_time_service import ParameterProfile
+from app.services.geometry_cache import GeometryCacheService, file_sha256, model_lod_key
+from app.services.machine_profiles import MachineProfile, get_machine_profile
+from app.services.metrics import StageTimer, observe_analysis
+from app.services.profiling import PROFILE_CONTENT_TYPE, SamplingProfiler, profile_key_for
+from app.services.reference_data import ReferenceDataCache, get_reference_cache
+from app.services.stock_catalog import StockCatalog
 
+if TYPE_CHECKING:
+    from app.services.job_events import JobEventPublisher
+    from app.services.occ_pool import ProgressCallback
+    from app.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+# With a task soft time limit, OCC may use up to this share of it (counted from the task start);
+# the rest covers download and upload, so the pool kills a runaway file before Celery does.
+OCC_SOFT_LIMIT_SHARE = 0.9
+
+
+class GeometryStage:
+    """Download, analyze and preview-export the STEP file; fills ``part.geometry_json`` and the model key."""
+
+    def __init__(self, db: Session, storage: StorageService | None = None, soft_time_limit_s: float | None = None):
+        # Imported here so API processes, which only use CostingStage, never load trimesh/OCC/minio.
+        from app.services.geometry_service import GeometryService
+        from app.services.raw_file_cache import RawFileCache
+        from app.services.storage_service import get_storage
 
-class AnalysisPipeline:
-    def __init__(self, db: Session):
         self.db = db
         self.geometry_service = GeometryService()
-        self.stock_service = StockService()
-        self.operation_classifier = OperationClassifier()
-        self.cycle_service = CycleTimeService()
-        self.storage = StorageService()
+        self.storage = storage or get_storage()
+        self.raw_cache = RawFileCache(self.storage)
+        self.geometry_cache = GeometryCacheService(db, soft_time_limit_s)
+        self.occ_deadline = (
+            time.monotonic() + soft_time_limit_s * OCC_SOFT_LIMIT_SHARE if soft_time_limit_s else None
+        )
+
+    def run(
+        self,
+        part: Part,
+        progress: ProgressCallback | None = None,
+        timer: StageTimer | None = None,
+        profiler: SamplingProfiler | None = None,
+    ) -> None:
+        """A profiled run always analyzes the file (refreshing the cache entry): a cache hit has nothing to show."""
+        geometry, model_key, model_format = self._load_geometry(
+            part, progress or (lambda stage: None), timer or StageTimer(), profiler
+        )
+        part.model_key = model_key
+        part.model_format = model_format
+        part.geometry_json = geometry
+
+    def _load_geometry(
+        self, part: Part, progress: ProgressCallback, timer: StageTimer, profiler: SamplingProfiler | None
+    ) -> tuple[dict, str, str]:
+        step_path: Path | None = None
+        content_sha256 = part.content_sha256
+        if content_sha256 is None:
+            # Parts uploaded before hashing was introduced: hash the downloaded bytes instead.
+            progress("downloading")
+            step_path = self.raw_cache.fetch(part.storage_key)
+            content_sha256 = file_sha256(step_path)
+            part.content_sha256 = content_sha256
+            part.size_bytes = step_path.stat().st_size
+
+        refresh = profiler is not None
+        entry = None if refresh else self.geometry_cache.get_ready(content_sha256)
+        claimed = False
+        if entry is None and not refresh:
+            claimed = self.geometry_cache.claim(content_sha256)
+            if not claimed:
+                entry = self.geometry_cache.wait_for_ready(content_sha256)
+        if entry is not None:
+            self.geometry_cache.record_hit(entry)
+            if part.size_bytes is None:
+                part.size_bytes = entry.size_bytes
+            return dict(entry.geometry_json or {}), entry.model_key, entry.model_format
+
+        try:
+            if step_path is None:
+                progress("downloading")
+                step_path = self.raw_cache.fetch(part.storage_key)
+                if part.size_bytes is None:
+                    part.size_bytes = step_path.stat().st_size
+            occ_timeout_s = None
+            if self.occ_deadline is not None:
+                occ_timeout_s = max(self.occ_deadline - time.monotonic(), 1.0)
+            geometry, model_lods, model_format = self.geometry_service.analyze_step_file(
+                step_path, progress=progress, profiler=profiler, timeout_s=occ_timeout_s
+            )
+            timer.mark("upload")
+            model_key = self.geometry_cache.model_key_for(content_sha256, model_format)
+            for lod, model_bytes in model_lods.items():
+                self.storage.upload_model(model_lod_key(model_key, lod), model_bytes)
+            self.geometry_cache.store(
+                content_sha256,
+                geometry=geometry,
+                model_key=model_key,
+                model_format=model_format,
+                size_bytes=step_path.stat().st_size,
+            )
+        except Exception:
+            if claimed:
+                self.db.rollback()
+                self.geometry_cache.release(content_sha256)
+                self.db.commit()
+            raise
+        return geometry, model_key, model_format
+
+
+class CostingStage:
+    """Stock, operation and cycle-time costing from the stored ``part.geometry_json``."""
+
+    def __init__(self, reference: ReferenceDataCache | None = None):
+        self.reference = reference or get_reference_cache()
+        self.costing_service = CostingService()
+
+    def run(self, part: Part, material: MaterialLike, machine: MachineProfile) -> None:
+        reference = self.reference.get()
+        self.apply(part, material, machine, reference.profiles_for(material.id, machine.id), reference.stock_catalog)
+
+    def apply(
+        self,
+        part: Part,
+        material: MaterialLike,
+        machine: MachineProfile,
+        parameter_profiles: Sequence[ParameterProfile],
+        stock_catalog: StockCatalog | None = None,
+    ) -> None:
+        """Cost ``part`` with already-built parameter profiles (used by the async API path)."""
+        if not part.geometry_json:
+            raise ValueError("Part geometry not analyzed yet")
+        stock, operations, estimate = self.costing_service.estimate(
+            geometry=part.geometry_json,
+            material=material,
+            parameter_profiles=parameter_profiles,
+            machine=machine,
+            stock_catalog=stock_catalog,
+        )
+        part.material_id = material.id
+        part.stock_json = stock
+        part.operations_json = operations
+        part.estimate_json = estimate
+        for column, value in estimate_cost_columns(estimate).items():
+            setattr(part, column, value)
+
+
+class AnalysisPipeline:
+    def __init__(
+        self,
+        db: Session,
+        events: JobEventPublisher | None = None,
+        storage: StorageService | None = None,
+        reference: ReferenceDataCache | None = None,
+        soft_time_limit_s: float | None = None,
+    ):
+        self.db = db
+        self.events = events
+        self.geometry_stage = GeometryStage(db, storage, soft_time_limit_s)
+        self.reference = reference or get_reference_cache()
+        self.costing_stage = CostingStage(self.reference)
 
     def run(self, part_id: str, job_id: str, machine_profile: str = "auto") -> None:
         part = self.db.get(Part, part_id)
         job = self.db.get(AnalysisJob, job_id)
         if part is None or job is None:
             raise ValueError("Part or job not found")
+        if not job.profile_requested:
+            self._run(part, job, machine_profile)
+            return
+
+        profiler = SamplingProfiler(interval_s=get_settings().profile_sample_interval_s)
+        try:
+            with profiler:
+                self._run(part, job, machine_profile, profiler)
+        finally:
+            self._store_profile(part, job, profiler)
 
+    def _run(
+        self, part: Part, job: AnalysisJob, machine_profile: str, profiler: SamplingProfiler | None = None
+    ) -> None:
+        timer = StageTimer()
         part.status = "processing"
         job.status = "running"
         job.started_at = datetime.now(timezone.utc)
         self.db.commit()
+        self._publish(job, "running")
+
+        def on_progress(stage: str) -> None:
+            timer.progress(stage)
+            self._publish(job, "running", stage)
 
         try:
-            material = self.db.get(Material, part.material_id)
+            timer.mark("prepare")
+            material = self.reference.get().material(part.material_id)
             if material is None:
                 raise ValueError("Material not found")
             selected_machine = get_machine_profile(machine_profile)
 
-            with tempfile.TemporaryDirectory(prefix="step-analysis-") as tmp_dir:
-                step_path = Path(tmp_dir) / part.filename
-                self.storage.download_raw_to(part.storage_key, step_path)
-
-                geometry, model_bytes, model_format = self.geometry_service.analyze_step_file(step_path)
-                stock = self.stock_service.determine_stock(
-                    geometry=geometry,
-                    material=MaterialInfo(
-                        density_g_cm3=material.density_g_cm3,
-                        price_per_kg=material.price_per_kg,
-                        allowance_mm=material.allowance_mm,
-                    ),
-                    stock_strategy=selected_machine.stock_strategy,
-                    allowance_multiplier=selected_machine.allowance_multiplier,
-                )
-                operations = self.operation_classifier.classify(
-                    geometry=geometry,
-                    stock=stock,
-                    process_hint=selected_machine.process,
-                )
-
-                param_rows = self.db.scalars(
-                    select(CuttingParameter).where(CuttingParameter.material_id == material.id)
-                ).all()
-                profiles = [
-                    ParameterProfile(
-                        machine_type=row.machine_type,
-                        sfm=row.sfm,
-                        feed_per_rev=row.feed_per_rev,
-                        feed_per_tooth=row.feed_per_tooth,
-                        number_of_teeth=row.number_of_teeth,
-                        tool_change_time_min=row.tool_change_time_min,
-                        facing_time_min=row.facing_time_min,
-                        parting_time_min=row.parting_time_min,
-                        retract_time_min=row.retract_time_min,
-                        cutter_diameter_mm=row.cutter_diameter_mm,
-                        stepover_mm=row.stepover_mm,
-                        non_cut_factor=max(0.0, row.non_cut_factor + selected_machine.non_cut_factor_delta),
-                        machine_cost_per_min=row.machine_cost_per_min * selected_machine.machine_cost_multiplier,
-                        labor_cost_per_min=row.labor_cost_per_min * selected_machine.labor_cost_multiplier,
-                    )
-                    for row in param_rows
-                ]
-
-                estimate = self.cycle_service.estimate(
-                    operations=operations,
-                    geometry=geometry,
-                    stock=stock,
-                    parameter_profiles=profiles,
-                )
-
-                bbox = geometry.get("bbox", {})
-                fit = (
-                    float(bbox.get("x_mm", 0.0)) <= selected_machine.max_x_mm
-                    and float(bbox.get("y_mm", 0.0)) <= selected_machine.max_y_mm
-                    and float(bbox.get("z_mm", 0.0)) <= selected_machine.max_z_mm
-                )
-
-                machine_meta = {
-                    "id": selected_machine.id,
-                    "label": selected_machine.label,
-                    "process": selected_machine.process,
-                    "stock_strategy": selected_machine.stock_strategy,
-                    "allowance_multiplier": selected_machine.allowance_multiplier,
-                    "machine_cost_multiplier": selected_machine.machine_cost_multiplier,
-                    "labor_cost_multiplier": selected_machine.labor_cost_multiplier,
-                    "non_cut_factor_delta": selected_machine.non_cut_factor_delta,
-                    "max_x_mm": selected_machine.max_x_mm,
-                    "max_y_mm": selected_machine.max_y_mm,
-                    "max_z_mm": selected_machine.max_z_mm,
-                    "fit_for_part_bbox": fit,
-                }
-                stock["machine_profile"] = machine_meta
-                estimate["machine_profile"] = machine_meta
-
-                model_key = f"{part.id}/preview.{model_format}"
-                self.storage.upload_model(model_key, model_bytes)
-
-                part.model_key = model_key
-                part.model_format = model_format
-                part.geometry_json = geometry
-                part.stock_json = stock
-                part.operations_json = operations
-                part.estimate_json = estimate
-                part.status = "completed"
-
-                job.status = "completed"
-                job.completed_at = datetime.now(timezone.utc)
-                job.error_message = None
-                self.db.commit()
+            timer.mark("geometry_cache")
+            self.geometry_stage.run(part, progress=on_progress, timer=timer, profiler=profiler)
+            timer.mark("costing")
+            self._publish(job, "running", "costing")
+            self.costing_stage.run(part, material, selected_machine)
+            part.status = "completed"
+
+            job.status = "completed"
+            job.completed_at = datetime.now(timezone.utc)
+            job.error_message = None
+            job.lease_expires_at = None
+            self._record_inputs(job, part)
+            job.stage_timings_json = timer.as_ms()
+            timer.mark("commit")
+            self.db.commit()
+            timer.stop()
+            self._publish(job, "completed")
         except Exception as exc:  # noqa: BLE001
+            timer.stop()
             part.status = "failed"
             job.status = "failed"
             job.error_message = str(exc)
             job.completed_at = datetime.now(timezone.utc)
+            job.lease_expires_at = None
+            self._record_inputs(job, part)
+            # Partial timings show the stage the run died in.
+            job.stage_timings_json = timer.as_ms()
             self.db.commit()
+            observe_analysis(job, timer, "failed")
+            self._publish(job, "failed", error_message=job.error_message)
             raise
+        self._finish_timings(job, timer)
+
+    def _store_profile(self, part: Part, job: AnalysisJob, profiler: SamplingProfiler) -> None:
+        key = profile_key_for(part.id, job.id)
+        try:
+            self.geometry_stage.storage.upload_model(key, profiler.folded().encode("utf-8"), PROFILE_CONTENT_TYPE)
+            job.profile_key = key
+            self.db.commit()
+        except Exception:  # noqa: BLE001 - a lost profile must not change the job outcome
+            self.db.rollback()
+            logger.warning("Could not store profile for job %s", job.id, exc_info=True)
+
+    @staticmethod
+    def _record_inputs(job: AnalysisJob, part: Part) -> None:
+        geometry = part.geometry_json or {}
+        job.input_bytes = part.size_bytes
+        job.faces_count = geometry.get("faces_count")
+        job.triangle_count = geometry.get("triangle_count")
+
+    def _finish_timings(self, job: AnalysisJob, timer: StageTimer) -> None:
+        # The result commit cannot time itself; its duration follows in a one-column update.
+        job.stage_timings_json = timer.as_ms()
+        try:
+            self.db.commit()
+        except Exception:  # noqa: BLE001 - the analysis itself is already committed
+            self.db.rollback()
+            logger.warning("Could not store stage timings for job %s", job.id, exc_info=True)
+        observe_analysis(job, timer, "completed")
+
+    def _publish(self, job: AnalysisJob, status: str, stage: str | None = None, error_message: str | None = None) -> None:
+        if self.events is not None:
+            self.events.publish(job.id, job.part_id, status, stage=stage, error_message=error_message)
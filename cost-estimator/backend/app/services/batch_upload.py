@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+from uuid import uuid4
+
+from app.core.config import get_settings
+from app.services.storage_service import StorageService, UploadResult, UploadTooLargeError
+
+STEP_SUFFIXES = {".step", ".stp"}
+ZIP_SUFFIXES = {".zip"}
+
+
+def is_step_filename(filename: str) -> bool:
+    return Path(filename).suffix.lower() in STEP_SUFFIXES
+
+
+@dataclass
+class BatchSource:
+    """One multipart file of a batch request: a STEP file or a ZIP of them."""
+
+    filename: str
+    stream: BinaryIO
+    content_type: str | None = None
+
+
+@dataclass
+class StoredBatchFile:
+    part_id: str
+    filename: str
+    upload: UploadResult
+
+
+@dataclass
+class BatchStoreResult:
+    total_files: int = 0
+    stored: list[StoredBatchFile] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+
+    def reject(self, filename: str, error: str) -> None:
+        self.errors.append({"filename": filename, "error": error})
+
+
+@dataclass
+class _Entry:
+    filename: str
+    open: Callable[[], BinaryIO] | None
+    content_type: str
+    error: str | None = None
+
+
+class BatchUploadService:
+    """Streams the STEP files of a batch upload to raw storage, one entry at a time.
+
+    ZIP entries are decompressed straight into the multipart upload; nothing is extracted to
+    disk. A bad entry is recorded and skipped so the rest of the batch still goes through.
+    """
+
+    def __init__(self, storage: StorageService, max_bytes: int | None = None, max_files: int | None = None):
+        settings = get_settings()
+        self.storage = storage
+        self.max_bytes = settings.max_upload_bytes if max_bytes is None else max_bytes
+        self.max_files = settings.batch_max_files if max_files is None else max_files
+
+    def store(self, sources: list[BatchSource]) -> BatchStoreResult:
+        result = BatchStoreResult()
+        for source in sources:
+            for entry in self._entries(source):
+                result.total_files += 1
+                if entry.error is not None:
+                    result.reject(entry.filename, entry.error)
+                elif len(result.stored) >= self.max_files:
+                    result.reject(entry.filename, f"Batch limit of {self.max_files} files reached")
+                else:
+                    self._store_entry(entry, result)
+        return result
+
+    def _store_entry(self, entry: _Entry, result: BatchStoreResult) -> None:
+        from minio.error import S3Error
+
+        part_id = str(uuid4())
+        raw_key = f"{part_id}/{entry.filename}"
+        try:
+            with entry.open() as stream:
+                upload = self.storage.upload_raw_stream(
+                    raw_key, stream, content_type=entry.content_type, max_bytes=self.max_bytes
+                )
+        except UploadTooLargeError as exc:
+            result.reject(entry.filename, str(exc))
+            return
+        except (OSError, zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, S3Error) as exc:
+            # Corrupt deflate streams (zlib.error), password-protected entries (RuntimeError) and
+            # unsupported compression methods (NotImplementedError) fail only this entry.
+            result.reject(entry.filename, f"Could not store file: {exc}")
+            return
+        if upload.size_bytes == 0:
+            self.storage.remove_raw(raw_key)
+            result.reject(entry.filename, "Uploaded file is empty")
+            return
+        result.stored.append(StoredBatchFile(part_id=part_id, filename=entry.filename, upload=upload))
+
+    def _entries(self, source: BatchSource) -> Iterator[_Entry]:
+        filename = Path(source.filename or "part.step").name
+        suffix = Path(filename).suffix.lower()
+        if suffix in STEP_SUFFIXES:
+            yield _Entry(filename, lambda: _Unclosable(source.stream), source.content_type or "application/step")
+        elif suffix in ZIP_SUFFIXES:
+            yield from self._zip_entries(filename, source.stream)
+        else:
+            yield _Entry(filename, None, "", error="Only .step, .stp and .zip files are accepted")
+
+    def _zip_entries(self, filename: str, stream: BinaryIO) -> Iterator[_Entry]:
+        try:
+            archive = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile:
+            yield _Entry(filename, None, "", error="Not a valid ZIP archive")
+            return
+        with archive:
+            for info in archive.infolist():
+                name = Path(info.filename).name
+                if info.is_dir() or info.filename.startswith("__MACOSX/") or name.startswith("._"):
+                    continue
+                if not is_step_filename(name):
+                    yield _Entry(name, None, "", error="Only .step and .stp files are accepted")
+                elif info.flag_bits & 0x1:
+                    yield _Entry(name, None, "", error="Encrypted ZIP entries are not supported")
+                elif info.file_size > self.max_bytes:
+                    # Declared size only; the streamed byte count is still enforced while uploading.
+                    yield _Entry(name, None, "", error=f"File exceeds the {self.max_bytes} byte upload limit")
+                else:
+                    yield _Entry(name, lambda info=info: archive.open(info), "application/step")
+
+
+class _Unclosable:
+    """Context-manager view of a request file that leaves closing to its owner."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+
+    def __enter__(self) -> BinaryIO:
+        return self._stream
+
+    def __exit__(self, *exc_info) -> None:
+        return None
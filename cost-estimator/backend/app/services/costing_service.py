@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Mapping, Protocol, Sequence
+
+from app.models.cutting_parameter import CuttingParameter
+from app.services.cycle_time_service import CycleTimeService, ParameterProfile
+from app.services.machine_profiles import MachineProfile
+from app.services.operation_classifier import OperationClassifier
+from app.services.stock_service import MaterialInfo, StockService
+
+if TYPE_CHECKING:
+    from app.services.stock_catalog import StockCatalog
+
+
+class MaterialLike(Protocol):
+    """A ``Material`` row or a cached snapshot of one."""
+
+    id: int
+    code: str
+    density_g_cm3: float
+    price_per_kg: float
+    allowance_mm: float
+
+
+def material_info(material: MaterialLike) -> MaterialInfo:
+    return MaterialInfo(
+        density_g_cm3=material.density_g_cm3,
+        price_per_kg=material.price_per_kg,
+        allowance_mm=material.allowance_mm,
+        id=material.id,
+    )
+
+
+def build_parameter_profiles(rows: Iterable[CuttingParameter], machine: MachineProfile) -> list[ParameterProfile]:
+    return [
+        ParameterProfile(
+            machine_type=row.machine_type,
+            sfm=row.sfm,
+            feed_per_rev=row.feed_per_rev,
+            feed_per_tooth=row.feed_per_tooth,
+            number_of_teeth=row.number_of_teeth,
+            tool_change_time_min=row.tool_change_time_min,
+            facing_time_min=row.facing_time_min,
+            parting_time_min=row.parting_time_min,
+            retract_time_min=row.retract_time_min,
+            cutter_diameter_mm=row.cutter_diameter_mm,
+            stepover_mm=row.stepover_mm,
+            non_cut_factor=max(0.0, row.non_cut_factor + machine.non_cut_factor_delta),
+            machine_cost_per_min=row.machine_cost_per_min * machine.machine_cost_multiplier,
+            labor_cost_per_min=row.labor_cost_per_min * machine.labor_cost_multiplier,
+        )
+        for row in rows
+    ]
+
+
+def fits_part_bbox(machine: MachineProfile, geometry: dict) -> bool:
+    bbox = geometry.get("bbox", {})
+    return (
+        float(bbox.get("x_mm", 0.0)) <= machine.max_x_mm
+        and float(bbox.get("y_mm", 0.0)) <= machine.max_y_mm
+        and float(bbox.get("z_mm", 0.0)) <= machine.max_z_mm
+    )
+
+
+def machine_profile_meta(machine: MachineProfile, geometry: dict) -> dict:
+    return {
+        "id": machine.id,
+        "label": machine.label,
+        "process": machine.process,
+        "stock_strategy": machine.stock_strategy,
+        "allowance_multiplier": machine.allowance_multiplier,
+        "machine_cost_multiplier": machine.machine_cost_multiplier,
+        "labor_cost_multiplier": machine.labor_cost_multiplier,
+        "non_cut_factor_delta": machine.non_cut_factor_delta,
+        "max_x_mm": machine.max_x_mm,
+        "max_y_mm": machine.max_y_mm,
+        "max_z_mm": machine.max_z_mm,
+        "fit_for_part_bbox": fits_part_bbox(machine, geometry),
+    }
+
+
+def estimate_cost_columns(estimate: dict | None) -> dict:
+    """Sortable figures of an estimate, keyed by their denormalized ``parts`` column."""
+    estimate = estimate or {}
+    return {
+        "total_cost": estimate.get("total_cost"),
+        "cycle_time_min": estimate.get("total_cycle_time_min"),
+        "material_cost": estimate.get("material_cost"),
+        "machine_profile": (estimate.get("machine_profile") or {}).get("id"),
+    }
+
+
+class CostingService:
+    def __init__(self) -> None:
+        self.stock_service = StockService()
+        self.operation_classifier = OperationClassifier()
+        self.cycle_service = CycleTimeService()
+
+    def estimate(
+        self,
+        geometry: dict,
+        material: MaterialLike,
+        parameter_profiles: Sequence[ParameterProfile],
+        machine: MachineProfile,
+        stock_catalog: StockCatalog | None = None,
+    ) -> tuple[dict, list[dict], dict]:
+        """``parameter_profiles`` must already be adjusted for ``machine`` (see ``build_parameter_profiles``)."""
+        stock = self.stock_service.determine_stock(
+            geometry=geometry,
+            material=material_info(material),
+            stock_strategy=machine.stock_strategy,
+            allowance_multiplier=machine.allowance_multiplier,
+            catalog=stock_catalog,
+        )
+        operations = self.operation_classifier.classify(
+            geometry=geometry,
+            stock=stock,
+            process_hint=machine.process,
+        )
+        estimate = self.cycle_service.estimate(
+            operations=operations,
+            geometry=geometry,
+            stock=stock,
+            parameter_profiles=parameter_profiles,
+        )
+
+        machine_meta = machine_profile_meta(machine, geometry)
+        stock["machine_profile"] = machine_meta
+        estimate["machine_profile"] = machine_meta
+        return stock, operations, estimate
+
+    def quote_matrix(
+        self,
+        geometry: dict,
+        materials: Iterable[MaterialLike],
+        parameter_profiles: Mapping[tuple[int, str], Sequence[ParameterProfile]],
+        machines: Iterable[MachineProfile],
+        stock_catalog: StockCatalog | None = None,
+    ) -> dict:
+        """``parameter_profiles`` is keyed by ``(material_id, machine_id)``."""
+        machines = list(machines)
+        fit_by_machine = {machine.id: fits_part_bbox(machine, geometry) for machine in machines}
+        combos: list[tuple[MaterialLike, MachineProfile]] = []
+        stocks: list[dict] = []
+        operations: list[list[dict]] = []
+        profiles: list[list[ParameterProfile]] = []
+
+        for material in materials:
+            info = material_info(material)
+            for machine in machines:
+                stock = self.stock_service.determine_stock(
+                    geometry=geometry,
+                    material=info,
+                    stock_strategy=machine.stock_strategy,
+                    allowance_multiplier=machine.allowance_multiplier,
+                    catalog=stock_catalog,
+                )
+                combos.append((material, machine))
+                stocks.append(stock)
+                operations.append(
+                    self.operation_classifier.classify(
+                        geometry=geometry,
+                        stock=stock,
+                        process_hint=machine.process,
+                    )
+                )
+                profiles.append(list(parameter_profiles.get((material.id, machine.id), ())))
+
+        batch = self.cycle_service.compute_batch(
+            operations=operations,
+            geometries=[geometry] * len(combos),
+            stocks=stocks,
+            parameter_profiles=profiles,
+        )
+
+        cells: list[dict] = []
+        for (material, machine), stock, material_cost, machining_cost, labor_cost, total_cost, cycle_time in zip(
+            combos,
+            stocks,
+            batch.material_cost.tolist(),
+            batch.total_machine_cost.tolist(),
+            batch.total_labor_cost.tolist(),
+            batch.total_cost.tolist(),
+            batch.total_cycle_time_min.tolist(),
+        ):
+            cells.append(
+                {
+                    "material_id": material.id,
+                    "material_code": material.code,
+                    "machine_profile": machine.id,
+                    "machine_label": machine.label,
+                    "fit_for_part_bbox": fit_by_machine[machine.id],
+                    "stock_type": stock["stock_type"],
+                    "material_cost": round(material_cost, 4),
+                    "machining_cost": round(machining_cost, 4),
+                    "labor_cost": round(labor_cost, 4),
+                    "total_cost": round(total_cost, 4),
+                    "total_cycle_time_min": round(cycle_time, 4),
+                    "cheapest_fit": False,
+                }
+            )
+
+        cheapest: dict | None = None
+        for start in range(0, len(cells), max(len(machines), 1)):
+            fitting = [cell for cell in cells[start : start + len(machines)] if cell["fit_for_part_bbox"]]
+            if not fitting:
+                continue
+            best = min(fitting, key=lambda cell: cell["total_cost"])
+            best["cheapest_fit"] = True
+            if cheapest is None or best["total_cost"] < cheapest["total_cost"]:
+                cheapest = best
+
+        return {
+            "cells": cells,
+            "cheapest": cheapest,
+        }
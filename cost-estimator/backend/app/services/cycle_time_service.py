@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Sequence
+
+import numpy as np
 
 
 @dataclass
@@ -22,57 +24,128 @@ class ParameterProfile:
     labor_cost_per_min: float
 
 
-class CycleTimeService:
-    def estimate(
-        self,
-        operations: list[dict],
-        geometry: dict,
-        stock: dict,
-        parameter_profiles: Iterable[ParameterProfile],
-    ) -> dict:
-        params_by_type = {p.machine_type: p for p in parameter_profiles}
-        bbox = geometry.get("bbox", {})
-        x = float(bbox.get("x_mm", 0.0))
-        y = float(bbox.get("y_mm", 0.0))
-        z = float(bbox.get("z_mm", 0.0))
-        surface_area_mm2 = float(geometry.get("surface_area_cm2", 0.0)) * 100.0
-        hole_count = int(geometry.get("holes_count", 0))
-        holes_small = int(geometry.get("holes_small_count", 0))
-        bores = int(geometry.get("large_bore_count", 0))
-
-        op_rows: list[dict] = []
-        total_machine_cost = 0.0
-        total_labor_cost = 0.0
-        total_cycle_time = 0.0
-
-        for op in operations:
-            machine_type = op.get("machine_type", "milling")
-            p = params_by_type.get(machine_type) or params_by_type.get("milling")
-            if p is None:
-                continue
-
-            op_name = op.get("operation", machine_type)
-            cycle_min = 0.0
-            details: dict = {}
-
-            if op_name in {"CNC Turning"}:
-                diameter = max(x, y, 1.0)
-                cutting_length = max(z, 1.0)
-                rpm = (p.sfm * 3.82) / max(diameter, 1.0)
-                feed_rate = max(rpm * p.feed_per_rev, 0.1)
-                cycle_min = (cutting_length / feed_rate) + p.facing_time_min + p.parting_time_min
+KIND_TURNING = 0
+KIND_MILLING = 1
+KIND_C_AXIS_MILLING = 2
+KIND_DRILLING = 3
+KIND_TAPPING = 4
+KIND_BORING = 5
+KIND_FALLBACK = 6
+
+OPERATION_KINDS: dict[str, int] = {
+    "CNC Turning": KIND_TURNING,
+    "CNC Milling": KIND_MILLING,
+    "C-axis Milling": KIND_C_AXIS_MILLING,
+    "Drilling": KIND_DRILLING,
+    "Tapping": KIND_TAPPING,
+    "Boring": KIND_BORING,
+}
+
+_PROFILE_FIELDS = (
+    "sfm",
+    "feed_per_rev",
+    "feed_per_tooth",
+    "number_of_teeth",
+    "tool_change_time_min",
+    "facing_time_min",
+    "parting_time_min",
+    "retract_time_min",
+    "cutter_diameter_mm",
+    "stepover_mm",
+    "non_cut_factor",
+    "machine_cost_per_min",
+    "labor_cost_per_min",
+)
+
+
+@dataclass
+class CycleTimeBatch:
+    """Flat per-operation rows plus per-estimate totals for a batch of estimates.
+
+    Row arrays are aligned with ``estimate_index``; rows of one estimate are contiguous
+    and keep the order of its operations.
+    """
+
+    estimate_index: np.ndarray
+    kinds: np.ndarray
+    operation_names: list[str]
+    machine_types: list[str]
+    cycle_time_min: np.ndarray
+    machine_cost: np.ndarray
+    labor_cost: np.ndarray
+    rpm: np.ndarray
+    feed_rate_mm_min: np.ndarray
+    cutting_length_mm: np.ndarray
+    tool_path_length_mm: np.ndarray
+    hole_depth_mm: np.ndarray
+    tool_changes: np.ndarray
+    feature_count: np.ndarray
+
+    material_cost: np.ndarray
+    total_machine_cost: np.ndarray
+    total_labor_cost: np.ndarray
+    total_cost: np.ndarray
+    total_cycle_time_min: np.ndarray
+
+    def to_dicts(self) -> list[dict]:
+        results = [
+            {
+                "material_cost": round(material_cost, 4),
+                "machining_cost": round(machine_cost, 4),
+                "labor_cost": round(labor_cost, 4),
+                "total_cost": round(total_cost, 4),
+                "total_cycle_time_min": round(total_cycle, 4),
+                "operation_breakdown": [],
+            }
+            for material_cost, machine_cost, labor_cost, total_cost, total_cycle in zip(
+                self.material_cost.tolist(),
+                self.total_machine_cost.tolist(),
+                self.total_labor_cost.tolist(),
+                self.total_cost.tolist(),
+                self.total_cycle_time_min.tolist(),
+            )
+        ]
+
+        columns = zip(
+            self.estimate_index.tolist(),
+            self.kinds.tolist(),
+            self.operation_names,
+            self.machine_types,
+            self.cycle_time_min.tolist(),
+            self.machine_cost.tolist(),
+            self.labor_cost.tolist(),
+            self.rpm.tolist(),
+            self.feed_rate_mm_min.tolist(),
+            self.cutting_length_mm.tolist(),
+            self.tool_path_length_mm.tolist(),
+            self.hole_depth_mm.tolist(),
+            self.tool_changes.tolist(),
+            self.feature_count.tolist(),
+        )
+        for (
+            index,
+            kind,
+            op_name,
+            machine_type,
+            cycle,
+            machine_cost,
+            labor_cost,
+            rpm,
+            feed_rate,
+            cutting_length,
+            tool_path_length,
+            hole_depth,
+            tool_changes,
+            feature_count,
+        ) in columns:
+            if kind == KIND_TURNING:
                 details = {
                     "formula": "cycle = cutting_length/feed_rate + facing + parting",
                     "cutting_length_mm": round(cutting_length, 4),
                     "rpm": round(rpm, 4),
                     "feed_rate_mm_min": round(feed_rate, 4),
                 }
-            elif op_name in {"CNC Milling", "C-axis Milling"}:
-                tool_path_length = max(surface_area_mm2 / max(p.stepover_mm, 0.1), 1.0)
-                rpm = (p.sfm * 3.82) / max(p.cutter_diameter_mm, 1.0)
-                feed_rate = max(rpm * p.feed_per_tooth * max(p.number_of_teeth, 1), 0.1)
-                tool_changes = 2 if op_name == "CNC Milling" else 1
-                cycle_min = (tool_path_length / feed_rate) + (tool_changes * p.tool_change_time_min)
+            elif kind in (KIND_MILLING, KIND_C_AXIS_MILLING):
                 details = {
                     "formula": "cycle = tool_path/feed_rate + tool_changes*tool_change_time",
                     "tool_path_length_mm": round(tool_path_length, 4),
@@ -80,21 +153,7 @@ class CycleTimeService:
                     "feed_rate_mm_min": round(feed_rate, 4),
                     "tool_changes": tool_changes,
                 }
-            elif op_name in {"Drilling", "Tapping", "Boring"}:
-                if op_name == "Drilling":
-                    feature_count = max(hole_count, 1)
-                    tool_dia = 8.0
-                elif op_name == "Tapping":
-                    feature_count = max(holes_small, 1)
-                    tool_dia = 4.0
-                else:
-                    feature_count = max(bores, 1)
-                    tool_dia = 20.0
-                hole_depth = max(z * 0.7, 3.0)
-                rpm = (p.sfm * 3.82) / max(tool_dia, 1.0)
-                feed_rate = max(rpm * p.feed_per_rev, 0.1)
-                per_hole = (hole_depth / feed_rate) + p.retract_time_min
-                cycle_min = per_hole * feature_count
+            elif kind in (KIND_DRILLING, KIND_TAPPING, KIND_BORING):
                 details = {
                     "formula": "cycle = feature_count * (depth/(rpm*feed_per_rev) + retract)",
                     "feature_count": feature_count,
@@ -103,36 +162,207 @@ class CycleTimeService:
                     "feed_rate_mm_min": round(feed_rate, 4),
                 }
             else:
-                cycle_min = max(z / 80.0, 0.5)
                 details = {"formula": "fallback_time_model"}
-
-            cycle_min *= 1.0 + max(p.non_cut_factor, 0.0)
-            machine_cost = cycle_min * p.machine_cost_per_min
-            labor_cost = cycle_min * p.labor_cost_per_min
-
-            total_cycle_time += cycle_min
-            total_machine_cost += machine_cost
-            total_labor_cost += labor_cost
-
-            op_rows.append(
+            results[index]["operation_breakdown"].append(
                 {
                     "operation": op_name,
                     "machine_type": machine_type,
-                    "cycle_time_min": round(cycle_min, 4),
+                    "cycle_time_min": round(cycle, 4),
                     "machine_cost": round(machine_cost, 4),
                     "labor_cost": round(labor_cost, 4),
                     "details": details,
                 }
             )
+        return results
+
+
+class CycleTimeService:
+    def estimate(
+        self,
+        operations: list[dict],
+        geometry: dict,
+        stock: dict,
+        parameter_profiles: Iterable[ParameterProfile],
+    ) -> dict:
+        return self.estimate_batch(
+            operations=[operations],
+            geometries=[geometry],
+            stocks=[stock],
+            parameter_profiles=[list(parameter_profiles)],
+        )[0]
+
+    def estimate_batch(
+        self,
+        operations: Sequence[list[dict]],
+        geometries: Sequence[dict],
+        stocks: Sequence[dict],
+        parameter_profiles: Sequence[Sequence[ParameterProfile]],
+    ) -> list[dict]:
+        return self.compute_batch(operations, geometries, stocks, parameter_profiles).to_dicts()
+
+    def compute_batch(
+        self,
+        operations: Sequence[list[dict]],
+        geometries: Sequence[dict],
+        stocks: Sequence[dict],
+        parameter_profiles: Sequence[Sequence[ParameterProfile]],
+    ) -> CycleTimeBatch:
+        count = len(geometries)
+        if not (len(operations) == len(stocks) == len(parameter_profiles) == count):
+            raise ValueError("operations, geometries, stocks and parameter_profiles must have the same length")
+
+        x = np.empty(count)
+        y = np.empty(count)
+        z = np.empty(count)
+        surface_area_mm2 = np.empty(count)
+        hole_count = np.empty(count, dtype=np.int64)
+        holes_small = np.empty(count, dtype=np.int64)
+        bores = np.empty(count, dtype=np.int64)
+        material_cost = np.empty(count)
+        for i, (geometry, stock) in enumerate(zip(geometries, stocks)):
+            bbox = geometry.get("bbox", {})
+            x[i] = float(bbox.get("x_mm", 0.0))
+            y[i] = float(bbox.get("y_mm", 0.0))
+            z[i] = float(bbox.get("z_mm", 0.0))
+            surface_area_mm2[i] = float(geometry.get("surface_area_cm2", 0.0)) * 100.0
+            hole_count[i] = int(geometry.get("holes_count", 0))
+            holes_small[i] = int(geometry.get("holes_small_count", 0))
+            bores[i] = int(geometry.get("large_bore_count", 0))
+            material_cost[i] = float(stock.get("raw_material_cost", 0.0))
+
+        # Profile sets are usually shared across a sweep, so each distinct set is indexed once.
+        lookup_by_set: dict[int, tuple[Sequence[ParameterProfile], dict[str, int]]] = {}
+        profile_rows: list[ParameterProfile] = []
+        estimate_index: list[int] = []
+        profile_index: list[int] = []
+        kinds: list[int] = []
+        operation_names: list[str] = []
+        machine_types: list[str] = []
+
+        for i, (ops, profiles) in enumerate(zip(operations, parameter_profiles)):
+            cached = lookup_by_set.get(id(profiles))
+            if cached is None:
+                by_type: dict[str, int] = {}
+                for profile in profiles:
+                    by_type[profile.machine_type] = len(profile_rows)
+                    profile_rows.append(profile)
+                cached = (profiles, by_type)
+                lookup_by_set[id(profiles)] = cached
+            by_type = cached[1]
+            fallback_index = by_type.get("milling")
+
+            for op in ops:
+                machine_type = op.get("machine_type", "milling")
+                p_index = by_type.get(machine_type, fallback_index)
+                if p_index is None:
+                    continue
+                op_name = op.get("operation", machine_type)
+                estimate_index.append(i)
+                profile_index.append(p_index)
+                kinds.append(OPERATION_KINDS.get(op_name, KIND_FALLBACK))
+                operation_names.append(op_name)
+                machine_types.append(machine_type)
+
+        rows = np.asarray(estimate_index, dtype=np.int64)
+        kind = np.asarray(kinds, dtype=np.int64)
+        table = np.array(
+            [[float(getattr(profile, field)) for field in _PROFILE_FIELDS] for profile in profile_rows],
+            dtype=float,
+        ).reshape(len(profile_rows), len(_PROFILE_FIELDS))
+        params = table[np.asarray(profile_index, dtype=np.int64)]
+        (
+            sfm,
+            feed_per_rev,
+            feed_per_tooth,
+            number_of_teeth,
+            tool_change_time_min,
+            facing_time_min,
+            parting_time_min,
+            retract_time_min,
+            cutter_diameter_mm,
+            stepover_mm,
+            non_cut_factor,
+            machine_cost_per_min,
+            labor_cost_per_min,
+        ) = params.T
+
+        row_x = x[rows]
+        row_y = y[rows]
+        row_z = z[rows]
+        speed = sfm * 3.82
+
+        # Turning
+        diameter = np.maximum(np.maximum(row_x, row_y), 1.0)
+        cutting_length = np.maximum(row_z, 1.0)
+        rpm_turning = speed / np.maximum(diameter, 1.0)
+        feed_turning = np.maximum(rpm_turning * feed_per_rev, 0.1)
+        cycle_turning = (cutting_length / feed_turning) + facing_time_min + parting_time_min
+
+        # Milling / C-axis milling
+        tool_path_length = np.maximum(surface_area_mm2[rows] / np.maximum(stepover_mm, 0.1), 1.0)
+        rpm_milling = speed / np.maximum(cutter_diameter_mm, 1.0)
+        feed_milling = np.maximum(rpm_milling * feed_per_tooth * np.maximum(number_of_teeth, 1.0), 0.1)
+        tool_changes = np.where(kind == KIND_MILLING, 2, 1)
+        cycle_milling = (tool_path_length / feed_milling) + (tool_changes * tool_change_time_min)
+
+        # Drilling / tapping / boring
+        feature_count = np.select(
+            [kind == KIND_DRILLING, kind == KIND_TAPPING],
+            [np.maximum(hole_count[rows], 1), np.maximum(holes_small[rows], 1)],
+            np.maximum(bores[rows], 1),
+        )
+        tool_dia = np.select([kind == KIND_DRILLING, kind == KIND_TAPPING], [8.0, 4.0], 20.0)
+        hole_depth = np.maximum(row_z * 0.7, 3.0)
+        rpm_drilling = speed / np.maximum(tool_dia, 1.0)
+        feed_drilling = np.maximum(rpm_drilling * feed_per_rev, 0.1)
+        cycle_drilling = ((hole_depth / feed_drilling) + retract_time_min) * feature_count
+
+        cycle_fallback = np.maximum(row_z / 80.0, 0.5)
+
+        is_turning = kind == KIND_TURNING
+        is_milling = (kind == KIND_MILLING) | (kind == KIND_C_AXIS_MILLING)
+        is_drilling = (kind == KIND_DRILLING) | (kind == KIND_TAPPING) | (kind == KIND_BORING)
+        branches = [is_turning, is_milling, is_drilling]
+        cycle = np.select(branches, [cycle_turning, cycle_milling, cycle_drilling], cycle_fallback)
+        rpm = np.select(branches, [rpm_turning, rpm_milling, rpm_drilling], 0.0)
+        feed_rate = np.select(branches, [feed_turning, feed_milling, feed_drilling], 0.0)
+
+        cycle = cycle * (1.0 + np.maximum(non_cut_factor, 0.0))
+        machine_cost = cycle * machine_cost_per_min
+        labor_cost = cycle * labor_cost_per_min
+
+        # Accumulate in operation order so totals are bit-identical to a sequential sum.
+        total_cycle = np.zeros(count)
+        total_machine = np.zeros(count)
+        total_labor = np.zeros(count)
+        if len(rows):
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            position = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+            for step in range(int(position.max()) + 1):
+                selected = position == step
+                targets = rows[selected]
+                total_cycle[targets] += cycle[selected]
+                total_machine[targets] += machine_cost[selected]
+                total_labor[targets] += labor_cost[selected]
 
-        material_cost = float(stock.get("raw_material_cost", 0.0))
-        total_cost = material_cost + total_machine_cost + total_labor_cost
-
-        return {
-            "material_cost": round(material_cost, 4),
-            "machining_cost": round(total_machine_cost, 4),
-            "labor_cost": round(total_labor_cost, 4),
-            "total_cost": round(total_cost, 4),
-            "total_cycle_time_min": round(total_cycle_time, 4),
-            "operation_breakdown": op_rows,
-        }
+        return CycleTimeBatch(
+            estimate_index=rows,
+            kinds=kind,
+            operation_names=operation_names,
+            machine_types=machine_types,
+            cycle_time_min=cycle,
+            machine_cost=machine_cost,
+            labor_cost=labor_cost,
+            rpm=rpm,
+            feed_rate_mm_min=feed_rate,
+            cutting_length_mm=cutting_length,
+            tool_path_length_mm=tool_path_length,
+            hole_depth_mm=hole_depth,
+            tool_changes=tool_changes,
+            feature_count=feature_count,
+            material_cost=material_cost,
+            total_machine_cost=total_machine,
+            total_labor_cost=total_labor,
+            total_cost=material_cost + total_machine + total_labor,
+            total_cycle_time_min=total_cycle,
+        )
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.geometry_cache import GeometryCacheEntry
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# A waiter polls for at most this share of its task's soft time limit, leaving the rest to analyze the file itself.
+WAIT_SOFT_LIMIT_SHARE = 0.5
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_lod_key(model_key: str, lod: str) -> str:
+    """Storage key of a preview LOD; "full" lives at ``model_key`` itself, others alongside it."""
+    if lod == "full":
+        return model_key
+    stem, dot, suffix = model_key.rpartition(".")
+    return f"{stem}.{lod}.{suffix}" if dot else f"{model_key}.{lod}"
+
+
+class GeometryCacheService:
+    """Content-addressed store of analyzed geometry, keyed by the SHA-256 of the raw STEP bytes.
+
+    A row in ``pending`` state acts as the claim of the process that is analyzing the file;
+    other uploads of the same content wait for it instead of running OCC again. With
+    ``soft_time_limit_s`` (the calling task's), the wait is capped well below that limit.
+    """
+
+    def __init__(self, db: Session, soft_time_limit_s: float | None = None):
+        settings = get_settings()
+        self.db = db
+        # A claim must outlive any task that may hold it, or a concurrent upload takes over a live run.
+        longest_task_s = max(
+            settings.geometry_heavy_time_limit_s, settings.geometry_light_time_limit_s, settings.costing_time_limit_s
+        )
+        self.claim_ttl = timedelta(seconds=max(settings.geometry_cache_claim_ttl_s, longest_task_s))
+        self.wait_timeout_s = settings.geometry_cache_wait_timeout_s
+        if soft_time_limit_s:
+            self.wait_timeout_s = min(self.wait_timeout_s, soft_time_limit_s * WAIT_SOFT_LIMIT_SHARE)
+        self.poll_interval_s = settings.geometry_cache_poll_interval_s
+
+    @staticmethod
+    def model_key_for(content_sha256: str, model_format: str) -> str:
+        """A fresh key per export: a stored preview is never overwritten, so its URL can be cached forever."""
+        export_id = uuid.uuid4().hex[:12]
+        return f"by-hash/{content_sha256[:2]}/{content_sha256}/preview-{export_id}.{model_format}"
+
+    def get_ready(self, content_sha256: str) -> GeometryCacheEntry | None:
+        entry = self.db.get(GeometryCacheEntry, content_sha256, populate_existing=True)
+        if entry is None or entry.status != "ready":
+            return None
+        return entry
+
+    def claim(self, content_sha256: str, size_bytes: int | None = None) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            with self.db.begin_nested():
+                self.db.add(
+                    GeometryCacheEntry(
+                        content_sha256=content_sha256,
+                        status="pending",
+                        size_bytes=size_bytes,
+                        claimed_at=now,
+                    )
+                )
+        except IntegrityError:
+            # Someone else owns the entry; take it over only if their claim failed or went stale.
+            result = self.db.execute(
+                update(GeometryCacheEntry)
+                .where(
+                    GeometryCacheEntry.content_sha256 == content_sha256,
+                    or_(
+                        GeometryCacheEntry.status == "failed",
+                        and_(
+                            GeometryCacheEntry.status == "pending",
+                            GeometryCacheEntry.claimed_at < now - self.claim_ttl,
+                        ),
+                    ),
+                )
+                .values(status="pending", claimed_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            return result.rowcount == 1
+        self.db.commit()
+        return True
+
+    def wait_for_ready(self, content_sha256: str) -> GeometryCacheEntry | None:
+        deadline = time.monotonic() + self.wait_timeout_s
+        while time.monotonic() < deadline:
+            entry = self.db.get(GeometryCacheEntry, content_sha256, populate_existing=True)
+            # End the read transaction so the next poll sees the owner's commit.
+            self.db.commit()
+            if entry is None or entry.status == "failed":
+                return None
+            if entry.status == "ready":
+                return entry
+            time.sleep(self.poll_interval_s)
+        return None
+
+    def store(
+        self,
+        content_sha256: str,
+        geometry: dict,
+        model_key: str,
+        model_format: str,
+        size_bytes: int | None = None,
+    ) -> GeometryCacheEntry:
+        entry = self.db.get(GeometryCacheEntry, content_sha256)
+        if entry is None:
+            entry = GeometryCacheEntry(content_sha256=content_sha256)
+            self.db.add(entry)
+        entry.status = "ready"
+        entry.geometry_json = geometry
+        entry.model_key = model_key
+        entry.model_format = model_format
+        if size_bytes is not None:
+            entry.size_bytes = size_bytes
+        return entry
+
+    def record_hit(self, entry: GeometryCacheEntry) -> None:
+        entry.hit_count = (entry.hit_count or 0) + 1
+
+    def release(self, content_sha256: str) -> None:
+        self.db.execute(
+            update(GeometryCacheEntry)
+            .where(
+                GeometryCacheEntry.content_sha256 == content_sha256,
+                GeometryCacheEntry.status == "pending",
+            )
+            .values(status="failed")
+            .execution_options(synchronize_session=False)
+        )
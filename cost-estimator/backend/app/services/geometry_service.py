@@ -1,34 +1,103 @@
 from __future__ import annotations
 
+import importlib
 import logging
 import math
-import tempfile
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import trimesh
 
+from app.core.config import get_settings
+from app.services.glb_writer import write_quantized_glb
+from app.services.occ_pool import GeometryAnalysisError, ProgressCallback, get_occ_pool
+from app.services.profiling import SamplingProfiler
+
 logger = logging.getLogger(__name__)
 
+# Linear deflection as a fraction of the bbox diagonal, clamped to [min, max] mm, plus the
+# angular deflection in radians. "low" is meshed first; BRepMesh then refines it to "full".
+LOD_TESSELLATION = {
+    "low": (0.01, 0.05, 5.0, 0.8),
+    "full": (0.0008, 0.005, 0.5, 0.35),
+}
+MODEL_LODS = tuple(LOD_TESSELLATION)
+
+OCC_MODULES = (
+    "OCC.Core.BRep",
+    "OCC.Core.BRepAdaptor",
+    "OCC.Core.BRepBndLib",
+    "OCC.Core.BRepGProp",
+    "OCC.Core.BRepMesh",
+    "OCC.Core.STEPControl",
+    "OCC.Core.TopExp",
+    "OCC.Core.TopTools",
+)
+
+
+def lod_deflection(lod: str, diagonal_mm: float) -> tuple[float, float]:
+    fraction, minimum, maximum, angular = LOD_TESSELLATION[lod]
+    return min(maximum, max(minimum, diagonal_mm * fraction)), angular
+
+
+def _no_progress(stage: str) -> None:
+    pass
+
+
+def import_occ_modules() -> None:
+    """Import every OCC module the analyzer uses; called once when an OCC worker process starts."""
+    for name in OCC_MODULES:
+        importlib.import_module(name)
+
 
 class GeometryService:
-    def analyze_step_file(self, step_file_path: Path) -> tuple[dict[str, Any], bytes, str]:
+    def analyze_step_file(
+        self,
+        step_file_path: Path,
+        progress: ProgressCallback | None = None,
+        profiler: SamplingProfiler | None = None,
+        timeout_s: float | None = None,
+    ) -> tuple[dict[str, Any], dict[str, bytes], str]:
         """
         Returns:
             geometry: extracted geometry properties
-            model_bytes: GLB bytes for browser preview
+            model_lods: GLB bytes for browser preview per level of detail ("low", "full"; only "full"
+                for the fallback estimator)
             model_format: file extension without dot (glb)
+
+        ``profiler`` receives the OCC worker's own samples when the pool is used; in-process
+        analysis is already covered by the caller's profiler. ``timeout_s`` bounds the pooled
+        analysis (default ``OCC_TASK_TIMEOUT_S``).
         """
         try:
-            geometry, mesh = self._analyze_with_occ(step_file_path)
-            glb_bytes = mesh.export(file_type="glb")
-            return geometry, glb_bytes, "glb"
+            if get_settings().occ_pool_enabled:
+                geometry, model_lods = get_occ_pool().analyze(
+                    step_file_path, progress=progress, profiler=profiler, timeout_s=timeout_s
+                )
+            else:
+                geometry, model_lods = self.analyze_with_occ_lods(step_file_path, progress=progress)
+            return geometry, model_lods, "glb"
+        except GeometryAnalysisError:
+            # The OCC worker crashed, hung, ran out of memory or could not be started: fail the file
+            # instead of faking a preview. Only a missing pythonOCC falls through to the estimator.
+            raise
         except Exception as exc:  # noqa: BLE001 - fallback path is required
             logger.warning("pythonOCC analysis unavailable, fallback analysis is used: %s", exc)
-            geometry, mesh = self._analyze_fallback(step_file_path)
-            glb_bytes = mesh.export(file_type="glb")
-            return geometry, glb_bytes, "glb"
+        report = progress or _no_progress
+        report("parsing")
+        geometry, mesh = self._analyze_fallback(step_file_path)
+        report("exporting")
+        # The fallback box has no finer tessellation: store it once, as "full"; /model serves it for "low" too.
+        return geometry, {"full": write_quantized_glb(mesh.vertices, mesh.faces)}, "glb"
+
+    def analyze_with_occ_lods(
+        self, step_file_path: Path, progress: ProgressCallback | None = None
+    ) -> tuple[dict[str, Any], dict[str, bytes]]:
+        report = progress or _no_progress
+        geometry, meshes = self._analyze_with_occ(step_file_path, report)
+        report("exporting")
+        return geometry, {lod: write_quantized_glb(mesh.vertices, mesh.faces) for lod, mesh in meshes.items()}
 
     def _analyze_fallback(self, step_file_path: Path) -> tuple[dict[str, Any], trimesh.Trimesh]:
         size_bytes = max(step_file_path.stat().st_size, 1)
@@ -61,23 +130,24 @@ class GeometryService:
         }
 
         mesh = trimesh.creation.box(extents=np.array([x, y, z], dtype=float))
+        geometry["triangle_count"] = int(len(mesh.faces))
         return geometry, mesh
 
-    def _analyze_with_occ(self, step_file_path: Path) -> tuple[dict[str, Any], trimesh.Trimesh]:
+    def _analyze_with_occ(
+        self, step_file_path: Path, progress: ProgressCallback
+    ) -> tuple[dict[str, Any], dict[str, trimesh.Trimesh]]:
         # pythonOCC is intentionally imported lazily to allow fallback mode when unavailable.
-        from OCC.Core.BRepAdaptor import BRepAdaptor_Surface
         from OCC.Core.BRepBndLib import brepbndlib
         from OCC.Core.BRepGProp import brepgprop
         from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
         from OCC.Core.Bnd import Bnd_Box
         from OCC.Core.GProp import GProp_GProps
-        from OCC.Core.GeomAbs import GeomAbs_Cylinder, GeomAbs_Plane
         from OCC.Core.IFSelect import IFSelect_RetDone
         from OCC.Core.STEPControl import STEPControl_Reader
-        from OCC.Core.StlAPI import StlAPI_Writer
-        from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_FACE
-        from OCC.Core.TopExp import TopExp_Explorer
 
+        from app.services.occ_topology import index_topology, triangulate_faces
+
+        progress("parsing")
         reader = STEPControl_Reader()
         status = reader.ReadFile(str(step_file_path))
         if status != IFSelect_RetDone:
@@ -100,39 +170,11 @@ class GeometryService:
         brepgprop.SurfaceProperties(shape, surface_props)
         area_cm2 = float(surface_props.Mass()) / 100.0
 
-        faces_count = 0
-        edges_count = 0
-        holes_count = 0
-        holes_small_count = 0
-        large_bore_count = 0
-        flat_face_count = 0
-        cylindrical_faces = 0
-
-        exp_face = TopExp_Explorer(shape, TopAbs_FACE)
-        while exp_face.More():
-            faces_count += 1
-            face = exp_face.Current()
-            surf = BRepAdaptor_Surface(face, True)
-            surf_type = surf.GetType()
-            if surf_type == GeomAbs_Cylinder:
-                cylindrical_faces += 1
-                radius = float(surf.Cylinder().Radius())
-                if radius > 0:
-                    holes_count += 1
-                    if radius * 2.0 < 6.0:
-                        holes_small_count += 1
-                    if radius * 2.0 > 20.0:
-                        large_bore_count += 1
-            elif surf_type == GeomAbs_Plane:
-                flat_face_count += 1
-            exp_face.Next()
-
-        exp_edge = TopExp_Explorer(shape, TopAbs_EDGE)
-        while exp_edge.More():
-            edges_count += 1
-            exp_edge.Next()
-
-        rotational = abs(x - y) / max(x, y, 1.0) < 0.08 and cylindrical_faces > 0
+        topology = index_topology(shape)
+        counts = topology.feature_counts()
+        holes_small_count = counts["holes_small_count"]
+
+        rotational = abs(x - y) / max(x, y, 1.0) < 0.08 and counts["cylindrical_face_count"] > 0
         undercut_count = 0  # simplified basic placeholder
         thread_feature_count = max(0, holes_small_count - 1)
 
@@ -140,24 +182,27 @@ class GeometryService:
             "bbox": {"x_mm": round(x, 4), "y_mm": round(y, 4), "z_mm": round(z, 4)},
             "volume_cm3": round(volume_cm3, 4),
             "surface_area_cm2": round(area_cm2, 4),
-            "faces_count": faces_count,
-            "edges_count": edges_count,
-            "holes_count": holes_count,
+            "faces_count": counts["faces_count"],
+            "edges_count": counts["edges_count"],
+            "holes_count": counts["holes_count"],
             "holes_small_count": holes_small_count,
-            "large_bore_count": large_bore_count,
+            "large_bore_count": counts["large_bore_count"],
             "undercut_count": undercut_count,
             "thread_feature_count": thread_feature_count,
-            "flat_face_count": flat_face_count,
+            "flat_face_count": counts["flat_face_count"],
             "rotational_symmetry": rotational,
             "analysis_mode": "pythonocc",
         }
 
-        mesh = BRepMesh_IncrementalMesh(shape, 0.2)
-        mesh.Perform()
-        with tempfile.NamedTemporaryFile(suffix=".stl", delete=False) as temp_file:
-            temp_stl = Path(temp_file.name)
-        stl_writer = StlAPI_Writer()
-        stl_writer.Write(shape, str(temp_stl))
-        tri = trimesh.load_mesh(str(temp_stl), file_type="stl")
-        temp_stl.unlink(missing_ok=True)
-        return geometry, tri
+        progress("meshing")
+        diagonal = math.sqrt(x * x + y * y + z * z)
+        meshes: dict[str, trimesh.Trimesh] = {}
+        for lod in MODEL_LODS:
+            linear, angular = lod_deflection(lod, diagonal)
+            BRepMesh_IncrementalMesh(shape, linear, False, angular, True).Perform()
+            vertices, triangles = triangulate_faces(topology)
+            if triangles.size == 0:
+                raise RuntimeError("Meshing produced no triangles")
+            meshes[lod] = trimesh.Trimesh(vertices=vertices, faces=triangles, process=False)
+        geometry["triangle_count"] = int(len(meshes["full"].faces))
+        return geometry, meshes
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import struct
+
+import numpy as np
+
+GLB_MAGIC = 0x46546C67
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+COMPONENT_SHORT = 5122
+COMPONENT_UNSIGNED_SHORT = 5123
+COMPONENT_UNSIGNED_INT = 5125
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+
+INT16_MAX = 32767
+
+
+def _pad(data: bytes, fill: bytes = b"\x00") -> bytes:
+    return data + fill * (-len(data) % 4)
+
+
+def quantize_positions(
+    vertices: np.ndarray, faces: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, list[float], float]:
+    """Map positions to normalized int16 around the bbox center and weld coincident vertices.
+
+    Returns the quantized positions, remapped faces, and the node translation/scale that
+    dequantize them: loaders map normalized int16 to ``q / 32767`` themselves, so
+    ``position = translation + scale * (q / 32767)``.
+    """
+    lower = vertices.min(axis=0)
+    upper = vertices.max(axis=0)
+    center = (lower + upper) / 2.0
+    scale = float(max((upper - lower).max() / 2.0, 1e-6))
+    quantized = np.rint((vertices - center) / scale * INT16_MAX).astype(np.int16)
+
+    # Per-face boundary nodes and nodes closer than one quantization step collapse here.
+    unique, inverse = np.unique(quantized, axis=0, return_inverse=True)
+    remapped = inverse.reshape(-1)[faces]
+    degenerate = (
+        (remapped[:, 0] == remapped[:, 1])
+        | (remapped[:, 1] == remapped[:, 2])
+        | (remapped[:, 0] == remapped[:, 2])
+    )
+    return unique, remapped[~degenerate], center.tolist(), scale
+
+
+def write_quantized_glb(vertices: np.ndarray, faces: np.ndarray) -> bytes:
+    """Serialize a triangle mesh as GLB with KHR_mesh_quantization int16 positions.
+
+    No normals are written; viewers fall back to flat shading, which suits machined parts.
+    """
+    if len(faces) == 0:
+        raise ValueError("Cannot write an empty mesh")
+    positions, indices, translation, scale = quantize_positions(
+        np.asarray(vertices, dtype=np.float64),
+        np.asarray(faces, dtype=np.int64),
+    )
+
+    # Vertex attribute elements must be 4-byte aligned, so int16 xyz is padded to 8 bytes.
+    padded = np.zeros((positions.shape[0], 4), dtype="<i2")
+    padded[:, :3] = positions
+    position_bytes = padded.tobytes()
+
+    if positions.shape[0] <= 0xFFFF:
+        index_bytes = indices.astype("<u2").tobytes()
+        index_component = COMPONENT_UNSIGNED_SHORT
+    else:
+        index_bytes = indices.astype("<u4").tobytes()
+        index_component = COMPONENT_UNSIGNED_INT
+
+    binary = _pad(position_bytes) + _pad(index_bytes)
+    gltf = {
+        "asset": {"version": "2.0", "generator": "cnc-cost-estimator"},
+        "extensionsUsed": ["KHR_mesh_quantization"],
+        "extensionsRequired": ["KHR_mesh_quantization"],
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [
+            {
+                "mesh": 0,
+                "translation": translation,
+                # The accessor is normalized, so the loader has already divided by 32767.
+                "scale": [scale] * 3,
+            }
+        ],
+        "meshes": [
+            {
+                "primitives": [
+                    {
+                        "attributes": {"POSITION": 0},
+                        "indices": 1,
+                        "material": 0,
+                        "mode": 4,
+                    }
+                ]
+            }
+        ],
+        "materials": [
+            {
+                "pbrMetallicRoughness": {
+                    "baseColorFactor": [0.372, 0.565, 1.0, 1.0],
+                    "metallicFactor": 0.3,
+                    "roughnessFactor": 0.45,
+                },
+                "doubleSided": True,
+            }
+        ],
+        "buffers": [{"byteLength": len(binary)}],
+        "bufferViews": [
+            {
+                "buffer": 0,
+                "byteOffset": 0,
+                "byteLength": len(position_bytes),
+                "byteStride": 8,
+                "target": TARGET_ARRAY_BUFFER,
+            },
+            {
+                "buffer": 0,
+                "byteOffset": len(_pad(position_bytes)),
+                "byteLength": len(index_bytes),
+                "target": TARGET_ELEMENT_ARRAY_BUFFER,
+            },
+        ],
+        "accessors": [
+            {
+                "bufferView": 0,
+                "componentType": COMPONENT_SHORT,
+                "normalized": True,
+                "count": int(positions.shape[0]),
+                "type": "VEC3",
+                # Bounds are the stored int16 values; ``normalized`` does not apply to min/max.
+                "min": positions.min(axis=0).tolist(),
+                "max": positions.max(axis=0).tolist(),
+            },
+            {
+                "bufferView": 1,
+                "componentType": index_component,
+                "count": int(indices.size),
+                "type": "SCALAR",
+            },
+        ],
+    }
+
+    json_chunk = _pad(json.dumps(gltf, separators=(",", ":")).encode("utf-8"), b" ")
+    total = 12 + 8 + len(json_chunk) + 8 + len(binary)
+    return b"".join(
+        [
+            struct.pack("<III", GLB_MAGIC, GLB_VERSION, total),
+            struct.pack("<II", len(json_chunk), CHUNK_JSON),
+            json_chunk,
+            struct.pack("<II", len(binary), CHUNK_BIN),
+            binary,
+        ]
+    )
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncIterator
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+JOB_CHANNEL_PREFIX = "jobs:"
+JOB_SNAPSHOT_TTL_S = 3600
+TERMINAL_STATUSES = {"completed", "failed"}
+JOB_STAGES = ("downloading", "parsing", "meshing", "exporting", "costing")
+JOB_SUBSCRIBE_TIMEOUT_S = 5.0
+
+
+def job_channel(job_id: str) -> str:
+    return f"{JOB_CHANNEL_PREFIX}{job_id}"
+
+
+def job_snapshot_key(job_id: str) -> str:
+    return f"{JOB_CHANNEL_PREFIX}{job_id}:snapshot"
+
+
+@lru_cache(maxsize=1)
+def _sync_redis() -> redis.Redis:
+    return redis.Redis.from_url(get_settings().redis_url)
+
+
+class JobEventPublisher:
+    """Publishes job state/stage changes to Redis; the latest event is also kept as a snapshot.
+
+    Publishing is best effort: a Redis outage must never fail an analysis.
+    """
+
+    def __init__(self, client: redis.Redis | None = None):
+        self.client = client or _sync_redis()
+
+    def publish(
+        self,
+        job_id: str,
+        part_id: str,
+        status: str,
+        stage: str | None = None,
+        error_message: str | None = None,
+    ) -> None:
+        event = {
+            "job_id": job_id,
+            "part_id": part_id,
+            "status": status,
+            "stage": stage,
+            "error_message": error_message,
+            "ts": datetime.now(timezone.utc).isoformat(),
+        }
+        payload = json.dumps(event)
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(job_snapshot_key(job_id), payload, ex=JOB_SNAPSHOT_TTL_S)
+            pipe.publish(job_channel(job_id), payload)
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Could not publish event for job %s: %s", job_id, exc)
+
+
+class JobEventHub:
+    """Process-wide fan-out of job events: one pattern subscription, many local listeners."""
+
+    def __init__(self, redis_url: str, queue_size: int = 32):
+        self.redis_url = redis_url
+        self.queue_size = queue_size
+        self._client: aioredis.Redis | None = None
+        self._listeners: dict[str, set[asyncio.Queue[dict]]] = {}
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        # Set while the pattern subscription is confirmed by Redis, cleared while reconnecting.
+        self._subscribed = asyncio.Event()
+
+    async def snapshot(self, job_id: str) -> dict | None:
+        raw = await self._redis().get(job_snapshot_key(job_id))
+        return json.loads(raw) if raw else None
+
+    @asynccontextmanager
+    async def subscribe(
+        self, job_id: str, timeout_s: float = JOB_SUBSCRIBE_TIMEOUT_S
+    ) -> AsyncIterator[asyncio.Queue[dict]]:
+        """Yields once Redis has confirmed the subscription, so a snapshot read inside cannot miss an event.
+
+        If it is not confirmed within ``timeout_s`` the queue is yielded anyway; the hub replays
+        the latest snapshot of every watched job when the subscription comes up.
+        """
+        queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=self.queue_size)
+        self._listeners.setdefault(job_id, set()).add(queue)
+        try:
+            await self._ensure_listener()
+            try:
+                await asyncio.wait_for(self._subscribed.wait(), timeout=timeout_s)
+            except asyncio.TimeoutError:
+                logger.warning("Job event subscription not confirmed within %.0f s", timeout_s)
+            yield queue
+        finally:
+            listeners = self._listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(queue)
+                if not listeners:
+                    del self._listeners[job_id]
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _redis(self) -> aioredis.Redis:
+        if self._client is None:
+            self._client = aioredis.Redis.from_url(self.redis_url)
+        return self._client
+
+    async def _ensure_listener(self) -> None:
+        async with self._lock:
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._listen(), name="job-event-hub")
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis().pubsub()
+            try:
+                await pubsub.psubscribe(f"{JOB_CHANNEL_PREFIX}*")
+                async for message in pubsub.listen():
+                    if message.get("type") == "psubscribe":
+                        # Events published while (re)connecting were missed: replay the latest state.
+                        await self._replay_snapshots()
+                        self._subscribed.set()
+                        continue
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel = message["channel"].decode() if isinstance(message["channel"], bytes) else message["channel"]
+                    self._dispatch(channel[len(JOB_CHANNEL_PREFIX) :], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - reconnect and keep serving open streams
+                logger.warning("Job event subscription dropped, reconnecting: %s", exc)
+                await asyncio.sleep(1.0)
+            finally:
+                self._subscribed.clear()
+                await pubsub.aclose()
+
+    async def _replay_snapshots(self) -> None:
+        job_ids = list(self._listeners)
+        if not job_ids:
+            return
+        snapshots = await self._redis().mget([job_snapshot_key(job_id) for job_id in job_ids])
+        for job_id, raw in zip(job_ids, snapshots):
+            if raw:
+                self._dispatch(job_id, raw)
+
+    def _dispatch(self, job_id: str, data: bytes | str) -> None:
+        listeners = self._listeners.get(job_id)
+        if not listeners:
+            return
+        event = json.loads(data)
+        for queue in listeners:
+            if queue.full():
+                # Slow consumer: only the latest state matters, so drop the oldest event.
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+
+_hub: JobEventHub | None = None
+
+
+def get_job_event_hub() -> JobEventHub:
+    global _hub
+    if _hub is None:
+        _hub = JobEventHub(get_settings().redis_url)
+    return _hub
+
+
+async def close_job_event_hub() -> None:
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+        _hub = None
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.analysis_job import AnalysisJob
+from app.models.part import Part
+
+logger = logging.getLogger(__name__)
+
+
+def lease_owner_id(task_id: str | None = None) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{task_id or '-'}"
+
+
+def queued_redelivery_deadline(now: datetime | None = None) -> datetime:
+    """``lease_expires_at`` of a job being sent: the reaper re-sends it if no worker claims it by then."""
+    now = now or datetime.now(timezone.utc)
+    return now + timedelta(seconds=get_settings().job_queued_redeliver_s)
+
+
+@dataclass
+class ReapedJob:
+    job_id: str
+    part_id: str
+    machine_profile: str
+    status: str  # "queued" (to be re-sent) or "failed" (out of attempts)
+    queue: str | None = None
+
+
+class JobLeaseService:
+    """Claims analysis jobs with a DB lease that the running worker keeps alive by heartbeat.
+
+    Every transition is a conditional UPDATE, so duplicate task deliveries and concurrent
+    reapers cannot both win the same job.
+    """
+
+    def __init__(self, db: Session):
+        settings = get_settings()
+        self.db = db
+        self.lease_ttl = timedelta(seconds=settings.job_lease_ttl_s)
+        self.max_attempts = settings.job_max_attempts
+
+    def claim(self, job_id: str, owner: str) -> bool:
+        now = datetime.now(timezone.utc)
+        result = self.db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, AnalysisJob.status == "queued")
+            .values(
+                status="running",
+                lease_owner=owner,
+                lease_expires_at=now + self.lease_ttl,
+                heartbeat_at=now,
+                attempts=func.coalesce(AnalysisJob.attempts, 0) + 1,
+                started_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def renew(self, job_id: str, owner: str) -> bool:
+        now = datetime.now(timezone.utc)
+        result = self.db.execute(
+            update(AnalysisJob)
+            .where(
+                AnalysisJob.id == job_id,
+                AnalysisJob.lease_owner == owner,
+                AnalysisJob.status == "running",
+            )
+            .values(lease_expires_at=now + self.lease_ttl, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def reap(self) -> list[ReapedJob]:
+        """Re-queue running jobs whose lease expired, and re-send queued jobs nobody claimed in time.
+
+        Every job is sent with a redelivery deadline in ``lease_expires_at``
+        (``queued_redelivery_deadline``), so a lost or never-published message is sent again
+        once the deadline passes; duplicate deliveries are skipped by ``claim``.
+        """
+        now = datetime.now(timezone.utc)
+        candidates = self.db.execute(
+            select(
+                AnalysisJob.id,
+                AnalysisJob.part_id,
+                AnalysisJob.machine_profile,
+                AnalysisJob.attempts,
+                AnalysisJob.status,
+                AnalysisJob.queue,
+            ).where(
+                AnalysisJob.status.in_(("running", "queued")),
+                AnalysisJob.lease_expires_at.is_not(None),
+                AnalysisJob.lease_expires_at < now,
+            )
+        ).all()
+
+        reaped: list[ReapedJob] = []
+        for job_id, part_id, machine_profile, attempts, status, queue in candidates:
+            stale = and_(AnalysisJob.status == status, AnalysisJob.lease_expires_at < now)
+
+            if status == "running" and (attempts or 0) >= self.max_attempts:
+                result = self.db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job_id, stale)
+                    .values(
+                        status="failed",
+                        error_message=f"Analysis worker lost {attempts} times; giving up",
+                        lease_expires_at=None,
+                        completed_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    self.db.execute(
+                        update(Part)
+                        .where(Part.id == part_id)
+                        .values(status="failed")
+                        .execution_options(synchronize_session=False)
+                    )
+                    logger.warning("Job %s failed after %s expired leases", job_id, attempts)
+                    reaped.append(ReapedJob(job_id, part_id, machine_profile or "auto", status="failed"))
+                continue
+
+            result = self.db.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == job_id, stale)
+                .values(status="queued", lease_owner=None, lease_expires_at=queued_redelivery_deadline(now))
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                if status == "running":
+                    self.db.execute(
+                        update(Part)
+                        .where(Part.id == part_id, Part.status == "processing")
+                        .values(status="queued")
+                        .execution_options(synchronize_session=False)
+                    )
+                reaped.append(ReapedJob(job_id, part_id, machine_profile or "auto", status="queued", queue=queue))
+        self.db.commit()
+        return reaped
+
+
+class LeaseHeartbeat:
+    """Background thread renewing a job lease until the context exits."""
+
+    def __init__(self, job_id: str, owner: str, interval_s: float | None = None):
+        self.job_id = job_id
+        self.owner = owner
+        self.interval_s = interval_s if interval_s is not None else get_settings().job_heartbeat_interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self) -> LeaseHeartbeat:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.interval_s)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                with SessionLocal() as db:
+                    if not JobLeaseService(db).renew(self.job_id, self.owner):
+                        logger.warning("Lease on job %s was lost by %s", self.job_id, self.owner)
+                        return
+            except Exception:  # noqa: BLE001 - a missed beat is retried on the next tick
+                logger.exception("Heartbeat for job %s failed", self.job_id)
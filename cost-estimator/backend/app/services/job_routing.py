@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import re
+
+from app.core.config import get_settings
+
+QUEUE_GEOMETRY_HEAVY = "geometry_heavy"
+QUEUE_GEOMETRY_LIGHT = "geometry_light"
+QUEUE_COSTING = "costing"
+ANALYSIS_QUEUES = (QUEUE_GEOMETRY_HEAVY, QUEUE_GEOMETRY_LIGHT, QUEUE_COSTING)
+
+_ENTITY_PATTERN = re.compile(rb"#\d+\s*=")
+
+
+def estimate_step_entities(head: bytes, size_bytes: int) -> int:
+    """Extrapolate the entity count of a STEP file from the instance density of its first bytes.
+
+    The header carries no entity count, but ``#<id>=`` instances are spread evenly enough
+    through the DATA section for a 64 KiB sample to put a file in the right order of magnitude.
+    """
+    start = head.find(b"DATA;")
+    sample = head[start + 5 :] if start >= 0 else head
+    if not sample:
+        return 0
+    density = len(_ENTITY_PATTERN.findall(sample)) / len(sample)
+    return int(density * max(size_bytes - (len(head) - len(sample)), 0))
+
+
+def choose_analysis_queue(size_bytes: int, head: bytes, geometry_cached: bool = False) -> str:
+    """Cheap pre-flight routing so small parts never wait behind huge assemblies."""
+    if geometry_cached:
+        # Same bytes already analyzed: the job only re-costs stored geometry.
+        return QUEUE_COSTING
+    settings = get_settings()
+    if size_bytes >= settings.routing_heavy_size_bytes:
+        return QUEUE_GEOMETRY_HEAVY
+    if estimate_step_entities(head, size_bytes) >= settings.routing_heavy_entity_count:
+        return QUEUE_GEOMETRY_HEAVY
+    return QUEUE_GEOMETRY_LIGHT
+
+
+def analysis_task_options(queue: str | None) -> dict:
+    settings = get_settings()
+    limits = {
+        QUEUE_GEOMETRY_HEAVY: (settings.geometry_heavy_soft_time_limit_s, settings.geometry_heavy_time_limit_s),
+        QUEUE_GEOMETRY_LIGHT: (settings.geometry_light_soft_time_limit_s, settings.geometry_light_time_limit_s),
+        QUEUE_COSTING: (settings.costing_soft_time_limit_s, settings.costing_time_limit_s),
+    }
+    # Jobs queued before routing existed carry no queue; treat them as ordinary geometry work.
+    queue = queue if queue in limits else QUEUE_GEOMETRY_LIGHT
+    soft_time_limit, time_limit = limits[queue]
+    return {"queue": queue, "soft_time_limit": soft_time_limit, "time_limit": time_limit}
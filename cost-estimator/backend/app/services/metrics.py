@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import redis
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core.config import get_settings
+from app.services.job_routing import ANALYSIS_QUEUES
+
+if TYPE_CHECKING:
+    from app.models.analysis_job import AnalysisJob
+
+logger = logging.getLogger(__name__)
+
+# Progress labels published to clients (see job_events) -> stage names used for timing.
+PROGRESS_STAGES = {
+    "downloading": "download",
+    "parsing": "parse",
+    "meshing": "tessellate",
+    "exporting": "export",
+}
+
+_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+STAGE_DURATION = Histogram(
+    "cnc_analysis_stage_duration_seconds",
+    "Wall-clock time of one analysis stage.",
+    ["stage", "queue"],
+    buckets=_SECONDS_BUCKETS,
+)
+JOB_DURATION = Histogram(
+    "cnc_analysis_job_duration_seconds",
+    "Wall-clock time of a whole analysis run.",
+    ["queue", "outcome"],
+    buckets=_SECONDS_BUCKETS,
+)
+INPUT_BYTES = Histogram(
+    "cnc_analysis_input_bytes",
+    "Size of the analyzed STEP file.",
+    ["queue"],
+    buckets=(1e4, 1e5, 1e6, 5e6, 1e7, 2e7, 5e7, 1e8, 2.5e8, 5e8),
+)
+FACES = Histogram(
+    "cnc_analysis_faces",
+    "B-rep face count of the analyzed part.",
+    ["queue"],
+    buckets=(10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000),
+)
+TRIANGLES = Histogram(
+    "cnc_analysis_triangles",
+    "Triangle count of the full-detail preview mesh.",
+    ["queue"],
+    buckets=(1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7),
+)
+JOBS = Counter(
+    "cnc_analysis_jobs",
+    "Analysis job outcomes (completed, failed, skipped, requeued, lost).",
+    ["queue", "outcome"],
+)
+
+
+class StageTimer:
+    """Splits one analysis run into consecutive named stages; marking a stage closes the previous one."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+        self._stage: str | None = None
+        self._stage_started = 0.0
+        self._started = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._close(now)
+        self._stage = stage
+        self._stage_started = now
+
+    def progress(self, label: str) -> None:
+        self.mark(PROGRESS_STAGES.get(label, label))
+
+    def stop(self) -> None:
+        self._close(time.perf_counter())
+        self._stage = None
+
+    @property
+    def total_s(self) -> float:
+        return time.perf_counter() - self._started
+
+    def as_ms(self) -> dict[str, float]:
+        return {stage: round(seconds * 1000.0, 3) for stage, seconds in self.durations.items()}
+
+    def _close(self, now: float) -> None:
+        if self._stage is not None:
+            # A stage can be re-entered (e.g. a retried download); its time accumulates.
+            self.durations[self._stage] = self.durations.get(self._stage, 0.0) + now - self._stage_started
+
+
+def queue_label(queue: str | None) -> str:
+    return queue or "unrouted"
+
+
+def count_job(outcome: str, queue: str | None = None) -> None:
+    JOBS.labels(queue=queue_label(queue), outcome=outcome).inc()
+
+
+def observe_analysis(job: AnalysisJob, timer: StageTimer, outcome: str) -> None:
+    queue = queue_label(job.queue)
+    for stage, seconds in timer.durations.items():
+        STAGE_DURATION.labels(stage=stage, queue=queue).observe(seconds)
+    JOB_DURATION.labels(queue=queue, outcome=outcome).observe(timer.total_s)
+    if job.input_bytes is not None:
+        INPUT_BYTES.labels(queue=queue).observe(job.input_bytes)
+    if job.faces_count is not None:
+        FACES.labels(queue=queue).observe(job.faces_count)
+    if job.triangle_count is not None:
+        TRIANGLES.labels(queue=queue).observe(job.triangle_count)
+    count_job(outcome, job.queue)
+
+
+class QueueDepthCollector:
+    """Broker queue lengths, read from Redis at scrape time (kombu keeps each queue as a list)."""
+
+    def __init__(self, redis_url: str):
+        self.client = redis.Redis.from_url(redis_url, socket_timeout=1.0, socket_connect_timeout=1.0)
+
+    def collect(self):
+        depth = GaugeMetricFamily("cnc_queue_depth", "Messages waiting in each Celery queue.", labels=["queue"])
+        try:
+            with self.client.pipeline(transaction=False) as pipe:
+                for queue in ANALYSIS_QUEUES:
+                    pipe.llen(queue)
+                lengths = pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Could not read queue depth: %s", exc)
+            return
+        for queue, length in zip(ANALYSIS_QUEUES, lengths):
+            depth.add_metric([queue], length)
+        yield depth
+
+
+def multiprocess_dir() -> Path | None:
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    return Path(path) if path else None
+
+
+def build_registry(include_queue_depth: bool = False) -> CollectorRegistry:
+    """Registry to expose: merged across processes when ``PROMETHEUS_MULTIPROC_DIR`` is set."""
+    if multiprocess_dir() is not None:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    if include_queue_depth:
+        registry.register(QueueDepthCollector(get_settings().redis_url))
+    return registry
+
+
+@lru_cache(maxsize=1)
+def get_api_registry() -> CollectorRegistry:
+    return build_registry(include_queue_depth=True)
+
+
+def reset_multiprocess_dir() -> None:
+    """Drop metric files left by a previous run; call once in the parent before workers fork."""
+    directory = multiprocess_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob("*.db"):
+        path.unlink(missing_ok=True)
+
+
+def mark_process_dead(pid: int) -> None:
+    if multiprocess_dir() is not None:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from app.core.config import get_settings
+from app.services.stock_catalog import StockCatalog, StockSku, stock_volume_mm3
+
+
+class InvalidBlankError(ValueError):
+    """The part's stock blank cannot be packed (a zero-size dimension)."""
+
+
+@dataclass(frozen=True)
+class NestingLot:
+    sku: str
+    form: str
+    length_mm: float
+    width_mm: float | None
+    unit_price: float
+    parts_per_piece: int
+    count: int
+
+
+@dataclass
+class NestingPlan:
+    """Stock bought to make ``quantity`` copies of one part, and what that costs per part."""
+
+    quantity: int
+    form: str
+    section: dict
+    blank_mm: list[float]
+    kerf_mm: float
+    parting_allowance_mm: float
+    lots: list[NestingLot] = field(default_factory=list)
+    pieces_used: int = 0
+    stock_volume_cm3: float = 0.0
+    total_material_cost: float = 0.0
+    material_cost_per_part: float = 0.0
+    single_part_material_cost: float | None = None
+    utilization: float = 0.0
+
+
+def bar_capacity(length_mm: float, piece_mm: float, kerf_mm: float, end_trim_mm: float) -> int:
+    """Pieces cut from one bar; every cut but the last leaves a kerf, ``end_trim_mm`` is scrap."""
+    if piece_mm + kerf_mm <= 0:
+        return 0
+    return max(int((length_mm - end_trim_mm + kerf_mm) // (piece_mm + kerf_mm)), 0)
+
+
+def plate_capacity(
+    sheet: StockSku, piece_a_mm: float, piece_b_mm: float, kerf_mm: float, edge_trim_mm: float
+) -> int:
+    """Guillotine grid of ``piece_a`` x ``piece_b`` blanks, best of both orientations."""
+    usable_w = sheet.width_mm - 2.0 * edge_trim_mm
+    usable_l = sheet.length_mm - 2.0 * edge_trim_mm
+
+    def fit(usable: float, piece: float) -> int:
+        if piece + kerf_mm <= 0:
+            return 0
+        return max(int((usable + kerf_mm) // (piece + kerf_mm)), 0)
+
+    return max(
+        fit(usable_w, piece_a_mm) * fit(usable_l, piece_b_mm),
+        fit(usable_w, piece_b_mm) * fit(usable_l, piece_a_mm),
+    )
+
+
+def cheapest_cover(
+    options: Sequence[tuple[StockSku, int]], quantity: int
+) -> list[tuple[StockSku, int, int]] | None:
+    """``(sku, parts_per_piece, count)`` lots holding at least ``quantity`` parts.
+
+    Full pieces of the SKU with the lowest price per part, then the cheapest single SKU
+    whose capacity covers the remainder (found by bisect over a suffix-minimum price).
+    """
+    options = sorted((option for option in options if option[1] > 0), key=lambda option: option[1])
+    if not options:
+        return None
+    main, main_capacity = min(options, key=lambda option: (option[0].unit_price / option[1], -option[1]))
+    full, rest = divmod(quantity, main_capacity)
+    lots = [(main, main_capacity, full)] if full else []
+    if rest:
+        capacities = [capacity for _, capacity in options]
+        cheapest_from = list(options)
+        for index in range(len(options) - 2, -1, -1):
+            if cheapest_from[index + 1][0].unit_price <= cheapest_from[index][0].unit_price:
+                cheapest_from[index] = cheapest_from[index + 1]
+        extra, extra_capacity = cheapest_from[bisect_left(capacities, rest)]
+        if lots and extra.sku == main.sku:
+            lots[0] = (main, main_capacity, full + 1)
+        else:
+            lots.append((extra, extra_capacity, 1))
+    return lots
+
+
+class NestingService:
+    """Packs N copies of a part's stock blank onto catalog bars or plates."""
+
+    def __init__(
+        self,
+        kerf_mm: float | None = None,
+        parting_allowance_mm: float | None = None,
+        bar_end_trim_mm: float | None = None,
+        plate_edge_trim_mm: float | None = None,
+    ):
+        settings = get_settings()
+        self.kerf_mm = settings.stock_kerf_mm if kerf_mm is None else kerf_mm
+        self.parting_allowance_mm = (
+            settings.stock_parting_allowance_mm if parting_allowance_mm is None else parting_allowance_mm
+        )
+        self.bar_end_trim_mm = settings.stock_bar_end_trim_mm if bar_end_trim_mm is None else bar_end_trim_mm
+        self.plate_edge_trim_mm = (
+            settings.stock_plate_edge_trim_mm if plate_edge_trim_mm is None else plate_edge_trim_mm
+        )
+
+    def plan(self, stock: dict, material_id: int, quantity: int, catalog: StockCatalog) -> NestingPlan:
+        """Cheapest plan for ``quantity`` blanks of ``stock`` (a ``StockService.determine_stock`` result)."""
+        if quantity < 1:
+            raise ValueError("Quantity must be at least 1")
+        dimensions = stock.get("dimensions") or {}
+        if stock.get("stock_type") == "round_bar":
+            diameter = float(dimensions.get("nominal_diameter_mm", dimensions.get("diameter_mm", 0.0)))
+            length = float(dimensions.get("length_mm", 0.0))
+            if diameter <= 0 or length <= 0:
+                raise InvalidBlankError("Part stock blank has a zero-size dimension")
+            blank_volume_mm3 = stock_volume_mm3("round_bar", length, diameter_mm=diameter)
+            plans = [self._round_bar_plan(catalog.round_bars(material_id, diameter), diameter, length, quantity)]
+        else:
+            blank = sorted(
+                float(dimensions.get(f"nominal_{axis}_mm", dimensions.get(f"{axis}_mm", 0.0))) for axis in "xyz"
+            )
+            if blank[0] <= 0:
+                raise InvalidBlankError("Part stock blank has a zero-size dimension")
+            blank_volume_mm3 = blank[0] * blank[1] * blank[2]
+            plans = [
+                self._flat_bar_plan(catalog.flat_bars(material_id, blank[0], blank[1]), blank, quantity),
+                self._plate_plan(catalog.plates(material_id, blank[0]), blank, quantity),
+            ]
+
+        plans = [plan for plan in plans if plan is not None]
+        if not plans:
+            raise ValueError("No catalog stock fits this part")
+        best = min(plans, key=lambda plan: plan.total_material_cost)
+        # Share of the bought material that ends up in the packed (nominal) blanks; kerf, parting
+        # allowance, trim and offcuts are the rest. The snapped standard block is not what is cut.
+        if best.stock_volume_cm3:
+            best.utilization = round(blank_volume_mm3 / 1000.0 * quantity / best.stock_volume_cm3, 4)
+        best.single_part_material_cost = stock.get("raw_material_cost")
+        return best
+
+    def _round_bar_plan(
+        self, bars: Sequence[StockSku], diameter: float, length: float, quantity: int
+    ) -> NestingPlan | None:
+        piece = length + self.parting_allowance_mm
+        options = [(bar, bar_capacity(bar.length_mm, piece, self.kerf_mm, self.bar_end_trim_mm)) for bar in bars]
+        section = {"diameter_mm": bars[0].diameter_mm} if bars else {}
+        return self._build("round_bar", section, [round(diameter, 3), round(length, 3)], options, quantity)
+
+    def _flat_bar_plan(self, bars: Sequence[StockSku], blank: list[float], quantity: int) -> NestingPlan | None:
+        piece = blank[2] + self.parting_allowance_mm
+        options = [(bar, bar_capacity(bar.length_mm, piece, self.kerf_mm, self.bar_end_trim_mm)) for bar in bars]
+        section = {"thickness_mm": bars[0].thickness_mm, "width_mm": bars[0].width_mm} if bars else {}
+        return self._build("flat_bar", section, [round(value, 3) for value in blank], options, quantity)
+
+    def _plate_plan(self, sheets: Sequence[StockSku], blank: list[float], quantity: int) -> NestingPlan | None:
+        options = [
+            (sheet, plate_capacity(sheet, blank[1], blank[2], self.kerf_mm, self.plate_edge_trim_mm))
+            for sheet in sheets
+        ]
+        section = {"thickness_mm": sheets[0].thickness_mm} if sheets else {}
+        return self._build("plate", section, [round(value, 3) for value in blank], options, quantity)
+
+    def _build(
+        self,
+        form: str,
+        section: dict,
+        blank: list[float],
+        options: Sequence[tuple[StockSku, int]],
+        quantity: int,
+    ) -> NestingPlan | None:
+        cover = cheapest_cover(options, quantity)
+        if cover is None:
+            return None
+        lots = [
+            NestingLot(
+                sku=sku.sku,
+                form=sku.form,
+                length_mm=sku.length_mm,
+                width_mm=sku.width_mm if sku.form == "plate" else None,
+                unit_price=sku.unit_price,
+                parts_per_piece=capacity,
+                count=count,
+            )
+            for sku, capacity, count in cover
+        ]
+        total = sum(lot.unit_price * lot.count for lot in lots)
+        volume_mm3 = sum(sku.volume_mm3 * count for sku, _, count in cover)
+        return NestingPlan(
+            quantity=quantity,
+            form=form,
+            section=section,
+            blank_mm=blank,
+            kerf_mm=self.kerf_mm,
+            parting_allowance_mm=self.parting_allowance_mm if form != "plate" else 0.0,
+            lots=lots,
+            pieces_used=sum(lot.count for lot in lots),
+            stock_volume_cm3=round(volume_mm3 / 1000.0, 4),
+            total_material_cost=round(total, 4),
+            material_cost_per_part=round(total / quantity, 4),
+        )
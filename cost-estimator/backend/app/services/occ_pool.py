@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+import billiard
+from billiard.connection import Connection
+
+from app.core.config import get_settings
+
+if TYPE_CHECKING:
+    from app.services.profiling import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+RSS_POLL_INTERVAL_S = 0.25
+
+ProgressCallback = Callable[[str], None]
+
+
+class GeometryAnalysisError(RuntimeError):
+    """The isolated OCC analysis was killed (crash, timeout, memory cap); the file should fail cleanly."""
+
+
+class OccUnavailableError(RuntimeError):
+    """pythonOCC cannot be imported in the worker subprocesses."""
+
+
+def _worker_main(conn: Connection) -> None:
+    # Runs in a spawned subprocess: pay the OCC import cost once, then serve analyses until told to stop.
+    try:
+        from app.services.geometry_service import GeometryService, import_occ_modules
+
+        import_occ_modules()
+    except ImportError as exc:
+        conn.send(("unavailable", str(exc)))
+        conn.close()
+        return
+    conn.send(("ready", None))
+
+    service = GeometryService()
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        path, profile_interval_s = request
+        profiler = None
+        if profile_interval_s:
+            from app.services.profiling import SamplingProfiler
+
+            profiler = SamplingProfiler(profile_interval_s)
+            profiler.start()
+        try:
+            result = service.analyze_with_occ_lods(Path(path), progress=lambda stage: conn.send(("progress", stage)))
+            reply = ("ok", result)
+        except Exception as exc:  # noqa: BLE001 - reported to the parent, which decides on fallback
+            reply = ("error", f"{type(exc).__name__}: {exc}")
+        if profiler is not None:
+            profiler.stop()
+            conn.send(("profile", profiler.folded()))
+        conn.send(reply)
+
+
+def _read_rss_bytes(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def _exit_reason(exitcode: int | None) -> str:
+    if exitcode is not None and exitcode < 0:
+        try:
+            return f"signal {signal.Signals(-exitcode).name}"
+        except ValueError:
+            return f"signal {-exitcode}"
+    return f"exit code {exitcode}"
+
+
+class _OccWorker:
+    def __init__(self, context: Any):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), name="occ-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.tasks_done = 0
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            try:
+                os.kill(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+
+class OccWorkerPool:
+    """Pre-warmed subprocesses running OCC analysis with a wall-clock timeout and an RSS cap.
+
+    A worker that crashes, hangs or grows past the cap is killed and replaced, and the call
+    raises ``GeometryAnalysisError``; workers are also recycled after ``max_tasks`` analyses.
+
+    Workers are started through billiard, Celery's fork of multiprocessing: prefork pool
+    processes are daemonic, and the stdlib refuses to start children from a daemonic process.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        timeout_s: float,
+        rss_limit_bytes: int,
+        max_tasks: int,
+        start_timeout_s: float,
+    ):
+        self.size = max(1, size)
+        self.timeout_s = timeout_s
+        self.rss_limit_bytes = rss_limit_bytes
+        self.max_tasks = max(1, max_tasks)
+        self.start_timeout_s = start_timeout_s
+        self.unavailable_reason: str | None = None
+        self._context = billiard.get_context("spawn")
+        self._idle: queue.LifoQueue[_OccWorker | None] = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(None)
+        self._closed = False
+
+    def warm(self) -> None:
+        """Spawn the workers without waiting for them to import OCC.
+
+        Readiness is checked on each worker's first analysis; blocking here would hold the
+        Celery child past its startup handshake (``worker_proc_alive_timeout``).
+        """
+        slots = [self._idle.get() for _ in range(self.size)]
+        for worker in slots:
+            self._idle.put(worker if worker is not None and worker.is_alive() else self._try_spawn())
+
+    def analyze(
+        self,
+        step_file_path: Path,
+        progress: ProgressCallback | None = None,
+        profiler: SamplingProfiler | None = None,
+        timeout_s: float | None = None,
+    ) -> tuple[dict[str, Any], dict[str, bytes]]:
+        """With ``profiler``, the worker samples itself too and its stacks are merged into it.
+
+        ``timeout_s`` overrides the pool-wide timeout, e.g. with what is left of the task's soft limit.
+        """
+        if self.unavailable_reason is not None:
+            raise OccUnavailableError(self.unavailable_reason)
+        if self._closed:
+            raise RuntimeError("OCC worker pool is closed")
+
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.is_alive():
+                worker = self._spawn()
+            self._wait_ready(worker)
+            worker.conn.send((str(step_file_path), profiler.interval_s if profiler is not None else None))
+            timeout_s = self.timeout_s if timeout_s is None else timeout_s
+            deadline = time.monotonic() + timeout_s
+            timeout_message = f"OCC analysis timed out after {timeout_s:.0f} s"
+            kind, payload = self._await(worker, deadline, timeout_message)
+            while kind in ("progress", "profile"):
+                if kind == "progress" and progress is not None:
+                    progress(payload)
+                elif kind == "profile" and profiler is not None:
+                    profiler.merge(payload, root="[occ-worker]")
+                kind, payload = self._await(worker, deadline, timeout_message)
+            worker.tasks_done += 1
+            if worker.tasks_done >= self.max_tasks:
+                worker.stop()
+                # The replacement imports OCC while it sits idle in the pool.
+                worker = self._try_spawn()
+        except GeometryAnalysisError:
+            if worker is not None:
+                worker.kill()
+            # Replace the killed worker right away so the next file gets a warm process.
+            worker = self._try_spawn()
+            raise
+        except BaseException:
+            if worker is not None:
+                worker.kill()
+            worker = None
+            raise
+        finally:
+            self._idle.put(worker)
+
+        if kind == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.stop()
+
+    def _spawn(self) -> _OccWorker:
+        try:
+            return _OccWorker(self._context)
+        except Exception as exc:  # noqa: BLE001 - a pool that cannot start fails the file, never falls back
+            raise GeometryAnalysisError(f"Could not start OCC worker: {type(exc).__name__}: {exc}") from exc
+
+    def _try_spawn(self) -> _OccWorker | None:
+        """Replacement for an idle slot; on failure the slot stays empty and the next analysis retries."""
+        try:
+            return self._spawn()
+        except GeometryAnalysisError:
+            logger.exception("Could not start OCC worker")
+            return None
+
+    def _wait_ready(self, worker: _OccWorker) -> None:
+        if worker.ready:
+            return
+        kind, payload = self._await(
+            worker,
+            time.monotonic() + self.start_timeout_s,
+            f"OCC worker did not start within {self.start_timeout_s:.0f} s",
+        )
+        if kind == "unavailable":
+            self.unavailable_reason = payload
+            logger.warning("pythonOCC unavailable in analysis workers: %s", payload)
+            raise OccUnavailableError(payload)
+        worker.ready = True
+
+    def _await(self, worker: _OccWorker, deadline: float, timeout_message: str | None = None) -> tuple[str, Any]:
+        pid = worker.process.pid
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                worker.kill()
+                raise GeometryAnalysisError(timeout_message or f"OCC analysis timed out after {self.timeout_s:.0f} s")
+            if worker.conn.poll(min(remaining, RSS_POLL_INTERVAL_S)):
+                try:
+                    return worker.conn.recv()
+                except EOFError:
+                    worker.process.join(timeout=5)
+                    raise GeometryAnalysisError(
+                        f"OCC worker crashed ({_exit_reason(worker.process.exitcode)})"
+                    ) from None
+            if not worker.is_alive():
+                raise GeometryAnalysisError(f"OCC worker crashed ({_exit_reason(worker.process.exitcode)})")
+            rss = _read_rss_bytes(pid)
+            if rss is not None and rss > self.rss_limit_bytes:
+                worker.kill()
+                raise GeometryAnalysisError(
+                    f"OCC analysis exceeded memory limit ({rss // (1024 * 1024)} MiB > "
+                    f"{self.rss_limit_bytes // (1024 * 1024)} MiB)"
+                )
+
+
+_pool: OccWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_occ_pool() -> OccWorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            settings = get_settings()
+            _pool = OccWorkerPool(
+                size=settings.occ_pool_size,
+                timeout_s=settings.occ_task_timeout_s,
+                rss_limit_bytes=settings.occ_rss_limit_mb * 1024 * 1024,
+                max_tasks=settings.occ_max_tasks_per_worker,
+                start_timeout_s=settings.occ_worker_start_timeout_s,
+            )
+            atexit.register(_pool.close)
+        return _pool
+
+
+def warm_occ_pool() -> None:
+    if get_settings().occ_pool_enabled:
+        get_occ_pool().warm()
+
+
+def close_occ_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
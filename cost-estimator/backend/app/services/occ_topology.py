@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+SURFACE_OTHER = 0
+SURFACE_PLANE = 1
+SURFACE_CYLINDER = 2
+
+SMALL_HOLE_DIAMETER_MM = 6.0
+LARGE_BORE_DIAMETER_MM = 20.0
+
+
+@dataclass
+class TopologyIndex:
+    """Unique faces/edges of a shape with per-face surface data packed into NumPy arrays."""
+
+    faces: Any  # TopTools_IndexedMapOfShape, 1-based, reused by the mesher
+    edge_count: int
+    surface_types: np.ndarray  # int8, one of SURFACE_*
+    cylinder_radii: np.ndarray  # float64, NaN for non-cylindrical faces
+
+    @property
+    def face_count(self) -> int:
+        return int(self.surface_types.size)
+
+    def feature_counts(self) -> dict[str, int]:
+        is_cylinder = self.surface_types == SURFACE_CYLINDER
+        radii = self.cylinder_radii[is_cylinder]
+        diameters = radii[radii > 0] * 2.0
+        return {
+            "faces_count": self.face_count,
+            "edges_count": self.edge_count,
+            "cylindrical_face_count": int(np.count_nonzero(is_cylinder)),
+            "holes_count": int(diameters.size),
+            "holes_small_count": int(np.count_nonzero(diameters < SMALL_HOLE_DIAMETER_MM)),
+            "large_bore_count": int(np.count_nonzero(diameters > LARGE_BORE_DIAMETER_MM)),
+            "flat_face_count": int(np.count_nonzero(self.surface_types == SURFACE_PLANE)),
+        }
+
+
+def index_topology(shape: Any) -> TopologyIndex:
+    from OCC.Core.BRepAdaptor import BRepAdaptor_Surface
+    from OCC.Core.GeomAbs import GeomAbs_Cylinder, GeomAbs_Plane
+    from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_FACE
+    from OCC.Core.TopExp import topexp
+    from OCC.Core.TopTools import TopTools_IndexedMapOfShape
+    from OCC.Core.TopoDS import topods
+
+    # MapShapes walks the topology in C++ and keeps each sub-shape once, so faces and
+    # edges shared between solids/wires are not counted per occurrence.
+    faces = TopTools_IndexedMapOfShape()
+    edges = TopTools_IndexedMapOfShape()
+    topexp.MapShapes(shape, TopAbs_FACE, faces)
+    topexp.MapShapes(shape, TopAbs_EDGE, edges)
+
+    face_count = faces.Size()
+    surface_types = np.full(face_count, SURFACE_OTHER, dtype=np.int8)
+    cylinder_radii = np.full(face_count, np.nan, dtype=np.float64)
+
+    # One adaptor is re-initialised per face; restriction=False skips computing the face's
+    # UV bounds, which the surface type and cylinder radius do not need.
+    surface = BRepAdaptor_Surface()
+    for i in range(face_count):
+        surface.Initialize(topods.Face(faces.FindKey(i + 1)), False)
+        surface_type = surface.GetType()
+        if surface_type == GeomAbs_Plane:
+            surface_types[i] = SURFACE_PLANE
+        elif surface_type == GeomAbs_Cylinder:
+            surface_types[i] = SURFACE_CYLINDER
+            cylinder_radii[i] = surface.Cylinder().Radius()
+
+    return TopologyIndex(
+        faces=faces,
+        edge_count=int(edges.Size()),
+        surface_types=surface_types,
+        cylinder_radii=cylinder_radii,
+    )
+
+
+def triangulate_faces(topology: TopologyIndex) -> tuple[np.ndarray, np.ndarray]:
+    """Collect the Poly_Triangulation of every meshed face into shared vertex/index arrays.
+
+    Nodes are shared within a face; boundary nodes repeated across faces are welded by the
+    GLB writer. Call after ``BRepMesh_IncrementalMesh`` has meshed the shape.
+    """
+    from OCC.Core.BRep import BRep_Tool
+    from OCC.Core.TopAbs import TopAbs_REVERSED
+    from OCC.Core.TopLoc import TopLoc_Location
+    from OCC.Core.TopoDS import topods
+
+    meshed: list[tuple[Any, Any, bool]] = []
+    node_total = 0
+    triangle_total = 0
+    for i in range(topology.face_count):
+        face = topods.Face(topology.faces.FindKey(i + 1))
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation(face, location)
+        if triangulation is None or triangulation.NbTriangles() == 0:
+            continue
+        meshed.append((triangulation, location, face.Orientation() == TopAbs_REVERSED))
+        node_total += triangulation.NbNodes()
+        triangle_total += triangulation.NbTriangles()
+
+    vertices = np.empty((node_total, 3), dtype=np.float64)
+    triangles = np.empty((triangle_total, 3), dtype=np.int64)
+    node_offset = 0
+    triangle_offset = 0
+    for triangulation, location, reversed_face in meshed:
+        node_count = triangulation.NbNodes()
+        triangle_count = triangulation.NbTriangles()
+
+        face_nodes = vertices[node_offset : node_offset + node_count]
+        for j in range(node_count):
+            point = triangulation.Node(j + 1)
+            face_nodes[j] = (point.X(), point.Y(), point.Z())
+        if not location.IsIdentity():
+            trsf = location.Transformation()
+            matrix = np.array([[trsf.Value(r, c) for c in range(1, 5)] for r in range(1, 4)])
+            face_nodes[:] = face_nodes @ matrix[:, :3].T + matrix[:, 3]
+
+        face_triangles = triangles[triangle_offset : triangle_offset + triangle_count]
+        for j in range(triangle_count):
+            face_triangles[j] = triangulation.Triangle(j + 1).Get()
+        # Poly_Triangulation indices are 1-based and local to the face.
+        face_triangles += node_offset - 1
+        if reversed_face:
+            face_triangles[:, [1, 2]] = face_triangles[:, [2, 1]]
+
+        node_offset += node_count
+        triangle_offset += triangle_count
+
+    return vertices, triangles
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from types import CodeType
+
+PROFILE_CONTENT_TYPE = "text/plain; charset=utf-8"
+_APP_ROOT = Path(__file__).resolve().parents[1]
+
+
+def profile_key_for(part_id: str, job_id: str) -> str:
+    return f"profiles/{part_id}/{job_id}.folded"
+
+
+@lru_cache(maxsize=8192)
+def _code_label(code: CodeType) -> str:
+    path = Path(code.co_filename)
+    # app/... for our code, the bare file name for the stdlib and site-packages.
+    if path.is_relative_to(_APP_ROOT):
+        location = f"app/{path.relative_to(_APP_ROOT).as_posix()}"
+    else:
+        location = path.name
+    return f"{code.co_qualname} ({location}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the Python stack of one thread from a background thread.
+
+    Output is the folded ("collapsed") stack format read by flamegraph.pl, speedscope and
+    inferno: one ``root;...;leaf count`` line per distinct stack. Time spent inside native
+    calls (OCC, numpy) is attributed to the Python frame that made the call. Nothing is
+    installed on the profiled thread, so its only cost is the sampler's share of the GIL.
+    """
+
+    def __init__(self, interval_s: float = 0.005, thread_id: int | None = None):
+        self.interval_s = interval_s
+        self.thread_id = thread_id
+        self.samples: Counter[str] = Counter()
+        self.sample_count = 0
+        self.duration_s = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.duration_s = time.perf_counter() - self._started
+
+    def __enter__(self) -> SamplingProfiler:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def merge(self, folded: str, root: str) -> None:
+        """Add stacks sampled in another process (e.g. an OCC worker) under a synthetic root frame."""
+        for line in folded.splitlines():
+            stack, _, count = line.rpartition(" ")
+            if stack and count.isdigit():
+                self.samples[f"{root};{stack}"] += int(count)
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.samples.items()))
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_code_label(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[";".join(stack)] += 1
+            self.sample_count += 1
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.services.storage_service import StorageService
+
+
+class RawFileCache:
+    """Worker-local LRU cache of raw STEP downloads, bounded by total bytes on disk.
+
+    Entries are keyed by storage key and ETag, populated through an atomic rename and
+    evicted oldest-mtime first; a cache hit refreshes the entry's mtime.
+    """
+
+    def __init__(self, storage: StorageService, cache_dir: Path | None = None, max_bytes: int | None = None):
+        settings = get_settings()
+        self.storage = storage
+        self.cache_dir = Path(cache_dir or settings.raw_cache_dir)
+        self.max_bytes = settings.raw_cache_max_bytes if max_bytes is None else max_bytes
+
+    def _path_for(self, key: str, etag: str) -> Path:
+        digest = hashlib.sha256(f"{key}\0{etag}".encode("utf-8")).hexdigest()
+        suffix = Path(key).suffix.lower() or ".step"
+        return self.cache_dir / f"{digest}{suffix}"
+
+    def fetch(self, key: str) -> Path:
+        info = self.storage.stat_raw(key)
+        path = self._path_for(key, info.etag)
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".download-", dir=self.cache_dir)
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            self.storage.download_raw_to(key, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep: Path) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                # Dot-files are in-flight downloads of this or another process.
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
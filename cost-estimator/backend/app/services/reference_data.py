@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import chain
+
+import redis
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.cutting_parameter import CuttingParameter
+from app.models.material import Material
+from app.models.stock_item import StockItem
+from app.services.costing_service import build_parameter_profiles
+from app.services.cycle_time_service import ParameterProfile
+from app.services.machine_profiles import MACHINE_PROFILES
+from app.services.stock_catalog import StockCatalog, load_stock_catalog
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_VERSION_KEY = "reference_data:version"
+REFERENCE_CHANNEL = "reference_data:invalidate"
+REFERENCE_MODELS = (Material, CuttingParameter, StockItem)
+
+
+@dataclass(frozen=True)
+class MaterialSnapshot:
+    """Detached, read-only copy of a ``Material`` row; safe to share across threads and sessions."""
+
+    id: int
+    code: str
+    name: str
+    density_g_cm3: float
+    price_per_kg: float
+    allowance_mm: float
+
+    @classmethod
+    def from_model(cls, material: Material) -> MaterialSnapshot:
+        return cls(
+            id=material.id,
+            code=material.code,
+            name=material.name,
+            density_g_cm3=material.density_g_cm3,
+            price_per_kg=material.price_per_kg,
+            allowance_mm=material.allowance_mm,
+        )
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    version: int
+    materials: tuple[MaterialSnapshot, ...]
+    materials_by_id: dict[int, MaterialSnapshot]
+    profiles: dict[tuple[int, str], tuple[ParameterProfile, ...]]
+    stock_catalog: StockCatalog
+
+    def material(self, material_id: int | None) -> MaterialSnapshot | None:
+        return self.materials_by_id.get(material_id) if material_id is not None else None
+
+    def profiles_for(self, material_id: int, machine_id: str) -> tuple[ParameterProfile, ...]:
+        return self.profiles.get((material_id, machine_id), ())
+
+
+def load_reference_data(db: Session, version: int = 0) -> ReferenceData:
+    materials = db.scalars(select(Material).order_by(Material.code.asc())).all()
+    rows_by_material: dict[int, list[CuttingParameter]] = defaultdict(list)
+    for row in db.scalars(select(CuttingParameter).order_by(CuttingParameter.id.asc())).all():
+        rows_by_material[row.material_id].append(row)
+
+    snapshots = tuple(MaterialSnapshot.from_model(material) for material in materials)
+    profiles = {
+        (material.id, machine.id): tuple(build_parameter_profiles(rows_by_material[material.id], machine))
+        for material in snapshots
+        for machine in MACHINE_PROFILES.values()
+    }
+    return ReferenceData(
+        version=version,
+        materials=snapshots,
+        materials_by_id={material.id: material for material in snapshots},
+        profiles=profiles,
+        stock_catalog=load_stock_catalog(db),
+    )
+
+
+class ReferenceDataCache:
+    """Process-local snapshot of materials, pre-built parameter profiles and the stock catalog.
+
+    Readers get the current snapshot without touching the DB. Any commit that changes a
+    material, cutting parameter or stock item bumps a Redis version counter and publishes it; a listener
+    thread in every process marks its snapshot stale, and the next reader reloads it. The
+    version key is also polled, so a missed message only delays invalidation by one interval.
+    """
+
+    def __init__(self, redis_url: str, poll_interval_s: float = 30.0):
+        self.redis_url = redis_url
+        self.poll_interval_s = poll_interval_s
+        self._client: redis.Redis | None = None
+        self._snapshot: ReferenceData | None = None
+        self._loaded_generation = -1
+        self._generation = 0
+        self._remote_version: int | None = None
+        self._lock = threading.Lock()
+        self._listener_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener: threading.Thread | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._snapshot is not None and self._loaded_generation == self._generation
+
+    def get(self) -> ReferenceData:
+        if self._listener is None or not self._listener.is_alive():
+            # Started lazily as well: solo-pool workers never get worker_process_init, and the
+            # thread does not survive a fork.
+            self.start_listener()
+        snapshot = self._snapshot
+        if snapshot is not None and self._loaded_generation == self._generation:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._loaded_generation != self._generation:
+                generation = self._generation
+                with SessionLocal() as db:
+                    self._snapshot = load_reference_data(db, version=self._remote_version or 0)
+                self._loaded_generation = generation
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    def warm(self) -> ReferenceData:
+        return self.get()
+
+    def start_listener(self) -> None:
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._stop.clear()
+            self._listener = threading.Thread(target=self._listen, name="reference-data-listener", daemon=True)
+            self._listener.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=self.poll_interval_s)
+            self._listener = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def bump_version(self) -> None:
+        """Invalidate this process immediately and every other process via Redis (best effort)."""
+        self.invalidate()
+        try:
+            version = self._redis().incr(REFERENCE_VERSION_KEY)
+            self._remote_version = version
+            self._redis().publish(REFERENCE_CHANNEL, version)
+        except redis.RedisError as exc:
+            logger.warning("Could not publish reference data version bump: %s", exc)
+
+    def _redis(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.redis_url)
+        return self._client
+
+    def _observe_version(self, raw: bytes | str | int | None) -> None:
+        version = int(raw or 0)
+        self._remote_version = version
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version != version:
+            self.invalidate()
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(REFERENCE_CHANNEL)
+                # Catch bumps that happened while this process was not subscribed.
+                self._observe_version(self._redis().get(REFERENCE_VERSION_KEY))
+                last_poll = time.monotonic()
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None and message.get("type") == "message":
+                        self._observe_version(message["data"])
+                    elif time.monotonic() - last_poll >= self.poll_interval_s:
+                        self._observe_version(self._redis().get(REFERENCE_VERSION_KEY))
+                        last_poll = time.monotonic()
+            except Exception as exc:  # noqa: BLE001 - keep serving the current snapshot and retry
+                logger.warning("Reference data listener dropped, retrying: %s", exc)
+                # Without a subscription, changes from other processes could be missed.
+                self.invalidate()
+                self._stop.wait(self.poll_interval_s)
+            finally:
+                if pubsub is not None:
+                    pubsub.close()
+
+
+_cache: ReferenceDataCache | None = None
+
+
+def get_reference_cache() -> ReferenceDataCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = ReferenceDataCache(settings.redis_url, poll_interval_s=settings.reference_data_poll_interval_s)
+    return _cache
+
+
+def warm_reference_cache() -> None:
+    try:
+        get_reference_cache().warm()
+    except Exception:  # noqa: BLE001 - the first reader loads it instead
+        logger.exception("Could not warm reference data cache")
+
+
+def close_reference_cache() -> None:
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+
+async def get_reference_data() -> ReferenceData:
+    """FastAPI dependency; a (rare) reload runs on a worker thread so it never blocks the loop."""
+    cache = get_reference_cache()
+    if cache.is_fresh:
+        return cache.get()
+    return await run_in_threadpool(cache.get)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_reference_changes(session: Session, _flush_context) -> None:
+    if any(isinstance(obj, REFERENCE_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["reference_data_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_reference_changes(session: Session) -> None:
+    if session.info.pop("reference_data_changed", False):
+        get_reference_cache().bump_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_reference_changes(session: Session) -> None:
+    session.info.pop("reference_data_changed", None)
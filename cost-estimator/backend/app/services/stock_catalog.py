@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.stock_item import StockItem
+from app.services.stock_service import RECT_STANDARD_EDGES, ROUND_BAR_STANDARD_DIAMETERS
+
+# Seeded for every material: bar lengths, flat bar sections (thickness <= width) and plate sheets.
+DEFAULT_ROUND_BAR_LENGTHS_MM = (1000, 3000, 6000)
+DEFAULT_FLAT_BAR_LENGTHS_MM = (3000, 6000)
+DEFAULT_FLAT_BAR_MAX_WIDTH_MM = 150
+DEFAULT_PLATE_SIZES_MM = ((1000, 2000), (1500, 3000))
+
+
+@dataclass(frozen=True)
+class StockSku:
+    """Detached copy of a ``StockItem`` row."""
+
+    id: int
+    sku: str
+    material_id: int
+    form: str
+    diameter_mm: float | None
+    width_mm: float | None
+    thickness_mm: float | None
+    length_mm: float
+    unit_price: float
+
+    @classmethod
+    def from_model(cls, item: StockItem) -> StockSku:
+        return cls(
+            id=item.id,
+            sku=item.sku,
+            material_id=item.material_id,
+            form=item.form,
+            diameter_mm=item.diameter_mm,
+            width_mm=item.width_mm,
+            thickness_mm=item.thickness_mm,
+            length_mm=item.length_mm,
+            unit_price=item.unit_price,
+        )
+
+    @property
+    def volume_mm3(self) -> float:
+        return stock_volume_mm3(self.form, self.length_mm, self.diameter_mm, self.width_mm, self.thickness_mm)
+
+
+def stock_volume_mm3(
+    form: str,
+    length_mm: float,
+    diameter_mm: float | None = None,
+    width_mm: float | None = None,
+    thickness_mm: float | None = None,
+) -> float:
+    if form == "round_bar":
+        return 3.14159265359 * (diameter_mm / 2.0) ** 2 * length_mm
+    return width_mm * thickness_mm * length_mm
+
+
+def _sorted_unique(values: Iterable[float]) -> tuple[float, ...]:
+    return tuple(sorted(set(values)))
+
+
+def _by_length(items: Iterable[StockSku]) -> tuple[StockSku, ...]:
+    return tuple(sorted(items, key=lambda sku: (sku.length_mm, sku.unit_price)))
+
+
+class StockCatalog:
+    """Per-material index over the stock catalog, built once per reference data snapshot.
+
+    Every lookup is a bisect over pre-sorted tuples: section sizes to snap a part envelope,
+    and bar/plate SKUs grouped by section (sorted by length or area) for nesting.
+    """
+
+    def __init__(self, skus: Iterable[StockSku] = ()):
+        round_bars: dict[tuple[int, float], list[StockSku]] = defaultdict(list)
+        flat_bars: dict[tuple[int, float, float], list[StockSku]] = defaultdict(list)
+        plates: dict[tuple[int, float], list[StockSku]] = defaultdict(list)
+        self.by_sku: dict[str, StockSku] = {}
+        for sku in skus:
+            self.by_sku[sku.sku] = sku
+            if sku.form == "round_bar":
+                round_bars[(sku.material_id, sku.diameter_mm)].append(sku)
+            elif sku.form == "flat_bar":
+                flat_bars[(sku.material_id, sku.thickness_mm, sku.width_mm)].append(sku)
+            elif sku.form == "plate":
+                plates[(sku.material_id, sku.thickness_mm)].append(sku)
+
+        self._round_bars = {key: _by_length(items) for key, items in round_bars.items()}
+        self._flat_bars = {key: _by_length(items) for key, items in flat_bars.items()}
+        self._plates = {
+            key: tuple(sorted(items, key=lambda sku: (sku.width_mm * sku.length_mm, sku.unit_price)))
+            for key, items in plates.items()
+        }
+
+        diameters: dict[int, set[float]] = defaultdict(set)
+        for material_id, diameter in self._round_bars:
+            diameters[material_id].add(diameter)
+        flat_widths: dict[tuple[int, float], set[float]] = defaultdict(set)
+        for material_id, thickness, width in self._flat_bars:
+            flat_widths[(material_id, thickness)].add(width)
+        plate_thicknesses: dict[int, set[float]] = defaultdict(set)
+        for material_id, thickness in self._plates:
+            plate_thicknesses[material_id].add(thickness)
+
+        self._diameters = {material_id: _sorted_unique(values) for material_id, values in diameters.items()}
+        self._flat_widths = {key: _sorted_unique(values) for key, values in flat_widths.items()}
+        flat_thicknesses: dict[int, set[float]] = defaultdict(set)
+        for material_id, thickness in self._flat_widths:
+            flat_thicknesses[material_id].add(thickness)
+        self._flat_thicknesses = {key: _sorted_unique(values) for key, values in flat_thicknesses.items()}
+        self._plate_thicknesses = {key: _sorted_unique(values) for key, values in plate_thicknesses.items()}
+
+        edges: dict[int, set[float]] = defaultdict(set)
+        for (material_id, thickness), widths in self._flat_widths.items():
+            edges[material_id].add(thickness)
+            edges[material_id].update(widths)
+        for material_id, thicknesses in self._plate_thicknesses.items():
+            edges[material_id].update(thicknesses)
+        self._edges = {material_id: _sorted_unique(values) for material_id, values in edges.items()}
+
+    def __len__(self) -> int:
+        return len(self.by_sku)
+
+    def skus(self, material_id: int | None = None, form: str | None = None) -> list[StockSku]:
+        return [
+            sku
+            for sku in self.by_sku.values()
+            if (material_id is None or sku.material_id == material_id) and (form is None or sku.form == form)
+        ]
+
+    def round_diameters(self, material_id: int) -> tuple[float, ...]:
+        return self._diameters.get(material_id, ())
+
+    def rect_edges(self, material_id: int) -> tuple[float, ...]:
+        """Every flat bar and plate dimension stocked for the material, for block snapping."""
+        return self._edges.get(material_id, ())
+
+    def round_bars(self, material_id: int, min_diameter_mm: float) -> tuple[StockSku, ...]:
+        """Bars of the smallest stocked diameter >= ``min_diameter_mm``, shortest first."""
+        diameters = self.round_diameters(material_id)
+        index = bisect_left(diameters, min_diameter_mm)
+        if index == len(diameters):
+            return ()
+        return self._round_bars[(material_id, diameters[index])]
+
+    def flat_bars(self, material_id: int, min_thickness_mm: float, min_width_mm: float) -> tuple[StockSku, ...]:
+        """Bars of the smallest-area flat section covering ``min_thickness_mm`` x ``min_width_mm``."""
+        best: tuple[float, float, float] | None = None
+        thicknesses = self._flat_thicknesses.get(material_id, ())
+        for thickness in thicknesses[bisect_left(thicknesses, min_thickness_mm) :]:
+            if best is not None and thickness * min_width_mm >= best[0]:
+                # Thicknesses only grow from here, so no later section can be smaller.
+                break
+            widths = self._flat_widths[(material_id, thickness)]
+            index = bisect_left(widths, min_width_mm)
+            if index < len(widths) and (best is None or thickness * widths[index] < best[0]):
+                best = (thickness * widths[index], thickness, widths[index])
+        if best is None:
+            return ()
+        return self._flat_bars[(material_id, best[1], best[2])]
+
+    def plates(self, material_id: int, min_thickness_mm: float) -> tuple[StockSku, ...]:
+        """Sheets of the thinnest stocked plate >= ``min_thickness_mm``, smallest area first."""
+        thicknesses = self._plate_thicknesses.get(material_id, ())
+        index = bisect_left(thicknesses, min_thickness_mm)
+        if index == len(thicknesses):
+            return ()
+        return self._plates[(material_id, thicknesses[index])]
+
+
+def load_stock_catalog(db: Session) -> StockCatalog:
+    items = db.scalars(select(StockItem).order_by(StockItem.id.asc())).all()
+    return StockCatalog(StockSku.from_model(item) for item in items)
+
+
+def piece_price(volume_mm3: float, density_g_cm3: float, price_per_kg: float) -> float:
+    return round(volume_mm3 / 1000.0 * density_g_cm3 / 1000.0 * price_per_kg, 2)
+
+
+def default_stock_items(material_id: int, code: str, density_g_cm3: float, price_per_kg: float) -> list[StockItem]:
+    """Standard bars and plates for a new material, priced by weight at its ``price_per_kg``."""
+    items: list[StockItem] = []
+
+    def add(sku: str, form: str, **dimensions: float) -> None:
+        volume_mm3 = stock_volume_mm3(form, **dimensions)
+        items.append(
+            StockItem(
+                sku=sku,
+                material_id=material_id,
+                form=form,
+                unit_price=piece_price(volume_mm3, density_g_cm3, price_per_kg),
+                **dimensions,
+            )
+        )
+
+    for diameter in ROUND_BAR_STANDARD_DIAMETERS:
+        for length in DEFAULT_ROUND_BAR_LENGTHS_MM:
+            add(f"{code}-RB-D{diameter}-L{length}", "round_bar", diameter_mm=diameter, length_mm=length)
+    for width in RECT_STANDARD_EDGES:
+        if width > DEFAULT_FLAT_BAR_MAX_WIDTH_MM:
+            break
+        for thickness in RECT_STANDARD_EDGES:
+            if thickness > width:
+                break
+            for length in DEFAULT_FLAT_BAR_LENGTHS_MM:
+                add(
+                    f"{code}-FB-{thickness}x{width}-L{length}",
+                    "flat_bar",
+                    thickness_mm=thickness,
+                    width_mm=width,
+                    length_mm=length,
+                )
+    for thickness in RECT_STANDARD_EDGES:
+        for width, length in DEFAULT_PLATE_SIZES_MM:
+            add(
+                f"{code}-PL-T{thickness}-{width}x{length}",
+                "plate",
+                thickness_mm=thickness,
+                width_mm=width,
+                length_mm=length,
+            )
+    return items
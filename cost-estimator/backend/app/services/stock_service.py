@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
 
+if TYPE_CHECKING:
+    from app.services.stock_catalog import StockCatalog
 
-ROUND_BAR_STANDARD_DIAMETERS = [10, 12, 16, 20, 25, 30, 35, 40, 50, 60, 80, 100]
-RECT_STANDARD_EDGES = [10, 12, 16, 20, 25, 30, 35, 40, 50, 60, 80, 100, 120, 150, 200, 250, 300]
+# Used to seed the stock catalog and for materials that have no catalog entries yet.
+ROUND_BAR_STANDARD_DIAMETERS = (10, 12, 16, 20, 25, 30, 35, 40, 50, 60, 80, 100)
+RECT_STANDARD_EDGES = (10, 12, 16, 20, 25, 30, 35, 40, 50, 60, 80, 100, 120, 150, 200, 250, 300)
 
 
 @dataclass
@@ -12,15 +17,25 @@ class MaterialInfo:
     density_g_cm3: float
     price_per_kg: float
     allowance_mm: float
+    id: int | None = None
+
+
+def snap_up(value: float, options: Sequence[float]) -> float:
+    """Smallest option >= ``value`` (the largest one if none is); ``options`` must be sorted."""
+    index = bisect_left(options, value)
+    return float(options[min(index, len(options) - 1)])
 
 
 class StockService:
-    @staticmethod
-    def _snap_up(value: float, options: list[int]) -> float:
-        for opt in sorted(options):
-            if opt >= value:
-                return float(opt)
-        return float(options[-1])
+    def _options(
+        self, material: MaterialInfo, catalog: StockCatalog | None
+    ) -> tuple[Sequence[float], Sequence[float], str]:
+        if catalog is not None and material.id is not None:
+            diameters = catalog.round_diameters(material.id)
+            edges = catalog.rect_edges(material.id)
+            if diameters and edges:
+                return diameters, edges, "catalog"
+        return ROUND_BAR_STANDARD_DIAMETERS, RECT_STANDARD_EDGES, "standard"
 
     def determine_stock(
         self,
@@ -28,12 +43,18 @@ class StockService:
         material: MaterialInfo,
         stock_strategy: str = "auto",
         allowance_multiplier: float = 1.0,
+        catalog: StockCatalog | None = None,
     ) -> dict:
+        """Snap the part's envelope up to the nearest catalog section for ``material``.
+
+        Without a catalog (or with no entries for the material) the standard sizes are used.
+        """
         bbox = geometry.get("bbox", {})
         x = float(bbox.get("x_mm", 0.0))
         y = float(bbox.get("y_mm", 0.0))
         z = float(bbox.get("z_mm", 0.0))
         allowance = float(material.allowance_mm) * max(float(allowance_multiplier), 0.1)
+        diameters, edges, catalog_source = self._options(material, catalog)
 
         rotational = bool(geometry.get("rotational_symmetry", False))
         if stock_strategy == "round_bar":
@@ -44,7 +65,7 @@ class StockService:
         if rotational:
             raw_diameter = max(x, y) + allowance * 2.0
             raw_length = z + allowance * 2.0
-            std_diameter = self._snap_up(raw_diameter, ROUND_BAR_STANDARD_DIAMETERS)
+            std_diameter = snap_up(raw_diameter, diameters)
             stock_volume_mm3 = 3.14159265359 * ((std_diameter / 2.0) ** 2) * max(raw_length, 0.001)
             stock_type = "round_bar"
             stock_dimensions = {
@@ -56,9 +77,9 @@ class StockService:
             raw_x = x + allowance * 2.0
             raw_y = y + allowance * 2.0
             raw_z = z + allowance * 2.0
-            std_x = self._snap_up(raw_x, RECT_STANDARD_EDGES)
-            std_y = self._snap_up(raw_y, RECT_STANDARD_EDGES)
-            std_z = self._snap_up(raw_z, RECT_STANDARD_EDGES)
+            std_x = snap_up(raw_x, edges)
+            std_y = snap_up(raw_y, edges)
+            std_z = snap_up(raw_z, edges)
             stock_volume_mm3 = max(std_x, 0.001) * max(std_y, 0.001) * max(std_z, 0.001)
             stock_type = "rectangular_block"
             stock_dimensions = {
@@ -80,7 +101,8 @@ class StockService:
             "stock_volume_cm3": round(stock_volume_cm3, 4),
             "raw_material_cost": round(raw_material_cost, 4),
             "catalog_meta": {
-                "round_bar_diameters_mm": ROUND_BAR_STANDARD_DIAMETERS,
-                "rect_block_edges_mm": RECT_STANDARD_EDGES,
+                "source": catalog_source,
+                "round_bar_diameter_count": len(diameters),
+                "rect_block_edge_count": len(edges),
             },
         }
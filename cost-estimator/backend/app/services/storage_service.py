@@ -1,42 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, BinaryIO, Callable, Iterator, TypeVar
 
-from minio import Minio
-from minio.error import S3Error
+import anyio
 
 from app.core.config import get_settings
 
+if TYPE_CHECKING:
+    from minio import Minio
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+HEAD_SAMPLE_BYTES = 64 * 1024
+
+
+class HashingReader:
+    """File-like wrapper that hashes and counts bytes as the MinIO client pulls them.
+
+    The first ``HEAD_SAMPLE_BYTES`` are kept for cheap pre-flight inspection (job routing).
+    """
+
+    def __init__(self, raw: BinaryIO, max_bytes: int | None = None) -> None:
+        self._raw = raw
+        self._digest = hashlib.sha256()
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.head = b""
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        if chunk:
+            self.size_bytes += len(chunk)
+            if self.max_bytes is not None and self.size_bytes > self.max_bytes:
+                raise UploadTooLargeError(f"File exceeds the {self.max_bytes} byte upload limit")
+            self._digest.update(chunk)
+            if len(self.head) < HEAD_SAMPLE_BYTES:
+                self.head += chunk[: HEAD_SAMPLE_BYTES - len(self.head)]
+        return chunk
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+
+@dataclass
+class UploadResult:
+    key: str
+    size_bytes: int
+    content_sha256: str
+    head: bytes = b""
+
+
+@dataclass
+class ObjectInfo:
+    size: int
+    etag: str
+    content_type: str
+
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+T = TypeVar("T")
+_storage_limiter: anyio.CapacityLimiter | None = None
+
+
+def storage_limiter() -> anyio.CapacityLimiter:
+    # minio-py is blocking and there is no maintained async client for it, so async routes run
+    # storage calls on worker threads, bounded separately from Starlette's default threadpool.
+    global _storage_limiter
+    if _storage_limiter is None:
+        _storage_limiter = anyio.CapacityLimiter(get_settings().storage_max_concurrency)
+    return _storage_limiter
+
+
+async def run_storage_call(func: Callable[..., T], *args, **kwargs) -> T:
+    return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=storage_limiter())
+
+
+async def aiter_storage_stream(stream: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Drive a blocking object stream from the storage threads, one chunk at a time."""
+    done = object()
+    try:
+        while True:
+            chunk = await run_storage_call(next, stream, done)
+            if chunk is done:
+                return
+            yield chunk
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            await run_storage_call(close)
+
+
+def build_minio_client() -> Minio:
+    # minio/urllib3/certifi load on first storage use, not at import time of every API module.
+    import certifi
+    import urllib3
+    from minio import Minio
+
+    settings = get_settings()
+    http_client = urllib3.PoolManager(
+        num_pools=4,
+        maxsize=settings.minio_pool_maxsize,
+        block=False,
+        timeout=urllib3.Timeout(connect=settings.minio_connect_timeout_s, read=settings.minio_read_timeout_s),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=certifi.where(),
+        retries=urllib3.Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+    return Minio(
+        settings.minio_endpoint,
+        access_key=settings.minio_access_key,
+        secret_key=settings.minio_secret_key,
+        secure=settings.minio_secure,
+        http_client=http_client,
+    )
+
 
 class StorageService:
-    def __init__(self) -> None:
+    def __init__(self, client: Minio | None = None) -> None:
         settings = get_settings()
-        self.client = Minio(
-            settings.minio_endpoint,
-            access_key=settings.minio_access_key,
-            secret_key=settings.minio_secret_key,
-            secure=settings.minio_secure,
-        )
+        self.client = client or build_minio_client()
+        self.upload_part_size = settings.upload_part_size_bytes
         self.bucket_raw = settings.minio_bucket_raw
         self.bucket_model = settings.minio_bucket_model
+
+    def ensure_buckets(self) -> None:
         self._ensure_bucket(self.bucket_raw)
         self._ensure_bucket(self.bucket_model)
 
     def _ensure_bucket(self, bucket_name: str) -> None:
+        from minio.error import S3Error
+
         try:
             if not self.client.bucket_exists(bucket_name):
                 self.client.make_bucket(bucket_name)
         except S3Error as exc:
             raise RuntimeError(f"MinIO bucket setup failed: {bucket_name}") from exc
 
-    def upload_raw_file(self, key: str, data: bytes, content_type: str = "application/step") -> None:
-        stream = BytesIO(data)
+    def upload_raw_stream(
+        self,
+        key: str,
+        stream: BinaryIO,
+        content_type: str = "application/step",
+        max_bytes: int | None = None,
+    ) -> UploadResult:
+        # Unknown length: the client buffers one part at a time and uploads it as a multipart part,
+        # so memory stays at ~upload_part_size regardless of the file size.
+        reader = HashingReader(stream, max_bytes=max_bytes)
         self.client.put_object(
             bucket_name=self.bucket_raw,
             object_name=key,
-            data=stream,
-            length=len(data),
+            data=reader,
+            length=-1,
+            part_size=self.upload_part_size,
             content_type=content_type,
         )
+        return UploadResult(key=key, size_bytes=reader.size_bytes, content_sha256=reader.sha256, head=reader.head)
+
+    def remove_raw(self, key: str) -> None:
+        self.client.remove_object(self.bucket_raw, key)
 
     def upload_model(self, key: str, data: bytes, content_type: str = "model/gltf-binary") -> None:
         stream = BytesIO(data)
@@ -53,22 +184,43 @@ class StorageService:
         self.client.fget_object(self.bucket_raw, key, str(target_path))
         return target_path
 
-    def get_model_bytes(self, key: str) -> tuple[bytes, str]:
-        response = self.client.get_object(self.bucket_model, key)
+    def stat_model(self, key: str) -> ObjectInfo:
+        return self._stat(self.bucket_model, key)
+
+    def stat_raw(self, key: str) -> ObjectInfo:
+        return self._stat(self.bucket_raw, key)
+
+    def iter_model(self, key: str, offset: int = 0, length: int | None = None) -> Iterator[bytes]:
+        return self._iter(self.bucket_model, key, offset, length)
+
+    def iter_raw(self, key: str, offset: int = 0, length: int | None = None) -> Iterator[bytes]:
+        return self._iter(self.bucket_raw, key, offset, length)
+
+    def _stat(self, bucket_name: str, key: str) -> ObjectInfo:
+        from minio.error import S3Error
+
         try:
-            data = response.read()
-            content_type = response.headers.get("Content-Type", "application/octet-stream")
-            return data, content_type
-        finally:
-            response.close()
-            response.release_conn()
+            stat = self.client.stat_object(bucket_name, key)
+        except S3Error as exc:
+            if exc.code in {"NoSuchKey", "NoSuchObject"}:
+                raise FileNotFoundError(key) from exc
+            raise
+        return ObjectInfo(
+            size=int(stat.size or 0),
+            etag=str(stat.etag or "").strip('"'),
+            content_type=stat.content_type or "application/octet-stream",
+        )
 
-    def get_raw_bytes(self, key: str) -> tuple[bytes, str]:
-        response = self.client.get_object(self.bucket_raw, key)
+    def _iter(self, bucket_name: str, key: str, offset: int, length: int | None) -> Iterator[bytes]:
+        response = self.client.get_object(bucket_name, key, offset=offset, length=length or 0)
         try:
-            data = response.read()
-            content_type = response.headers.get("Content-Type", "application/octet-stream")
-            return data, content_type
+            yield from response.stream(STREAM_CHUNK_SIZE)
         finally:
             response.close()
             response.release_conn()
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageService:
+    """Process-wide storage service sharing one pooled MinIO client; also a FastAPI dependency."""
+    return StorageService()
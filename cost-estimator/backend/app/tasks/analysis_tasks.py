@@ -1,11 +1,58 @@
+import logging
+
+from celery import Signature
+
 from app.db.session import SessionLocal
-from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.job_events import JobEventPublisher
+from app.services.job_leases import JobLeaseService, LeaseHeartbeat, lease_owner_id
+from app.services.job_routing import analysis_task_options
+from app.services.metrics import count_job
 from app.tasks.celery_app import celery_app
 
+logger = logging.getLogger(__name__)
+
 
-@celery_app.task(name="analysis.run_part_analysis")
-def run_part_analysis_task(part_id: str, job_id: str, machine_profile: str = "auto") -> dict:
+@celery_app.task(name="analysis.run_part_analysis", bind=True)
+def run_part_analysis_task(self, part_id: str, job_id: str, machine_profile: str = "auto") -> dict:
+    # The API imports this module to publish tasks; only workers need the geometry stack.
+    from app.services.analysis_pipeline import AnalysisPipeline
+
+    owner = lease_owner_id(self.request.id)
     with SessionLocal() as db:
-        pipeline = AnalysisPipeline(db)
-        pipeline.run(part_id=part_id, job_id=job_id, machine_profile=machine_profile)
+        if not JobLeaseService(db).claim(job_id, owner):
+            # Duplicate delivery, or another worker already holds the lease.
+            count_job("skipped", (self.request.delivery_info or {}).get("routing_key"))
+            return {"part_id": part_id, "job_id": job_id, "status": "skipped"}
+        # (time_limit, soft_time_limit) as routed; bounds how long a geometry cache waiter may block.
+        soft_time_limit_s = (self.request.timelimit or (None, None))[1]
+        with LeaseHeartbeat(job_id, owner):
+            pipeline = AnalysisPipeline(db, events=JobEventPublisher(), soft_time_limit_s=soft_time_limit_s)
+            pipeline.run(part_id=part_id, job_id=job_id, machine_profile=machine_profile)
     return {"part_id": part_id, "job_id": job_id, "status": "completed"}
+
+
+def analysis_signature(part_id: str, job_id: str, machine_profile: str, queue: str | None) -> Signature:
+    """``run_part_analysis_task`` bound to its routed queue and that queue's time limits."""
+    return run_part_analysis_task.signature(
+        kwargs={"part_id": part_id, "job_id": job_id, "machine_profile": machine_profile},
+        **analysis_task_options(queue),
+    )
+
+
+@celery_app.task(name="analysis.reap_expired_leases")
+def reap_expired_leases_task() -> dict:
+    events = JobEventPublisher()
+    with SessionLocal() as db:
+        reaped = JobLeaseService(db).reap()
+    for job in reaped:
+        count_job("requeued" if job.status == "queued" else "lost", job.queue)
+        if job.status == "queued":
+            async_task = analysis_signature(job.part_id, job.job_id, job.machine_profile, job.queue).apply_async()
+            logger.info("Re-queued job %s as task %s", job.job_id, async_task.id)
+        events.publish(
+            job.job_id,
+            job.part_id,
+            job.status,
+            error_message="Analysis worker lost too many times" if job.status == "failed" else None,
+        )
+    return {"reaped": {job.job_id: job.status for job in reaped}}
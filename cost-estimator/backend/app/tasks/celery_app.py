@@ -1,6 +1,9 @@
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
+from kombu import Queue
 
 from app.core.config import get_settings
+from app.services.job_routing import ANALYSIS_QUEUES, QUEUE_COSTING, QUEUE_GEOMETRY_LIGHT
 
 settings = get_settings()
 
@@ -11,3 +14,84 @@ celery_app.conf.result_serializer = "json"
 celery_app.conf.accept_content = ["json"]
 celery_app.conf.timezone = "UTC"
 celery_app.conf.imports = ("app.tasks.analysis_tasks",)
+
+# Analysis tasks are routed per upload (see job_routing); workers subscribe to the queues they
+# are sized for, so a huge assembly only ever occupies a geometry_heavy slot.
+celery_app.conf.task_queues = tuple(Queue(name) for name in ANALYSIS_QUEUES)
+celery_app.conf.task_default_queue = QUEUE_GEOMETRY_LIGHT
+celery_app.conf.task_routes = {"analysis.reap_expired_leases": {"queue": QUEUE_COSTING}}
+# Ack after the run so a lost worker's message is redelivered; the job lease keeps that idempotent.
+celery_app.conf.task_acks_late = True
+celery_app.conf.task_reject_on_worker_lost = True
+celery_app.conf.worker_prefetch_multiplier = 1
+celery_app.conf.broker_transport_options = {
+    # Unacked messages are redelivered after this; it must outlast the longest hard time limit.
+    "visibility_timeout": int(
+        max(settings.geometry_heavy_time_limit_s, settings.geometry_light_time_limit_s, settings.costing_time_limit_s)
+    )
+    + 300,
+}
+celery_app.conf.beat_schedule = {
+    "reap-expired-job-leases": {
+        "task": "analysis.reap_expired_leases",
+        "schedule": settings.job_reaper_interval_s,
+    },
+}
+
+
+@worker_init.connect
+def _start_metrics_server(**_kwargs) -> None:
+    from prometheus_client import start_http_server
+
+    from app.services.metrics import build_registry, reset_multiprocess_dir
+
+    if not settings.worker_metrics_port:
+        return
+    # Runs in the parent before the pool forks; children write to PROMETHEUS_MULTIPROC_DIR.
+    reset_multiprocess_dir()
+    start_http_server(settings.worker_metrics_port, registry=build_registry())
+
+
+@worker_process_init.connect
+def _init_storage(**_kwargs) -> None:
+    from app.services.storage_service import get_storage
+
+    # Each worker process builds its own pooled client; sockets are never shared across a fork.
+    get_storage.cache_clear()
+
+
+@worker_process_init.connect
+def _warm_reference_cache(**_kwargs) -> None:
+    from app.services.reference_data import warm_reference_cache
+
+    warm_reference_cache()
+
+
+@worker_process_init.connect
+def _warm_occ_pool(**_kwargs) -> None:
+    from app.services.occ_pool import warm_occ_pool
+
+    # Only spawns the OCC subprocesses; this handler must return within worker_proc_alive_timeout.
+    warm_occ_pool()
+
+
+@worker_process_shutdown.connect
+def _close_occ_pool(**_kwargs) -> None:
+    from app.services.occ_pool import close_occ_pool
+
+    close_occ_pool()
+
+
+@worker_process_shutdown.connect
+def _close_reference_cache(**_kwargs) -> None:
+    from app.services.reference_data import close_reference_cache
+
+    close_reference_cache()
+
+
+@worker_process_shutdown.connect
+def _mark_metrics_process_dead(pid=None, **_kwargs) -> None:
+    from app.services.metrics import mark_process_dead
+
+    if pid is not None:
+        mark_process_dead(pid)
@@ -0,0 +1,393 @@
+"""Time every analysis stage and the end-to-end pipeline over a synthetic STEP corpus.
+
+Run from ``backend/``:
+
+    python -m benchmarks.pipeline --faces 10 100 1000 10000 30000 --output benchmarks/results/latest.json
+    python -m benchmarks.pipeline --baseline benchmarks/results/baseline.json   # exit 1 on regression
+    python -m benchmarks.pipeline --update-baseline                             # record a new baseline
+
+The corpus is built from OCC primitives when pythonOCC is installed and written as plain
+synthetic STEP text otherwise (the fallback analyzer then handles it). Postgres and MinIO are
+replaced by a scratch SQLite database and a directory-backed object store, so the numbers are
+comparable between runs on one machine, not with production. The SQLite stand-in needs
+``aiosqlite`` because the app builds its async engine at import; ``--database-url`` points
+the run at a scratch Postgres instead. Baselines are per machine and per analysis mode.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import BinaryIO, Callable
+from uuid import uuid4
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_THRESHOLDS = BENCHMARK_DIR / "thresholds.json"
+DEFAULT_BASELINE = BENCHMARK_DIR / "results" / "baseline.json"
+STAGES = ("geometry", "stock", "operations", "cycle_time", "pipeline_cold", "pipeline_cached")
+
+
+def occ_available() -> bool:
+    try:
+        import OCC.Core  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def write_occ_step(path: Path, faces: int) -> None:
+    from OCC.Core.IFSelect import IFSelect_RetDone
+    from OCC.Core.STEPControl import STEPControl_AsIs, STEPControl_Writer
+
+    from benchmarks.topology_traversal import build_shape
+
+    writer = STEPControl_Writer()
+    writer.Transfer(build_shape(faces), STEPControl_AsIs)
+    if writer.Write(str(path)) != IFSelect_RetDone:
+        raise RuntimeError(f"Could not write STEP file: {path}")
+
+
+def write_synthetic_step(path: Path, faces: int) -> None:
+    """AP214-shaped text with ``faces`` planar/cylindrical ADVANCED_FACE instances.
+
+    Not a valid B-rep, but it has the size and entity density of a real export, which is all
+    the fallback analyzer and the queue router look at.
+    """
+    with path.open("w", encoding="ascii") as fh:
+        fh.write(
+            "ISO-10303-21;\nHEADER;\nFILE_DESCRIPTION(('benchmark corpus'),'2;1');\n"
+            f"FILE_NAME('synthetic_{faces}.step','2024-01-01T00:00:00',(''),(''),'','','');\n"
+            "FILE_SCHEMA(('AUTOMOTIVE_DESIGN'));\nENDSEC;\nDATA;\n"
+        )
+        side = max(1, math.ceil(math.sqrt(faces)))
+        entity = 1
+        for i in range(faces):
+            x, y = (i % side) * 30.0, (i // side) * 30.0
+            origin, axis, ref, placement, surface, loop, bound = range(entity, entity + 7)
+            if i % 9 == 6:
+                surface_line = f"#{surface}=CYLINDRICAL_SURFACE('',#{placement},{2.5 + i % 12:.1f});\n"
+            else:
+                surface_line = f"#{surface}=PLANE('',#{placement});\n"
+            fh.write(
+                f"#{origin}=CARTESIAN_POINT('',({x:.3f},{y:.3f},0.));\n"
+                f"#{axis}=DIRECTION('',(0.,0.,1.));\n"
+                f"#{ref}=DIRECTION('',(1.,0.,0.));\n"
+                f"#{placement}=AXIS2_PLACEMENT_3D('',#{origin},#{axis},#{ref});\n"
+                + surface_line
+                + f"#{loop}=EDGE_LOOP('',());\n"
+                f"#{bound}=FACE_OUTER_BOUND('',#{loop},.T.);\n"
+                f"#{entity + 7}=ADVANCED_FACE('',(#{bound}),#{surface},.T.);\n"
+            )
+            entity += 8
+        fh.write("ENDSEC;\nEND-ISO-10303-21;\n")
+
+
+def build_corpus(corpus_dir: Path, face_targets: list[int], use_occ: bool) -> list[tuple[int, Path]]:
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    corpus = []
+    for faces in face_targets:
+        path = corpus_dir / f"{'occ' if use_occ else 'synthetic'}_{faces}.step"
+        if not path.exists():
+            (write_occ_step if use_occ else write_synthetic_step)(path, faces)
+        corpus.append((faces, path))
+    return corpus
+
+
+class LocalObjectStore:
+    """Directory-backed stand-in for the MinIO client; implements only what ``StorageService`` calls."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._content_types: dict[tuple[str, str], str] = {}
+
+    def _path(self, bucket_name: str, object_name: str) -> Path:
+        return self.root / bucket_name / object_name
+
+    def put_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        part_size: int = 0,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        path = self._path(bucket_name, object_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fh:
+            shutil.copyfileobj(data, fh, part_size or 1024 * 1024)
+        self._content_types[(bucket_name, object_name)] = content_type
+
+    def fget_object(self, bucket_name: str, object_name: str, file_path: str) -> None:
+        shutil.copyfile(self._path(bucket_name, object_name), file_path)
+
+    def stat_object(self, bucket_name: str, object_name: str) -> SimpleNamespace:
+        stat = self._path(bucket_name, object_name).stat()
+        return SimpleNamespace(
+            size=stat.st_size,
+            etag=f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+            content_type=self._content_types.get((bucket_name, object_name)),
+        )
+
+    def remove_object(self, bucket_name: str, object_name: str) -> None:
+        self._path(bucket_name, object_name).unlink(missing_ok=True)
+
+
+class StaticReference:
+    """Reference data loaded once; stands in for ``ReferenceDataCache`` without Redis."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get(self):
+        return self.data
+
+
+def measure(fn: Callable[[], object], repeat: int, inner: int = 1, setup: Callable[[], None] | None = None) -> dict:
+    if setup is not None:
+        setup()
+    fn()  # warm-up: first-call imports and caches are not what is being measured
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        samples.append((time.perf_counter() - started) * 1000.0 / inner)
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "samples": repeat,
+        "inner": inner,
+    }
+
+
+def configure_environment(workdir: Path, database_url: str | None) -> None:
+    # Must run before anything under ``app`` is imported: the engines are built at import time.
+    os.environ["DATABASE_URL"] = database_url or f"sqlite:///{workdir / 'benchmark.sqlite'}"
+    os.environ["RAW_CACHE_DIR"] = str(workdir / "raw-cache")
+    # Time the analyzer itself, not process-pool startup and IPC.
+    os.environ["OCC_POOL_ENABLED"] = "false"
+    os.environ.setdefault("REDIS_URL", "redis://127.0.0.1:6379/15")
+
+
+def run_benchmarks(corpus: list[tuple[int, Path]], workdir: Path, repeat: int, inner: int) -> tuple[dict, dict]:
+    from sqlalchemy import delete
+
+    from app.db.init_db import init_db
+    from app.db.session import SessionLocal
+    from app.models.analysis_job import AnalysisJob
+    from app.models.geometry_cache import GeometryCacheEntry
+    from app.models.part import Part
+    from app.services.analysis_pipeline import AnalysisPipeline
+    from app.services.costing_service import material_info
+    from app.services.cycle_time_service import CycleTimeService
+    from app.services.geometry_service import GeometryService
+    from app.services.machine_profiles import get_machine_profile
+    from app.services.operation_classifier import OperationClassifier
+    from app.services.reference_data import load_reference_data
+    from app.services.stock_service import StockService
+    from app.services.storage_service import StorageService
+
+    init_db()
+    with SessionLocal() as db:
+        reference = StaticReference(load_reference_data(db))
+    storage = StorageService(client=LocalObjectStore(workdir / "objects"))
+    material = reference.get().materials[0]
+    machine = get_machine_profile("auto")
+    profiles = reference.get().profiles_for(material.id, machine.id)
+    catalog = reference.get().stock_catalog
+    geometry_service = GeometryService()
+    stock_service = StockService()
+    classifier = OperationClassifier()
+    cycle_service = CycleTimeService()
+    raw_cache_dir = Path(os.environ["RAW_CACHE_DIR"])
+
+    results: dict[str, dict[str, dict]] = {stage: {} for stage in STAGES}
+    corpus_meta = []
+    analysis_modes = set()
+    for faces, path in corpus:
+        label = str(faces)
+        geometry, _, _ = geometry_service.analyze_step_file(path)
+        analysis_modes.add(geometry.get("analysis_mode", "occ"))
+        stock = stock_service.determine_stock(
+            geometry, material_info(material), machine.stock_strategy, machine.allowance_multiplier, catalog
+        )
+        operations = classifier.classify(geometry, stock, process_hint=machine.process)
+        corpus_meta.append(
+            {"faces": faces, "bytes": path.stat().st_size, "faces_count": geometry.get("faces_count")}
+        )
+
+        results["geometry"][label] = measure(lambda: geometry_service.analyze_step_file(path), repeat)
+        results["stock"][label] = measure(
+            lambda: stock_service.determine_stock(
+                geometry, material_info(material), machine.stock_strategy, machine.allowance_multiplier, catalog
+            ),
+            repeat,
+            inner,
+        )
+        results["operations"][label] = measure(
+            lambda: classifier.classify(geometry, stock, process_hint=machine.process), repeat, inner
+        )
+        results["cycle_time"][label] = measure(
+            lambda: cycle_service.estimate(operations, geometry, stock, profiles), repeat, inner
+        )
+
+        with path.open("rb") as fh:
+            upload = storage.upload_raw_stream(f"benchmark/{path.name}", fh)
+        job_ids: list[tuple[str, str]] = []
+
+        def new_job() -> None:
+            with SessionLocal() as db:
+                part_id, job_id = str(uuid4()), str(uuid4())
+                db.add(
+                    Part(
+                        id=part_id,
+                        filename=path.name,
+                        storage_key=upload.key,
+                        content_sha256=upload.content_sha256,
+                        status="queued",
+                        material_id=material.id,
+                    )
+                )
+                db.add(AnalysisJob(id=job_id, part_id=part_id, status="queued"))
+                db.commit()
+            job_ids.append((part_id, job_id))
+
+        def cold_job() -> None:
+            with SessionLocal() as db:
+                db.execute(delete(GeometryCacheEntry).where(GeometryCacheEntry.content_sha256 == upload.content_sha256))
+                db.commit()
+            shutil.rmtree(raw_cache_dir, ignore_errors=True)
+            new_job()
+
+        def run_pipeline() -> None:
+            part_id, job_id = job_ids[-1]
+            with SessionLocal() as db:
+                AnalysisPipeline(db, storage=storage, reference=reference).run(part_id, job_id, machine.id)
+
+        results["pipeline_cold"][label] = measure(run_pipeline, repeat, setup=cold_job)
+        results["pipeline_cached"][label] = measure(run_pipeline, repeat, setup=new_job)
+
+    meta = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "analysis_mode": "+".join(sorted(analysis_modes)),
+        "repeat": repeat,
+        "corpus": corpus_meta,
+    }
+    return meta, results
+
+
+def load_thresholds(path: Path) -> dict:
+    with path.open(encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def stage_threshold(thresholds: dict, stage: str) -> tuple[float, float]:
+    limits = {**thresholds.get("default", {}), **thresholds.get("stages", {}).get(stage, {})}
+    return float(limits.get("max_regression_pct", 25.0)), float(limits.get("min_delta_ms", 0.0))
+
+
+def compare(current: dict, baseline: dict, thresholds: dict) -> list[dict]:
+    """Best-of-N regressions above both the relative limit and the absolute noise floor of a stage.
+
+    The minimum is gated rather than the median: scheduler noise only ever adds time.
+    """
+    regressions = []
+    for stage, by_size in current["results"].items():
+        max_pct, min_delta_ms = stage_threshold(thresholds, stage)
+        for size, entry in by_size.items():
+            previous = baseline.get("results", {}).get(stage, {}).get(size)
+            if previous is None:
+                continue
+            delta_ms = entry["min_ms"] - previous["min_ms"]
+            pct = 100.0 * delta_ms / previous["min_ms"] if previous["min_ms"] > 0 else math.inf
+            if delta_ms > min_delta_ms and pct > max_pct:
+                regressions.append(
+                    {
+                        "stage": stage,
+                        "faces": int(size),
+                        "baseline_ms": previous["min_ms"],
+                        "current_ms": entry["min_ms"],
+                        "regression_pct": round(pct, 1),
+                        "limit_pct": max_pct,
+                    }
+                )
+    return regressions
+
+
+def write_json(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--faces", type=int, nargs="+", default=[10, 100, 1000, 10000, 30000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--inner", type=int, default=200, help="calls per sample for the sub-millisecond stages")
+    parser.add_argument("--corpus-dir", type=Path, help="reuse/keep the generated corpus here")
+    parser.add_argument("--database-url", help="scratch database instead of a temporary SQLite file")
+    parser.add_argument("--output", type=Path, help="write the results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--fallback", action="store_true", help="use synthetic STEP text even if OCC is installed")
+    args = parser.parse_args(argv)
+
+    use_occ = occ_available() and not args.fallback
+    with tempfile.TemporaryDirectory(prefix="cnc-bench-") as tmp:
+        workdir = Path(tmp)
+        configure_environment(workdir, args.database_url)
+        corpus = build_corpus(args.corpus_dir or workdir / "corpus", args.faces, use_occ)
+        meta, results = run_benchmarks(corpus, workdir, args.repeat, args.inner)
+    current = {"meta": meta, "results": results}
+
+    if args.output is not None:
+        write_json(args.output, current)
+    if args.update_baseline:
+        write_json(args.baseline, current)
+        print(json.dumps(current, indent=2))
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if not args.baseline.exists():
+        print(json.dumps(current, indent=2))
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.", file=sys.stderr)
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("meta", {}).get("analysis_mode") != meta["analysis_mode"]:
+        print(
+            f"Baseline analysis mode {baseline.get('meta', {}).get('analysis_mode')!r} does not match "
+            f"{meta['analysis_mode']!r}; record a baseline for this environment.",
+            file=sys.stderr,
+        )
+        return 2
+    regressions = compare(current, baseline, load_thresholds(args.thresholds))
+    print(json.dumps({**current, "regressions": regressions}, indent=2))
+    for item in regressions:
+        print(
+            f"REGRESSION {item['stage']} @ {item['faces']} faces: {item['baseline_ms']} -> "
+            f"{item['current_ms']} ms (+{item['regression_pct']}%, limit {item['limit_pct']}%)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
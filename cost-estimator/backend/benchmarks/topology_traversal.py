@@ -0,0 +1,110 @@
+"""Compare the legacy two-explorer face/edge walk with the single-pass topology index.
+
+Run from ``backend/`` with a pythonOCC-enabled interpreter:
+
+    python -m benchmarks.topology_traversal --faces 1000 5000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import time
+
+
+def build_shape(target_faces: int):
+    from OCC.Core.BRep import BRep_Builder
+    from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCylinder
+    from OCC.Core.gp import gp_Ax2, gp_Dir, gp_Pnt
+    from OCC.Core.TopoDS import TopoDS_Compound
+
+    # Each cell is a box (6 planar faces) plus a cylinder (1 cylindrical + 2 planar faces).
+    cells = max(1, target_faces // 9)
+    side = math.ceil(math.sqrt(cells))
+    builder = BRep_Builder()
+    compound = TopoDS_Compound()
+    builder.MakeCompound(compound)
+    for i in range(cells):
+        x, y = (i % side) * 30.0, (i // side) * 30.0
+        builder.Add(compound, BRepPrimAPI_MakeBox(gp_Pnt(x, y, 0.0), 20.0, 20.0, 10.0).Shape())
+        axis = gp_Ax2(gp_Pnt(x + 10.0, y + 10.0, 10.0), gp_Dir(0.0, 0.0, 1.0))
+        builder.Add(compound, BRepPrimAPI_MakeCylinder(axis, 2.5 + (i % 12), 8.0).Shape())
+    return compound
+
+
+def legacy_counts(shape) -> dict[str, int]:
+    from OCC.Core.BRepAdaptor import BRepAdaptor_Surface
+    from OCC.Core.GeomAbs import GeomAbs_Cylinder, GeomAbs_Plane
+    from OCC.Core.TopAbs import TopAbs_EDGE, TopAbs_FACE
+    from OCC.Core.TopExp import TopExp_Explorer
+
+    counts = {"faces_count": 0, "edges_count": 0, "holes_count": 0, "flat_face_count": 0}
+    exp_face = TopExp_Explorer(shape, TopAbs_FACE)
+    while exp_face.More():
+        counts["faces_count"] += 1
+        surf = BRepAdaptor_Surface(exp_face.Current(), True)
+        surf_type = surf.GetType()
+        if surf_type == GeomAbs_Cylinder:
+            if float(surf.Cylinder().Radius()) > 0:
+                counts["holes_count"] += 1
+        elif surf_type == GeomAbs_Plane:
+            counts["flat_face_count"] += 1
+        exp_face.Next()
+    exp_edge = TopExp_Explorer(shape, TopAbs_EDGE)
+    while exp_edge.More():
+        counts["edges_count"] += 1
+        exp_edge.Next()
+    return counts
+
+
+def indexed_counts(shape) -> dict[str, int]:
+    from app.services.occ_topology import index_topology
+
+    return index_topology(shape).feature_counts()
+
+
+def best_of(fn, shape, repeat: int) -> tuple[float, dict]:
+    best = math.inf
+    result: dict = {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(shape)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--faces", type=int, nargs="+", default=[1000, 5000, 10000, 20000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        import OCC.Core  # noqa: F401
+    except ImportError:
+        print("pythonOCC is not installed; this benchmark needs the OCC runtime.", file=sys.stderr)
+        return 2
+
+    rows = []
+    for target in args.faces:
+        shape = build_shape(target)
+        legacy_s, legacy = best_of(legacy_counts, shape, args.repeat)
+        indexed_s, indexed = best_of(indexed_counts, shape, args.repeat)
+        rows.append(
+            {
+                "faces": indexed["faces_count"],
+                "edges_unique": indexed["edges_count"],
+                "edges_per_occurrence": legacy["edges_count"],
+                "legacy_s": round(legacy_s, 5),
+                "indexed_s": round(indexed_s, 5),
+                "speedup": round(legacy_s / indexed_s, 2) if indexed_s > 0 else None,
+            }
+        )
+    print(json.dumps(rows, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
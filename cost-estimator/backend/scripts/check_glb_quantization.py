@@ -0,0 +1,87 @@
+"""Round-trip guard for the quantized GLB writer.
+
+Writes meshes of several sizes and offsets with ``write_quantized_glb``, decodes them the way
+a spec-compliant loader does (normalized int16 -> ``max(q / 32767, -1)``, then the node
+scale and translation) and fails (exit 1) when the decoded bounding box drifts from the input
+by more than one quantization step. trimesh ignores ``normalized``, so it cannot be used here.
+Run from ``backend/``:
+
+    python -m scripts.check_glb_quantization
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+
+import numpy as np
+
+from app.services.glb_writer import CHUNK_BIN, CHUNK_JSON, COMPONENT_SHORT, INT16_MAX, write_quantized_glb
+
+# (extent_mm, center_mm): sub-millimetre to 2 m parts, around and away from the origin.
+CASES = ((0.5, (0.0, 0.0, 0.0)), (25.0, (10.0, -4.0, 3.0)), (480.0, (-250.0, 900.0, 75.0)), (2000.0, (0.0, 0.0, 0.0)))
+
+
+def decode_positions(glb: bytes) -> np.ndarray:
+    """World-space POSITION values of the first node's mesh, per the glTF 2.0 spec."""
+    offset = 12
+    chunks: dict[int, bytes] = {}
+    while offset < len(glb):
+        length, kind = struct.unpack_from("<II", glb, offset)
+        chunks[kind] = glb[offset + 8 : offset + 8 + length]
+        offset += 8 + length
+    gltf = json.loads(chunks[CHUNK_JSON])
+    binary = chunks[CHUNK_BIN]
+
+    accessor = gltf["accessors"][gltf["meshes"][0]["primitives"][0]["attributes"]["POSITION"]]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    if accessor["componentType"] != COMPONENT_SHORT:
+        raise ValueError(f"Unexpected POSITION component type {accessor['componentType']}")
+    stride = view.get("byteStride", 6) // 2
+    raw = np.frombuffer(binary, dtype="<i2", count=accessor["count"] * stride, offset=view.get("byteOffset", 0))
+    stored = raw.reshape(-1, stride)[:, :3]
+    bounds_match = np.array_equal(stored.min(axis=0), accessor["min"]) and np.array_equal(
+        stored.max(axis=0), accessor["max"]
+    )
+    if not bounds_match:
+        raise ValueError("Accessor min/max do not match the stored values")
+
+    values = stored.astype(np.float64)
+    if accessor.get("normalized", False):
+        values = np.maximum(values / INT16_MAX, -1.0)
+    node = gltf["nodes"][0]
+    return values * np.asarray(node.get("scale", [1.0] * 3)) + np.asarray(node.get("translation", [0.0] * 3))
+
+
+def check_case(extent: float, center: tuple[float, float, float], rng: np.random.Generator) -> list[str]:
+    vertices = rng.uniform(-extent / 2.0, extent / 2.0, size=(600, 3)) + np.asarray(center)
+    faces = rng.integers(0, len(vertices), size=(400, 3))
+    decoded = decode_positions(write_quantized_glb(vertices, faces))
+    # One int16 step of the largest half-extent, plus float slack.
+    tolerance = (vertices.max(axis=0) - vertices.min(axis=0)).max() / 2.0 / INT16_MAX * 1.01 + 1e-9
+    errors = []
+    for label, expected, actual in (
+        ("min", vertices.min(axis=0), decoded.min(axis=0)),
+        ("max", vertices.max(axis=0), decoded.max(axis=0)),
+    ):
+        drift = float(np.abs(expected - actual).max())
+        if drift > tolerance:
+            errors.append(
+                f"extent {extent} mm at {center}: bbox {label} off by {drift:.6g} mm (tolerance {tolerance:.3g})"
+            )
+    return errors
+
+
+def main() -> int:
+    rng = np.random.default_rng(0)
+    errors = [error for extent, center in CASES for error in check_case(extent, center, rng)]
+    for error in errors:
+        print(f"FAIL: {error}", file=sys.stderr)
+    if not errors:
+        print(f"OK: {len(CASES)} meshes decode to their input bounding box")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
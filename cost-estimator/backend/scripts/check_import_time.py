@@ -0,0 +1,105 @@
+"""Cold-start guard for the API process.
+
+Imports ``app.main`` in fresh interpreters and fails (exit 1) when the best-of-N import time
+exceeds the budget or when a geometry-only dependency is loaded at import time. Run from
+``backend/``:
+
+    python -m scripts.check_import_time --budget-ms 2000 --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Only worker code paths may load these; the API must stay importable without them.
+FORBIDDEN_MODULES = (
+    "trimesh",
+    "OCC",
+    "minio",
+    "app.services.geometry_service",
+    "app.services.glb_writer",
+    "app.services.occ_pool",
+    "app.services.raw_file_cache",
+)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+elapsed_ms = (time.perf_counter() - start) * 1000.0
+print(json.dumps({{"elapsed_ms": elapsed_ms, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(target: str) -> tuple[float, set[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(target=target)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["elapsed_ms"], set(result["modules"])
+
+
+def top_imports(target: str, limit: int) -> list[tuple[int, str]]:
+    """Slowest modules by cumulative import time (µs), from ``python -X importtime``."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if "." not in name.strip() or name.strip().startswith("app."):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=2000.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=0, help="also print the N slowest top-level imports")
+    args = parser.parse_args(argv)
+
+    timings = []
+    modules: set[str] = set()
+    for _ in range(args.runs):
+        elapsed_ms, modules = measure(args.target)
+        timings.append(elapsed_ms)
+    best_ms = min(timings)
+    leaked = sorted(
+        name for name in modules if any(name == bad or name.startswith(f"{bad}.") for bad in FORBIDDEN_MODULES)
+    )
+
+    report = {
+        "target": args.target,
+        "best_ms": round(best_ms, 1),
+        "runs_ms": [round(value, 1) for value in timings],
+        "budget_ms": args.budget_ms,
+        "forbidden_loaded": leaked,
+    }
+    if args.top:
+        report["slowest_imports_us"] = top_imports(args.target, args.top)
+    print(json.dumps(report, indent=2))
+
+    if leaked:
+        print(f"FAIL: {args.target} imports geometry-only modules: {', '.join(leaked)}", file=sys.stderr)
+        return 1
+    if best_ms > args.budget_ms:
+        print(f"FAIL: {args.target} import took {best_ms:.0f} ms (budget {args.budget_ms:.0f} ms)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
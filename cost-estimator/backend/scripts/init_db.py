@@ -1,5 +1,10 @@
 from app.db.init_db import init_db
+from app.services.storage_service import get_storage
 
 if __name__ == "__main__":
+    # One-shot bootstrap (compose "bootstrap" service / release step): API and worker processes
+    # assume the schema, reference data and buckets already exist.
     init_db()
     print("Database initialized.")
+    get_storage().ensure_buckets()
+    print("Storage buckets ready.")
@@ -8,6 +8,7 @@ import {
   fetchParts,
   getModelUrl,
   isMockModeActive,
+  subscribeJobEvents,
   uploadStep,
 } from "./api";
 import { EstimatePanel } from "./components/EstimatePanel";
@@ -24,10 +25,21 @@ function jobStatusLabel(status: string): string {
   return status;
 }
 
+function jobStageLabel(stage: string | null | undefined): string {
+  if (stage === "downloading") return "dosya indiriliyor";
+  if (stage === "parsing") return "STEP okunuyor";
+  if (stage === "meshing") return "ag olusturuluyor";
+  if (stage === "exporting") return "onizleme yaziliyor";
+  if (stage === "costing") return "maliyet hesaplaniyor";
+  return "";
+}
+
 function App() {
   const [materials, setMaterials] = useState<Material[]>([]);
   const [machineProfiles, setMachineProfiles] = useState<MachineProfile[]>([]);
   const [parts, setParts] = useState<PartSummary[]>([]);
+  const [nextPartsCursor, setNextPartsCursor] = useState<string | null>(null);
+  const [loadingMoreParts, setLoadingMoreParts] = useState(false);
   const [selectedPartId, setSelectedPartId] = useState<string | null>(null);
   const [selectedPart, setSelectedPart] = useState<PartRead | null>(null);
   const [activeJob, setActiveJob] = useState<AnalysisJob | null>(null);
@@ -38,14 +50,16 @@ function App() {
   async function loadInitial() {
     setGlobalError("");
     try {
-      const [materialsData, machineProfilesData, partsData] = await Promise.all([
+      const [materialsData, machineProfilesData, partsPage] = await Promise.all([
         fetchMaterials(),
         fetchMachineProfiles(),
         fetchParts(),
       ]);
       setMaterials(materialsData);
       setMachineProfiles(machineProfilesData);
+      const partsData = partsPage.items;
       setParts(partsData);
+      setNextPartsCursor(partsPage.nextCursor);
       setMockMode(isMockModeActive());
       setSelectedPartId((current) => {
         if (partsData.length === 0) return null;
@@ -59,6 +73,24 @@ function App() {
     }
   }
 
+  async function loadMoreParts() {
+    if (!nextPartsCursor || loadingMoreParts) return;
+    setLoadingMoreParts(true);
+    try {
+      const page = await fetchParts(nextPartsCursor);
+      setParts((current) => {
+        const seen = new Set(current.map((p) => p.id));
+        return [...current, ...page.items.filter((p) => !seen.has(p.id))];
+      });
+      setNextPartsCursor(page.nextCursor);
+    } catch (error) {
+      console.error(error);
+      setGlobalError("Parca listesi yuklenemedi.");
+    } finally {
+      setLoadingMoreParts(false);
+    }
+  }
+
   useEffect(() => {
     loadInitial();
   }, []);
@@ -89,20 +121,52 @@ function App() {
 
   useEffect(() => {
     if (!activeJob?.id) return;
-    const timer = window.setInterval(async () => {
-      try {
-        const next = await fetchJob(activeJob.id);
-        setActiveJob(next);
-        if (next.status === "completed" || next.status === "failed") {
-          window.clearInterval(timer);
-          await loadInitial();
-          setSelectedPartId(next.part_id);
+    const jobId = activeJob.id;
+    let finished = false;
+    let timer: number | null = null;
+
+    async function finish(partId: string) {
+      if (finished) return;
+      finished = true;
+      await loadInitial();
+      setSelectedPartId(partId);
+    }
+
+    function startPolling() {
+      if (timer !== null || finished) return;
+      timer = window.setInterval(async () => {
+        try {
+          const next = await fetchJob(jobId);
+          setActiveJob(next);
+          if (next.status === "completed" || next.status === "failed") {
+            if (timer !== null) window.clearInterval(timer);
+            await finish(next.part_id);
+          }
+        } catch (error) {
+          console.error(error);
         }
-      } catch (error) {
-        console.error(error);
-      }
-    }, 1800);
-    return () => window.clearInterval(timer);
+      }, 1800);
+    }
+
+    const unsubscribe = subscribeJobEvents(
+      jobId,
+      (event) => {
+        setActiveJob((current) =>
+          current && current.id === event.job_id
+            ? { ...current, status: event.status, stage: event.stage, error_message: event.error_message }
+            : current,
+        );
+        if (event.status === "completed" || event.status === "failed") void finish(event.part_id);
+      },
+      startPolling,
+    );
+    if (!unsubscribe) startPolling();
+
+    return () => {
+      finished = true;
+      unsubscribe?.();
+      if (timer !== null) window.clearInterval(timer);
+    };
   }, [activeJob?.id]);
 
   async function handleUpload(file: File, materialId: number, machineProfileId: string) {
@@ -125,7 +189,13 @@ function App() {
   const modelUrl = useMemo(() => {
     if (!selectedPart) return null;
     if (!selectedPart.model_key) return null;
-    return `${getModelUrl(selectedPart.id)}?v=${encodeURIComponent(selectedPart.updated_at)}`;
+    return getModelUrl(selectedPart.id, "full", selectedPart.model_version);
+  }, [selectedPart]);
+
+  const previewModelUrl = useMemo(() => {
+    if (!selectedPart) return null;
+    if (!selectedPart.model_key) return null;
+    return getModelUrl(selectedPart.id, "low", selectedPart.model_version);
   }, [selectedPart]);
 
   return (
@@ -163,6 +233,7 @@ function App() {
       {activeJob && (
         <div className={`alert ${activeJob.status === "failed" ? "error" : "info"}`}>
           Is {activeJob.id.slice(0, 8)}... durumu: <strong>{jobStatusLabel(activeJob.status)}</strong>
+          {jobStageLabel(activeJob.stage) ? ` (${jobStageLabel(activeJob.stage)})` : ""}
           {activeJob.error_message ? ` - ${activeJob.error_message}` : ""}
         </div>
       )}
@@ -174,12 +245,20 @@ function App() {
           onUpload={handleUpload}
           busy={uploadBusy}
         />
-        <PartList parts={parts} selectedPartId={selectedPartId} onSelect={setSelectedPartId} />
+        <PartList
+          parts={parts}
+          selectedPartId={selectedPartId}
+          onSelect={setSelectedPartId}
+          hasMore={nextPartsCursor !== null}
+          loadingMore={loadingMoreParts}
+          onLoadMore={loadMoreParts}
+        />
       </section>
 
       <section className="grid-two viewer-section">
         <ModelViewer
           modelUrl={modelUrl}
+          previewModelUrl={previewModelUrl}
           modelFormat={selectedPart?.model_format ?? null}
           geometry={(selectedPart?.geometry_json as Record<string, unknown> | null) ?? null}
           stock={(selectedPart?.stock_json as Record<string, unknown> | null) ?? null}
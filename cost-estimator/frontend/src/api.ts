@@ -1,5 +1,5 @@
 import axios from "axios";
-import type { AnalysisJob, MachineProfile, Material, PartRead, PartSummary } from "./types/domain";
+import type { AnalysisJob, JobEvent, MachineProfile, Material, PartPage, PartRead, PartSummary } from "./types/domain";
 
 const API_BASE = import.meta.env.VITE_API_BASE_URL ?? "http://localhost:8000";
 const API_PREFIX = "/api/v1";
@@ -195,6 +195,10 @@ function toSummary(part: PartRead): PartSummary {
     model_format: part.model_format,
     created_at: part.created_at,
     updated_at: part.updated_at,
+    total_cost: part.estimate_json?.total_cost ?? null,
+    cycle_time_min: part.estimate_json?.total_cycle_time_min ?? null,
+    material_cost: part.estimate_json?.material_cost ?? null,
+    machine_profile: (part.estimate_json?.machine_profile?.id as string | undefined) ?? null,
   };
 }
 
@@ -269,6 +273,10 @@ function buildMockPart(file: File, material: Material, machineProfile: MachinePr
     model_format: null,
     created_at: createdAt,
     updated_at: createdAt,
+    total_cost: totalCost,
+    cycle_time_min: cycleMin,
+    material_cost: materialCost,
+    machine_profile: machineProfile.id,
     storage_key: `mock/${id}/${file.name}`,
     model_key: null,
     geometry_json: {
@@ -319,12 +327,13 @@ async function mockFetchMachineProfiles(): Promise<MachineProfile[]> {
   return readMockDb().machineProfiles;
 }
 
-async function mockFetchParts(): Promise<PartSummary[]> {
-  return readMockDb()
+async function mockFetchParts(): Promise<PartPage> {
+  const items = readMockDb()
     .parts
     .slice()
     .sort((a, b) => (b.created_at ?? "").localeCompare(a.created_at ?? ""))
     .map(toSummary);
+  return { items, nextCursor: null };
 }
 
 async function mockFetchPart(partId: string): Promise<PartRead> {
@@ -394,11 +403,15 @@ export async function fetchMachineProfiles(): Promise<MachineProfile[]> {
   }
 }
 
-export async function fetchParts(): Promise<PartSummary[]> {
+export async function fetchParts(cursor?: string | null): Promise<PartPage> {
   return withFallback(
     async () => {
-      const { data } = await client.get<PartSummary[]>("/parts");
-      return data;
+      const { data, headers } = await client.get<PartSummary[]>("/parts", {
+        params: cursor ? { cursor } : undefined,
+      });
+      // Set by the API while older pages remain; pass it back as `cursor` for the next page.
+      const nextCursor = headers["x-next-cursor"];
+      return { items: data, nextCursor: typeof nextCursor === "string" && nextCursor ? nextCursor : null };
     },
     mockFetchParts,
   );
@@ -424,6 +437,29 @@ export async function fetchJob(jobId: string): Promise<AnalysisJob> {
   );
 }
 
+/**
+ * Opens the job's server-sent event stream. Returns null when streaming is not possible
+ * (mock mode, no EventSource); callers then poll fetchJob instead.
+ */
+export function subscribeJobEvents(
+  jobId: string,
+  onEvent: (event: JobEvent) => void,
+  onError: () => void,
+): (() => void) | null {
+  if (forceMockMode || typeof EventSource === "undefined") return null;
+  const source = new EventSource(`${API_BASE}${API_PREFIX}/jobs/${jobId}/events`);
+  source.addEventListener("job", (message) => {
+    const event = JSON.parse((message as MessageEvent<string>).data) as JobEvent;
+    onEvent(event);
+    if (event.status === "completed" || event.status === "failed") source.close();
+  });
+  source.onerror = () => {
+    // EventSource retries on its own while the stream is open; a refused stream ends up CLOSED.
+    if (source.readyState === EventSource.CLOSED) onError();
+  };
+  return () => source.close();
+}
+
 export async function uploadStep(file: File, materialId: number, machineProfileId: string): Promise<UploadResponse> {
   return withFallback(
     async () => {
@@ -440,6 +476,13 @@ export async function uploadStep(file: File, materialId: number, machineProfileI
   );
 }
 
-export function getModelUrl(partId: string): string {
-  return `${API_BASE}${API_PREFIX}/parts/${partId}/model`;
+export type ModelLod = "low" | "full";
+
+/**
+ * Preview URL; with the part's model_version the server marks the response immutable,
+ * without it the browser revalidates through the ETag.
+ */
+export function getModelUrl(partId: string, lod: ModelLod = "full", version?: string | null): string {
+  const url = `${API_BASE}${API_PREFIX}/parts/${partId}/model?lod=${lod}`;
+  return version ? `${url}&v=${encodeURIComponent(version)}` : url;
 }
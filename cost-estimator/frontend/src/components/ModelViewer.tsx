@@ -5,6 +5,7 @@ import { OBJLoader } from "three-stdlib";
 
 type Props = {
   modelUrl: string | null;
+  previewModelUrl?: string | null;
   modelFormat: string | null;
   geometry: Record<string, unknown> | null;
   stock: Record<string, unknown> | null;
@@ -49,9 +50,23 @@ function OBJModel({ url }: { url: string }) {
   return <primitive object={obj} />;
 }
 
-function SceneContent({ url, format }: { url: string; format: string | null }) {
+function SceneContent({
+  url,
+  previewUrl,
+  format,
+}: {
+  url: string;
+  previewUrl: string | null;
+  format: string | null;
+}) {
   if (format === "obj") return <OBJModel url={url} />;
-  return <GLBModel url={url} />;
+  if (!previewUrl) return <GLBModel url={url} />;
+  // The low LOD is shown while the full-detail model is still downloading.
+  return (
+    <Suspense fallback={<GLBModel url={previewUrl} />}>
+      <GLBModel url={url} />
+    </Suspense>
+  );
 }
 
 function toPositiveNumber(value: unknown, fallback: number): number {
@@ -97,7 +112,7 @@ function hasUsableGeometry(geometry: Record<string, unknown> | null): boolean {
   return Number(bbox.x_mm) > 0 && Number(bbox.y_mm) > 0 && Number(bbox.z_mm) > 0;
 }
 
-export function ModelViewer({ modelUrl, modelFormat, geometry, stock }: Props) {
+export function ModelViewer({ modelUrl, previewModelUrl = null, modelFormat, geometry, stock }: Props) {
   const normalizedFormat = useMemo(() => (modelFormat ?? "glb").toLowerCase(), [modelFormat]);
   const [modelError, setModelError] = useState(false);
   const fallbackAvailable = hasUsableGeometry(geometry);
@@ -115,8 +130,9 @@ export function ModelViewer({ modelUrl, modelFormat, geometry, stock }: Props) {
     if (!modelUrl || normalizedFormat !== "glb") return;
     return () => {
       useGLTF.clear(modelUrl);
+      if (previewModelUrl) useGLTF.clear(previewModelUrl);
     };
-  }, [modelUrl, normalizedFormat]);
+  }, [modelUrl, previewModelUrl, normalizedFormat]);
 
   const showModel = Boolean(modelUrl) && !modelError;
   const showFallback = !showModel && fallbackAvailable;
@@ -136,7 +152,7 @@ export function ModelViewer({ modelUrl, modelFormat, geometry, stock }: Props) {
             <Bounds fit clip observe margin={1.3}>
               {showModel && modelUrl ? (
                 <ViewerErrorBoundary key={`${modelUrl}|${normalizedFormat}`} onError={() => setModelError(true)}>
-                  <SceneContent url={modelUrl} format={normalizedFormat} />
+                  <SceneContent url={modelUrl} previewUrl={previewModelUrl} format={normalizedFormat} />
                 </ViewerErrorBoundary>
               ) : (
                 <FallbackModel geometry={geometry} stock={stock} />
@@ -4,6 +4,9 @@ type Props = {
   parts: PartSummary[];
   selectedPartId: string | null;
   onSelect: (partId: string) => void;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 };
 
 function statusClass(status: string): string {
@@ -19,7 +22,7 @@ function statusLabel(status: string): string {
   return status;
 }
 
-export function PartList({ parts, selectedPartId, onSelect }: Props) {
+export function PartList({ parts, selectedPartId, onSelect, hasMore = false, loadingMore = false, onLoadMore }: Props) {
   return (
     <section className="panel">
       <h2>Analiz Edilen Parcalar</h2>
@@ -38,6 +41,11 @@ export function PartList({ parts, selectedPartId, onSelect }: Props) {
           </button>
         ))}
         {parts.length === 0 && <div className="muted">Henuz parca yuklenmedi.</div>}
+        {hasMore && onLoadMore && (
+          <button className="ghost" disabled={loadingMore} onClick={onLoadMore}>
+            {loadingMore ? "Yukleniyor..." : "Daha fazla yukle"}
+          </button>
+        )}
       </div>
     </section>
   );
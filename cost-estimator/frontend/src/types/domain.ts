@@ -30,11 +30,21 @@ export type PartSummary = {
   model_format: string | null;
   created_at: string;
   updated_at: string;
+  total_cost: number | null;
+  cycle_time_min: number | null;
+  material_cost: number | null;
+  machine_profile: string | null;
+};
+
+export type PartPage = {
+  items: PartSummary[];
+  nextCursor: string | null;
 };
 
 export type PartRead = PartSummary & {
   storage_key: string;
   model_key: string | null;
+  model_version?: string | null;
   geometry_json: Record<string, unknown> | null;
   stock_json: Record<string, unknown> | null;
   operations_json: Array<Record<string, unknown>> | null;
@@ -60,8 +70,24 @@ export type AnalysisJob = {
   id: string;
   part_id: string;
   status: string;
+  stage?: string | null;
   error_message: string | null;
   celery_task_id: string | null;
+  stage_timings_json?: Record<string, number> | null;
+  input_bytes?: number | null;
+  faces_count?: number | null;
+  triangle_count?: number | null;
+  profile_requested?: boolean | null;
+  profile_key?: string | null;
   created_at: string;
   updated_at: string;
 };
+
+export type JobEvent = {
+  job_id: string;
+  part_id: string;
+  status: string;
+  stage: string | null;
+  error_message: string | null;
+  ts: string | null;
+};